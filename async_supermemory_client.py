@@ -0,0 +1,193 @@
+"""
+Async Supermemory.ai API Client
+An asyncio wrapper using the official Supermemory SDK's async transport.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from supermemory_client import build_add_params, build_search_params, resolve_credentials
+
+if TYPE_CHECKING:
+    from supermemory import AsyncSupermemory
+
+
+async def gather_bounded(
+    tasks: Iterable[Union[Awaitable[Any], Callable[[], Awaitable[Any]]]],
+    limit: int = 16,
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Run awaitables concurrently with at most `limit` in flight at once.
+    
+    Works like asyncio.gather(), but caps concurrency so that thousands of
+    requests do not all hit the connection pool at the same moment.
+    
+    Args:
+        tasks: Awaitables, or zero-argument callables returning awaitables.
+               Callables are only invoked once a slot is free, so the
+               coroutine objects are not all created up front.
+        limit: Maximum number of awaitables running concurrently
+        return_exceptions: If True, exceptions are returned in the result
+                           list instead of being raised
+    
+    Returns:
+        List of results in the same order as `tasks`
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run(task):
+        async with semaphore:
+            return await (task() if callable(task) else task)
+    
+    return await asyncio.gather(
+        *(run(task) for task in tasks),
+        return_exceptions=return_exceptions
+    )
+
+
+class AsyncSupermemoryClient:
+    """Async client for interacting with Supermemory.ai API using the official SDK"""
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        Initialize the async Supermemory client.
+        
+        Args:
+            api_key: Your Supermemory API key. If not provided, will look for
+                    SUPERMEMORY_API_KEY environment variable.
+            base_url: Base URL for the API. If not provided, will look for
+                     SUPERMEMORY_BASE_URL environment variable or use default.
+        """
+        from supermemory import AsyncSupermemory
+        
+        self.api_key, self.base_url = resolve_credentials(api_key, base_url)
+        
+        self.client = AsyncSupermemory(
+            api_key=self.api_key,
+            base_url=self.base_url
+        )
+    
+    async def __aenter__(self) -> "AsyncSupermemoryClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+    
+    async def add_memory(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        container_tags: Optional[List[str]] = None,
+        custom_id: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Add a new memory to Supermemory.
+        
+        Args:
+            content: The content to store as a memory (text or URL)
+            metadata: Optional metadata dict to attach to the memory
+            user_id: Optional user ID for partitioning memories, sent as
+                     the container tag "user:<id>"
+            container_tags: Optional list of tags for grouping memories
+            custom_id: Optional custom ID for the memory
+            **kwargs: Additional arguments to pass to the API
+        
+        Returns:
+            Response from the API containing the created memory details
+        """
+        params = build_add_params(
+            content, metadata, user_id, container_tags, custom_id, **kwargs
+        )
+        
+        return await self.client.memories.add(**params)
+    
+    async def search_memories(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        user_id: Optional[str] = None,
+        container_tags: Optional[List[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Search through your memories.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            user_id: Only search memories added with this user ID (its
+                     "user:<id>" container tag)
+            container_tags: Only search memories with these container tags
+            **kwargs: Additional arguments to pass to the API
+        
+        Returns:
+            Search results from the API
+        """
+        params = build_search_params(query, limit, user_id, container_tags, **kwargs)
+        
+        return await self.client.search.execute(**params)
+    
+    async def add_memories_bulk(
+        self,
+        items: Iterable[Union[str, Dict[str, Any]]],
+        concurrency: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Add many memories concurrently.
+        
+        Args:
+            items: Iterable of content strings or dicts of add_memory() arguments
+            concurrency: Maximum number of in-flight requests
+        
+        Returns:
+            List of dicts with 'index', 'result' and 'error' for each item,
+            in input order (same shape as SupermemoryClient.add_memories_bulk)
+        """
+        async def run(index, item):
+            params = {"content": item} if isinstance(item, str) else dict(item)
+            try:
+                return {"index": index, "result": await self.add_memory(**params), "error": None}
+            except Exception as e:
+                return {"index": index, "result": None, "error": e}
+        
+        return await gather_bounded(
+            (lambda i=i, item=item: run(i, item) for i, item in enumerate(items)),
+            limit=concurrency
+        )
+    
+    async def search_memories_concurrently(
+        self,
+        queries: Iterable[str],
+        limit: Optional[int] = None,
+        concurrency: int = 16,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Run several searches concurrently on the shared event loop.
+        
+        Returns:
+            List of search responses (or exceptions) in the order of `queries`
+        """
+        return await gather_bounded(
+            (lambda q=q: self.search_memories(q, limit, **kwargs) for q in queries),
+            limit=concurrency,
+            return_exceptions=True
+        )
+    
+    def get_raw_client(self) -> "AsyncSupermemory":
+        """
+        Get the underlying AsyncSupermemory client for advanced usage.
+        
+        Returns:
+            The AsyncSupermemory client instance
+        """
+        return self.client
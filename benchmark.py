@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the Supermemory client against a local mock server.
+Measures throughput and latency percentiles and writes machine-readable results.
+
+Usage:
+    python benchmark.py --output benchmark_results.json
+    python benchmark.py --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_supermemory_server import MockSupermemoryServer
+
+SCENARIOS = (
+    "add_memory",
+    "search_memories",
+    "search_memories_cached",
+    "add_memories_bulk",
+    "search_memories_many",
+    "async_add_memories_bulk",
+    "save_session_end",
+    "import_supermemory_client",
+    "import_dual_memory_helper",
+)
+
+# Scenarios timing a cold `import <module>` in a fresh interpreter
+IMPORT_SCENARIOS = {
+    "import_supermemory_client": "supermemory_client",
+    "import_dual_memory_helper": "dual_memory_helper",
+}
+
+SAMPLE_TEXTS = [
+    "Machine learning lets systems learn patterns from data.",
+    "Neural networks are inspired by biological neurons.",
+    "REST APIs use HTTP methods for CRUD operations.",
+    "Docker packages applications into portable containers.",
+    "Kubernetes orchestrates containers across a cluster.",
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], duration: float, operations: int, errors: int) -> Dict[str, Any]:
+    """Build the result record for one scenario (latencies in milliseconds)."""
+    ordered = sorted(latencies)
+    return {
+        "operations": operations,
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "throughput_ops_s": round(operations / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable[[int], Any], count: int) -> Dict[str, Any]:
+    """Call fn(i) `count` times sequentially, timing each call."""
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(count):
+        call_started = time.perf_counter()
+        try:
+            fn(i)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started, count, errors)
+
+
+def time_batches(fn: Callable[[int], int], batches: int, batch_size: int) -> Dict[str, Any]:
+    """Call fn(i) per batch; fn returns its error count. Latency is per batch."""
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(batches):
+        call_started = time.perf_counter()
+        errors += fn(i)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started, batches * batch_size, errors)
+
+
+def time_import(module: str, count: int) -> Dict[str, Any]:
+    """
+    Import `module` in `count` fresh interpreters and time it with
+    `python -X importtime`. The latency is the module's cumulative import
+    time, without interpreter startup.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=here,
+            capture_output=True,
+            text=True
+        )
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1]) / 1e6
+        if proc.returncode != 0 or cumulative is None:
+            errors += 1
+            continue
+        latencies.append(cumulative)
+    return summarize(latencies, time.perf_counter() - started, count, errors)
+
+
+def run_scenario(name: str, base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one named scenario against the mock server at base_url."""
+    if name in IMPORT_SCENARIOS:
+        return time_import(IMPORT_SCENARIOS[name], max(1, min(args.requests, 20)))
+    
+    from supermemory_client import SupermemoryClient
+    
+    client = SupermemoryClient(api_key="benchmark", base_url=base_url)
+    n = args.requests
+    
+    if name == "add_memory":
+        return time_calls(lambda i: client.add_memory(SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]), n)
+    
+    if name == "search_memories":
+        return time_calls(lambda i: client.search_memories(f"query {i}", limit=5), n)
+    
+    if name == "search_memories_cached":
+        from search_cache import SearchCache
+        
+        cached = SupermemoryClient(api_key="benchmark", base_url=base_url, cache=SearchCache())
+        queries = ["containers", "neural networks", "http methods"]
+        return time_calls(lambda i: cached.search_memories(queries[i % len(queries)], limit=5), n)
+    
+    if name == "add_memories_bulk":
+        batch = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.batch_size)]
+        return time_batches(
+            lambda i: sum(1 for item in client.add_memories_bulk(batch, max_workers=args.concurrency)
+                          if item["error"] is not None),
+            max(1, n // args.batch_size),
+            args.batch_size
+        )
+    
+    if name == "search_memories_many":
+        queries = [f"query {j}" for j in range(args.batch_size)]
+        return time_batches(
+            lambda i: len(client.search_memories_many(queries, limit=5, max_workers=args.concurrency).errors),
+            max(1, n // args.batch_size),
+            args.batch_size
+        )
+    
+    if name == "async_add_memories_bulk":
+        from async_supermemory_client import AsyncSupermemoryClient
+        
+        batch = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.batch_size)]
+        
+        async def run_all():
+            async with AsyncSupermemoryClient(api_key="benchmark", base_url=base_url) as async_client:
+                async def one_batch(i):
+                    results = await async_client.add_memories_bulk(batch, concurrency=args.concurrency)
+                    return sum(1 for item in results if item["error"] is not None)
+                latencies = []
+                errors = 0
+                started = time.perf_counter()
+                batches = max(1, n // args.batch_size)
+                for i in range(batches):
+                    call_started = time.perf_counter()
+                    errors += await one_batch(i)
+                    latencies.append(time.perf_counter() - call_started)
+                return summarize(latencies, time.perf_counter() - started, batches * args.batch_size, errors)
+        
+        return asyncio.run(run_all())
+    
+    if name == "save_session_end":
+        from dual_memory_helper import DualMemoryHelper
+        
+        helper = DualMemoryHelper("benchmark-project", client=client)
+        
+        def save(i):
+            with contextlib.redirect_stdout(io.StringIO()):
+                helper.save_session_end(
+                    summary=f"Benchmark session {i}",
+                    next_steps="Keep measuring",
+                    status="benchmarking",
+                    verify=True
+                )
+        
+        return time_calls(save, max(1, n // 10))
+    
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Return a message for every scenario whose p95 latency or throughput
+    regressed by more than `threshold` (a fraction) against the baseline.
+    """
+    regressions = []
+    for name, current in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if previous["throughput_ops_s"] and \
+                current["throughput_ops_s"] < previous["throughput_ops_s"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_ops_s']} -> {current['throughput_ops_s']} ops/s"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Supermemory client against a mock server")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="operations per scenario")
+    parser.add_argument("--batch-size", type=int, default=20, help="items per bulk/multi-query call")
+    parser.add_argument("--concurrency", type=int, default=8, help="workers for bulk/multi-query calls")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="mock server latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of failing requests")
+    parser.add_argument("--indexing-delay", type=float, default=0.05, help="seconds until a memory is indexed")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--compare", help="baseline JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args(argv)
+    
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": {},
+    }
+    
+    with MockSupermemoryServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        indexing_delay=args.indexing_delay,
+        seed=0
+    ) as server:
+        # Seed a few memories so searches have something to match
+        from supermemory_client import SupermemoryClient
+        seed_client = SupermemoryClient(api_key="benchmark", base_url=server.url)
+        seed_client.add_memories_bulk(SAMPLE_TEXTS)
+        
+        for name in args.scenarios:
+            print(f"Running {name}...", flush=True)
+            try:
+                result = run_scenario(name, server.url, args)
+            except ImportError as e:
+                result = {"error": f"skipped: {e}"}
+            results["results"][name] = result
+            if "error" in result:
+                print(f"   {result['error']}")
+            else:
+                print(
+                    f"   {result['throughput_ops_s']:>9.1f} ops/s  "
+                    f"p50 {result['p50_ms']:.1f}ms  p95 {result['p95_ms']:.1f}ms  "
+                    f"p99 {result['p99_ms']:.1f}ms  errors {result['errors']}"
+                )
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n⚠️  Regressions detected:")
+            for message in regressions:
+                print(f"   - {message}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Client-side deduplication of memories by content hash.
+Derives stable custom IDs and skips uploads of content already sent.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+POLICIES = ("skip", "upsert", "force")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """Normalize content for hashing: Unicode NFC, trimmed, collapsed whitespace."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", content)).strip()
+
+
+def content_hash(
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    container_tags: Optional[Iterable[str]] = None
+) -> str:
+    """
+    Return a stable SHA-256 hex digest of normalized content plus metadata.
+    
+    Metadata keys and container tags are sorted, so the hash does not depend
+    on their order.
+    """
+    canonical = json.dumps(
+        {
+            "content": normalize_content(content),
+            "metadata": metadata or {},
+            "container_tags": sorted(container_tags or ())
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def custom_id_for_hash(digest: str) -> str:
+    """Derive the custom_id used for a content hash."""
+    return f"sha256-{digest[:40]}"
+
+
+class DuplicateMemory:
+    """Returned by add_memory() in place of an API response when an upload is skipped"""
+    
+    __slots__ = ("id", "status", "content_hash")
+    
+    def __init__(self, custom_id: str, digest: str):
+        self.id = custom_id
+        self.status = "duplicate"
+        self.content_hash = digest
+    
+    def __repr__(self) -> str:
+        return f"DuplicateMemory(id={self.id!r}, status='duplicate')"
+
+
+class ContentDeduper:
+    """
+    Set of content hashes already uploaded, with a dedupe policy.
+    
+    Policies:
+        skip: known content is not uploaded at all; add_memory() returns a
+              DuplicateMemory. New content is uploaded with a custom_id
+              derived from its hash.
+        upsert: content is always uploaded with the derived custom_id, so the
+                API updates the existing memory instead of adding a copy.
+        force: content is always uploaded unchanged (hashes are still
+               recorded).
+    
+    Hashes are kept in an exact set, not a probabilistic filter, because
+    under the "skip" policy a false positive would silently drop new
+    content. Hashes are stored as raw 32-byte digests. With `path`, hashes
+    are appended to a file and reloaded on start, so the dedupe state
+    survives restarts and can be shared by scripts run one after another.
+    """
+    
+    def __init__(self, policy: str = "skip", path: Optional[str] = None):
+        """
+        Initialize the deduper.
+        
+        Args:
+            policy: Default policy: "skip", "upsert" or "force"
+            path: Optional file of known hashes (one hex digest per line)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown dedupe policy: {policy!r} (expected one of {POLICIES})")
+        self.policy = policy
+        self.path = path
+        self.skipped = 0
+        self._known = set()
+        self._lock = threading.Lock()
+        
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._known.update(bytes.fromhex(line.strip()) for line in f if line.strip())
+    
+    def __contains__(self, digest: str) -> bool:
+        return bytes.fromhex(digest) in self._known
+    
+    def __len__(self) -> int:
+        return len(self._known)
+    
+    def record(self, digest: str) -> None:
+        """Mark a content hash as uploaded."""
+        key = bytes.fromhex(digest)
+        with self._lock:
+            if key in self._known:
+                return
+            self._known.add(key)
+            if self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(digest + "\n")
+    
+    def check(self, digest: str, policy: Optional[str] = None) -> bool:
+        """
+        Return True if an upload of content with this hash should be skipped.
+        """
+        policy = policy or self.policy
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown dedupe policy: {policy!r} (expected one of {POLICIES})")
+        if policy == "skip" and digest in self:
+            with self._lock:
+                self.skipped += 1
+            return True
+        return False
@@ -0,0 +1,267 @@
+"""
+Persistent search result cache for SupermemoryClient.
+SQLite-backed so several processes can share warm results safely.
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from search_cache import Scope
+
+DEFAULT_CACHE_PATH = os.path.join(".supermemory", "search_cache.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    user_id TEXT,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0);
+"""
+
+
+class DiskSearchCache:
+    """
+    SQLite-backed search cache shared across processes.
+    
+    Drop-in alternative to SearchCache: pass it as
+    SupermemoryClient(cache=DiskSearchCache(...)). The database runs in WAL
+    mode so readers never block writers, and every process pointing at the
+    same file sees the others' results and invalidations.
+    
+    Values are stored with pickle, so only point this at a file you trust.
+    """
+    
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = 10000,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0
+    ):
+        """
+        Initialize the cache, creating the database file if needed.
+        
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of cached searches; least recently
+                         used entries are evicted beyond this
+            ttl: Seconds an entry is fresh
+            stale_ttl: Extra seconds after `ttl` during which a stale entry is
+                       still returned while a background refresh runs
+                       (stale-while-revalidate). 0 disables it.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key, default=str)
+    
+    def _generation(self) -> int:
+        row = self._connection().execute(
+            "SELECT value FROM meta WHERE name = 'generation'"
+        ).fetchone()
+        return row[0]
+    
+    def _lookup(self, key: Hashable) -> Tuple[str, Any]:
+        """Return ('fresh' | 'stale' | 'miss', value) and update counters."""
+        conn = self._connection()
+        encoded = self._encode_key(key)
+        row = conn.execute(
+            "SELECT value, created_at FROM entries WHERE key = ?", (encoded,)
+        ).fetchone()
+        now = time.time()
+        if row is not None:
+            age = now - row[1]
+            if age < self.ttl + self.stale_ttl:
+                conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, encoded)
+                )
+                state = "fresh" if age < self.ttl else "stale"
+                with self._lock:
+                    if state == "fresh":
+                        self.hits += 1
+                    else:
+                        self.stale_hits += 1
+                return state, pickle.loads(row[0])
+        with self._lock:
+            self.misses += 1
+        return "miss", None
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key, ignoring the stale-while-revalidate window.
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        state, value = self._lookup(key)
+        return (True, value) if state == "fresh" else (False, None)
+    
+    def get_stale(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key whatever its age. Expired entries are kept until they
+        are replaced or evicted, so they can be served while the API is
+        unavailable.
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ?", (self._encode_key(key),)
+        ).fetchone()
+        return (True, pickle.loads(row[0])) if row is not None else (False, None)
+    
+    def put(self, key: Hashable, value: Any, scope: Scope = (None, frozenset())) -> None:
+        """Store a value, evicting least recently used entries past max_entries."""
+        user_id, tags = scope
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(key, value, created_at, accessed_at, user_id, tags) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._encode_key(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                now,
+                now,
+                user_id,
+                "".join(f"|{tag}|" for tag in sorted(tags))
+            )
+        )
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+    
+    def _fetch_and_store(self, key, fetch, scope):
+        generation = self._generation()
+        value = fetch()
+        if generation == self._generation():
+            self.put(key, value, scope)
+        return value
+    
+    def _refresh_in_background(self, key, fetch, scope):
+        encoded = self._encode_key(key)
+        with self._lock:
+            if encoded in self._refreshing:
+                return
+            self._refreshing.add(encoded)
+        
+        def run():
+            try:
+                self._fetch_and_store(key, fetch, scope)
+            except Exception:
+                pass  # keep serving the stale entry; the next lookup retries
+            finally:
+                with self._lock:
+                    self._refreshing.discard(encoded)
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        scope: Scope = (None, frozenset())
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `fetch()` on a miss.
+        
+        A stale entry inside the stale-while-revalidate window is returned
+        immediately and refreshed on a background thread.
+        """
+        state, value = self._lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self._refresh_in_background(key, fetch, scope)
+            return value
+        return self._fetch_and_store(key, fetch, scope)
+    
+    def invalidate(self, scope: Scope = (None, frozenset())) -> int:
+        """
+        Drop every entry whose search could include a memory written in `scope`
+        (same rules as SearchCache.invalidate).
+        
+        Returns:
+            Number of entries removed
+        """
+        user_id, tags = scope
+        clauses = ["(user_id IS NULL AND tags = '')"]
+        args = []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            args.append(user_id)
+        for tag in tags:
+            clauses.append("instr(tags, ?) > 0")
+            args.append(f"|{tag}|")
+        
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+            removed = conn.execute(
+                "DELETE FROM entries WHERE " + " OR ".join(clauses), args
+            ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._connection().execute("DELETE FROM entries")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return this process's hit/miss counters and the shared cache size."""
+        size = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "size": size,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0
+            }
@@ -3,15 +3,41 @@ Dual-Memory Helper for Session Management
 Saves session summaries to BOTH Windsurf Memory and Supermemory.ai
 """
 
-from supermemory import Supermemory
 import os
-from dotenv import load_dotenv
+import re
+import threading
+import time
 from datetime import datetime
 
+from dedupe import content_hash, custom_id_for_hash
+from supermemory_client import get_shared_client
+
+# Save timestamps this helper writes on their own line ("Saved: ...",
+# "Last Worked: ..."); they change on every save and are not hashed
+_TIMESTAMP_LINE_RE = re.compile(r"^[ \t]*(?:Saved|Last worked):.*$", re.IGNORECASE | re.MULTILINE)
+
+_verify_executor = None
+_verify_executor_lock = threading.Lock()
+
+
+def _get_verify_executor():
+    """Return the shared executor used for background save verification."""
+    global _verify_executor
+    with _verify_executor_lock:
+        if _verify_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            _verify_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="supermemory-verify"
+            )
+        return _verify_executor
+
+
 class DualMemoryHelper:
     """Helper class to save memories to both Windsurf and Supermemory.ai"""
     
-    def __init__(self, project_name, supermemory_api_key=None, supermemory_base_url=None):
+    def __init__(self, project_name, supermemory_api_key=None, supermemory_base_url=None, client=None,
+                 write_behind=False, spool_path=None, incremental=False, session_path=None, dedupe=None):
         """
         Initialize the dual-memory helper.
         
@@ -19,26 +45,157 @@ class DualMemoryHelper:
             project_name: Name of the project
             supermemory_api_key: Supermemory.ai API key (or from env)
             supermemory_base_url: Supermemory.ai base URL (or from env)
+            client: Optional SupermemoryClient to use. By default the
+                    process-wide shared client is used, so several helpers
+                    reuse one connection pool.
+            write_behind: If True, saves are appended to a local spool file and
+                          uploaded by a background flusher instead of blocking
+                          on the API (see write_behind.WriteBehindQueue)
+            spool_path: Spool file for write-behind mode (default:
+                        .supermemory/spool-<project_name>.jsonl)
+            incremental: If True, save_session_end keeps a structured session
+                         record and uploads only the fields that changed since
+                         the last save (see session_store.SessionStore)
+            session_path: Snapshot file for incremental mode (default:
+                          .supermemory/session-<project_name>.json)
+            dedupe: Optional dedupe.ContentDeduper checked before each save
+                    (and before spooling). The hash ignores the save
+                    timestamp lines and the "date" metadata, so saving the
+                    same decision or session again is caught.
         """
-        load_dotenv()
         self.project_name = project_name
         
         # Initialize Supermemory.ai client
-        api_key = supermemory_api_key or os.getenv('SUPERMEMORY_API_KEY')
-        base_url = supermemory_base_url or os.getenv('SUPERMEMORY_BASE_URL', 'https://api.supermemory.ai/')
+        if client is None:
+            try:
+                client = get_shared_client(supermemory_api_key, supermemory_base_url)
+            except ValueError:
+                client = None
         
-        if api_key:
-            self.supermemory_client = Supermemory(
-                api_key=api_key,
-                base_url=base_url
-            )
+        self.client = client
+        if client is not None:
             self.has_supermemory = True
         else:
-            self.supermemory_client = None
             self.has_supermemory = False
             print("⚠️  Supermemory.ai API key not found. Only Windsurf Memory will be used.")
+        
+        self.write_behind = None
+        if write_behind and self.has_supermemory:
+            from write_behind import WriteBehindQueue
+            self.write_behind = WriteBehindQueue(
+                self.client,
+                spool_path or os.path.join(".supermemory", f"spool-{project_name}.jsonl")
+            )
+        
+        self.dedupe = dedupe
+        
+        self.session_store = None
+        if incremental:
+            from session_store import SessionStore
+            self.session_store = SessionStore(project_name, path=session_path)
+    
+    @property
+    def supermemory_client(self):
+        """The raw SDK client (built on first access), or None without an API key."""
+        return self.client.get_raw_client() if self.client is not None else None
+    
+    def _spool(self, content, metadata, **kwargs):
+        """Spool a memory for background upload and return its result entry."""
+        spool_id = self.write_behind.enqueue(content=content, metadata=metadata, **kwargs)
+        print(f"   ✅ Spooled for upload to Supermemory.ai")
+        print(f"   Spool ID: {spool_id}")
+        return {
+            'id': None,
+            'spool_id': spool_id,
+            'status': 'spooled'
+        }
+    
+    def _check_duplicate(self, content, metadata, extra):
+        """
+        Apply the helper's deduper to a save.
+        
+        The helper's own timestamp lines and the "date" metadata are left
+        out of the hash. Sets a custom_id derived from the hash in `extra`
+        (unless one is set or the policy is "force") and disables the
+        client's own dedupe check.
+        
+        Returns:
+            (duplicate, digest): duplicate is True if the save should be
+            skipped; digest is None without a deduper
+        """
+        if self.dedupe is None:
+            return False, None
+        digest = content_hash(
+            _TIMESTAMP_LINE_RE.sub("", content),
+            {k: v for k, v in metadata.items() if k != "date"}
+        )
+        if self.dedupe.check(digest):
+            print("   ℹ️  Already saved, skipped (duplicate)")
+            return True, digest
+        if self.dedupe.policy != "force":
+            extra.setdefault('custom_id', custom_id_for_hash(digest))
+        extra['dedupe_policy'] = 'force'
+        return False, digest
     
-    def save_session_end(self, summary, next_steps, status, github_url=None, commit_hash=None, verify=True):
+    def _record(self, operation, started, t0, error=None):
+        """Report a timed helper step to the client's instrumentation, if any."""
+        instrumentation = getattr(self.client, 'instrumentation', None)
+        if instrumentation is not None:
+            instrumentation.record_call(operation, started, time.perf_counter() - t0, error=error)
+    
+    def _verify_indexed(self, memory_id, timeout):
+        """
+        Wait for a saved memory to finish indexing.
+        
+        Returns:
+            True if indexed, 'failed' if processing failed, 'pending' on timeout
+        """
+        started, t0 = time.time(), time.perf_counter()
+        try:
+            status = self.client.wait_until_indexed(memory_id, timeout=timeout)
+        finally:
+            self._record('verify_indexed', started, t0)
+        if status == 'done':
+            return True
+        if status == 'failed':
+            return 'failed'
+        return 'pending'
+    
+    def _session_memory(self, summary, next_steps, status, timestamp, github_url=None, commit_hash=None):
+        """Build the full session-end memory content and metadata."""
+        # Build detailed content for Supermemory
+        detailed_content = f"""
+{self.project_name} - Session End
+
+Summary: {summary}
+
+Next Steps: {next_steps}
+
+Status: {status}
+
+Last Worked: {timestamp}
+"""
+        if github_url:
+            detailed_content += f"\nGitHub: {github_url}"
+        if commit_hash:
+            detailed_content += f"\nCommit: {commit_hash}"
+        
+        # Build metadata
+        metadata = {
+            "project": self.project_name,
+            "type": "session_end",
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "status": status
+        }
+        if github_url:
+            metadata["github_url"] = github_url
+        if commit_hash:
+            metadata["commit"] = commit_hash
+        
+        return detailed_content, metadata
+    
+    def save_session_end(self, summary, next_steps, status, github_url=None, commit_hash=None, verify=True,
+                         verify_timeout=10.0, verify_async=False):
         """
         Save session end summary to BOTH memory systems with verification.
         
@@ -48,8 +205,14 @@ class DualMemoryHelper:
             status: Current project status
             github_url: Optional GitHub repository URL
             commit_hash: Optional Git commit hash
-            verify: If True, verify the save by searching (default: True)
-            
+            verify: If True, verify the save by polling the memory's
+                    indexing status (default: True)
+            verify_timeout: Seconds to wait for indexing before reporting
+                            'pending'
+            verify_async: If True, return immediately and put a
+                          concurrent.futures.Future under 'verification'
+                          that resolves to the verified value
+        
         Returns:
             dict with results from both systems including verification
         """
@@ -74,41 +237,63 @@ class DualMemoryHelper:
         # 2. Save to Supermemory.ai
         if self.has_supermemory:
             print("\n☁️  Supermemory.ai:")
+            started, t0 = time.time(), time.perf_counter()
             try:
-                # Build detailed content for Supermemory
-                detailed_content = f"""
-{self.project_name} - Session End
-
-Summary: {summary}
-
-Next Steps: {next_steps}
-
-Status: {status}
-
-Last Worked: {timestamp}
-"""
-                if github_url:
-                    detailed_content += f"\nGitHub: {github_url}"
-                if commit_hash:
-                    detailed_content += f"\nCommit: {commit_hash}"
+                extra = {}
+                if self.session_store is not None:
+                    record = self.session_store.prepare(
+                        {
+                            "summary": summary,
+                            "next_steps": next_steps,
+                            "status": status,
+                            "github_url": github_url,
+                            "commit_hash": commit_hash
+                        },
+                        last_worked=timestamp
+                    )
+                    if record is None:
+                        print("   ℹ️  Session unchanged since the last save, nothing uploaded")
+                        results['supermemory'] = {'id': None, 'status': 'unchanged'}
+                        results['verified'] = 'unchanged'
+                        self._record('save_session_end', started, t0)
+                        return results
+                    detailed_content = record['content']
+                    metadata = record['metadata']
+                    extra['custom_id'] = record['custom_id']
+                    kind = "full state" if record['full'] else "delta: " + ", ".join(record['changed'])
+                    print(f"   Session v{record['version']} ({kind})")
+                else:
+                    detailed_content, metadata = self._session_memory(
+                        summary, next_steps, status, timestamp, github_url, commit_hash
+                    )
                 
-                # Build metadata
-                metadata = {
-                    "project": self.project_name,
-                    "type": "session_end",
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                    "status": status
-                }
-                if github_url:
-                    metadata["github_url"] = github_url
-                if commit_hash:
-                    metadata["commit"] = commit_hash
+                duplicate, digest = self._check_duplicate(detailed_content, metadata, extra)
+                if duplicate:
+                    results['supermemory'] = {'id': custom_id_for_hash(digest), 'status': 'duplicate'}
+                    results['verified'] = 'duplicate'
+                    self._record('save_session_end', started, t0)
+                    return results
+                
+                if self.write_behind is not None:
+                    results['supermemory'] = self._spool(detailed_content, metadata, **extra)
+                    if self.session_store is not None:
+                        self.session_store.commit(record)
+                    if digest is not None:
+                        self.dedupe.record(digest)
+                    results['verified'] = 'pending'
+                    self._record('save_session_end', started, t0)
+                    return results
                 
                 # Save to Supermemory.ai
-                response = self.supermemory_client.memories.add(
+                response = self.client.add_memory(
                     content=detailed_content,
-                    metadata=metadata
+                    metadata=metadata,
+                    **extra
                 )
+                if self.session_store is not None:
+                    self.session_store.commit(record, response.id)
+                if digest is not None:
+                    self.dedupe.record(digest)
                 
                 print(f"   ✅ Saved to Supermemory.ai")
                 print(f"   Memory ID: {response.id}")
@@ -119,37 +304,52 @@ Last Worked: {timestamp}
                     'status': response.status
                 }
                 
-                # VERIFICATION: Search to confirm memory was saved
-                if verify:
-                    print(f"\n🔍 Verifying save...")
-                    import time
-                    time.sleep(1)  # Brief delay for indexing
-                    
-                    search_response = self.supermemory_client.search.execute(
-                        q=f"{self.project_name} session end",
-                        limit=5
+                # VERIFICATION: Poll the memory's status until it is indexed
+                if verify and verify_async:
+                    print(f"\n🔍 Verifying save in the background...")
+                    results['verified'] = 'pending'
+                    results['verification'] = _get_verify_executor().submit(
+                        self._verify_indexed, response.id, verify_timeout
                     )
+                elif verify:
+                    print(f"\n🔍 Verifying save...")
+                    verified = self._verify_indexed(response.id, verify_timeout)
                     
-                    # Check if our memory appears in results
-                    found = False
-                    for result in search_response.results:
-                        if result.document_id == response.id:
-                            found = True
-                            break
-                    
-                    if found:
-                        print(f"   ✅ Verified: Memory found in search results")
-                        results['verified'] = True
+                    if verified is True:
+                        print(f"   ✅ Verified: Memory indexed and searchable")
+                    elif verified == 'failed':
+                        print(f"   ❌ Memory saved but processing failed")
                     else:
                         print(f"   ⚠️  Memory saved but not yet indexed (may take a few seconds)")
-                        results['verified'] = 'pending'
+                    results['verified'] = verified
                 
+                self._record('save_session_end', started, t0)
             except Exception as e:
                 print(f"   ❌ Error saving to Supermemory.ai: {e}")
                 results['supermemory'] = f'error: {e}'
+                self._record('save_session_end', started, t0, error=e)
         
         return results
     
+    def get_session_state(self, remote=False):
+        """
+        Return the project's session state in incremental mode.
+        
+        Args:
+            remote: If True, rebuild the state from the uploaded full-state and
+                    delta memories instead of reading the local snapshot
+        
+        Returns:
+            dict with 'version', 'fields' and 'last_worked', or None if
+            incremental mode is off or nothing has been saved
+        """
+        if self.session_store is None:
+            return None
+        if remote:
+            return self.session_store.load_remote(self.client) if self.has_supermemory else None
+        state = self.session_store.state()
+        return state if state['version'] else None
+    
     def save_decision(self, decision, category, reasoning=None):
         """
         Save an important decision to both memory systems.
@@ -176,16 +376,29 @@ Last Worked: {timestamp}
                     content += f"\n\nReasoning: {reasoning}"
                 content += f"\n\nSaved: {timestamp}"
                 
-                response = self.supermemory_client.memories.add(
-                    content=content,
-                    metadata={
-                        "project": self.project_name,
-                        "type": "decision",
-                        "category": category.lower().replace(" ", "_"),
-                        "date": datetime.now().strftime("%Y-%m-%d")
-                    }
-                )
-                print(f"   ✅ Saved to Supermemory.ai (ID: {response.id})")
+                metadata = {
+                    "project": self.project_name,
+                    "type": "decision",
+                    "category": category.lower().replace(" ", "_"),
+                    "date": datetime.now().strftime("%Y-%m-%d")
+                }
+                
+                extra = {}
+                duplicate, digest = self._check_duplicate(content, metadata, extra)
+                if duplicate:
+                    return
+                
+                if self.write_behind is not None:
+                    self._spool(content, metadata, **extra)
+                else:
+                    response = self.client.add_memory(
+                        content=content,
+                        metadata=metadata,
+                        **extra
+                    )
+                    print(f"   ✅ Saved to Supermemory.ai (ID: {response.id})")
+                if digest is not None:
+                    self.dedupe.record(digest)
             except Exception as e:
                 print(f"   ❌ Error: {e}")
 
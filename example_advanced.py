@@ -46,19 +46,19 @@ def main():
         "neural networks"
     ]
     
-    for query in search_queries:
-        response = client.search_memories(query=query, limit=3)
+    # All queries run concurrently; results are fused into one ranking
+    multi_response = client.search_memories_many(search_queries, limit=3)
+    for query, response in multi_response.responses.items():
         print(f"\n   Query: '{query}'")
-        
-        # Handle response object
-        if hasattr(response, 'results'):
-            results = response.results
-            print(f"   Results: {len(results)}")
-            for result in results[:2]:
-                result_str = str(result)
-                print(f"   - {result_str[:80]}...")
-        else:
-            print(f"   Response: {response}")
+        print(f"   Results: {len(response.results)}")
+        for result in response.results[:2]:
+            result_str = str(result)
+            print(f"   - {result_str[:80]}...")
+    
+    print(f"\n   Fused top results across all queries:")
+    for result in multi_response.results:
+        result_str = str(result)
+        print(f"   - {result_str[:80]}...")
     print()
     
     # Example 3: Using the raw SDK client for advanced features
@@ -82,9 +82,13 @@ def main():
         "GraphQL is a query language for APIs and a runtime for executing those queries."
     ]
     
-    for content in batch_contents:
-        client.add_memory(content=content)
-        print(f"✓ Added: {content[:50]}...")
+    # Uploads run concurrently; results come back in input order
+    for item in client.add_memories_bulk(batch_contents, max_workers=4):
+        content = batch_contents[item['index']]
+        if item['error']:
+            print(f"✗ Failed: {content[:50]}... ({item['error']})")
+        else:
+            print(f"✓ Added: {content[:50]}...")
     print()
     
     print("=== Advanced examples completed! ===")
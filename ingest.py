@@ -0,0 +1,537 @@
+"""
+Parallel ingestion of files and directories into Supermemory.ai
+CPU work (reading, normalizing, hashing, chunking) runs in a process pool, uploads in a thread pool.
+
+Usage:
+    python ingest.py docs/ notes/*.md --project my-project
+    python ingest.py "src/**/*.py" --cpu-workers 8 --upload-workers 16
+    python ingest.py docs/ --dry-run    # time the CPU stage only
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from streaming_ingest import (
+    DEFAULT_BUFFER_SIZE, DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, document_id_for_path, iter_chunks, iter_text,
+    prune_chunks
+)
+
+# File patterns ingested when walking a directory
+DEFAULT_INCLUDE = ("*.md", "*.markdown", "*.txt", "*.rst", "*.org", "*.adoc")
+
+# Directories never walked into
+SKIP_DIRS = {".git", ".hg", ".svn", ".supermemory", "__pycache__", "node_modules", ".venv", "venv"}
+
+DEFAULT_MANIFEST = os.path.join(".supermemory", "ingest-manifest.jsonl")
+
+
+def expand_paths(
+    patterns: Iterable[str],
+    include: Iterable[str] = DEFAULT_INCLUDE,
+    exclude: Iterable[str] = ()
+) -> List[str]:
+    """
+    Resolve files, directories and glob patterns to a sorted list of files.
+    
+    Files named explicitly are always kept. Directories are walked
+    recursively and matched against `include`. Glob patterns support
+    "**". Anything matching `exclude` (by name or path) is dropped.
+    """
+    include = tuple(include)
+    exclude = tuple(exclude)
+    
+    def excluded(path):
+        return any(
+            fnmatch.fnmatch(os.path.basename(path), pattern) or fnmatch.fnmatch(path, pattern)
+            for pattern in exclude
+        )
+    
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+                for name in files:
+                    if any(fnmatch.fnmatch(name, p) for p in include):
+                        found.add(os.path.join(root, name))
+        elif os.path.isfile(pattern):
+            found.add(pattern)
+        else:
+            found.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.normpath(path) for path in found if not excluded(path))
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw reader that feeds every byte read through SHA-256."""
+    
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer: Any) -> int:
+        count = self.raw.readinto(buffer)
+        if count:
+            self.sha256.update(memoryview(buffer)[:count])
+        return count
+
+
+def _nfc_blocks(blocks: Iterable[str]) -> Iterator[str]:
+    """
+    NFC-normalize a stream of text blocks.
+    
+    Each block is cut before its last whitespace character and the rest is
+    carried into the next one. Nothing composes with a following
+    whitespace character, so the output equals normalizing the whole text.
+    """
+    pending = ""
+    for block in blocks:
+        text = pending + block
+        cut = max(text.rfind("\n"), text.rfind(" "))
+        if cut <= 0:
+            pending = text
+            continue
+        pending = text[cut:]
+        yield unicodedata.normalize("NFC", text[:cut])
+    if pending:
+        yield unicodedata.normalize("NFC", pending)
+
+
+def prepare_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    encoding: str = "utf-8"
+) -> Dict[str, Any]:
+    """
+    Read, normalize, hash and chunk one file (runs in a worker process).
+    
+    Text is decoded (invalid bytes replaced), Unicode NFC-normalized and
+    given \\n line endings before chunking, so the same document chunks
+    identically on every platform. Files with NUL bytes are skipped as
+    binary.
+    
+    The file is streamed through the chunker block by block, and chunks
+    are written to a temporary JSONL spool file as they are cut. Memory
+    use does not grow with the file size, and only the spool's path goes
+    back to the parent process (see read_spool()).
+    
+    Returns:
+        dict with 'path', 'sha256', 'characters', 'chunks' (count) and
+        'spool' (path), or 'path' and 'skipped'/'error' (text)
+    """
+    spool = None
+    try:
+        with open(path, "rb", buffering=0) as raw:
+            reader = _HashingReader(raw)
+            stream = io.BufferedReader(reader, DEFAULT_BUFFER_SIZE)
+            if b"\0" in stream.peek(8192)[:8192]:
+                return {"path": path, "skipped": "binary"}
+            text = io.TextIOWrapper(stream, encoding=encoding, errors="replace")
+            
+            characters = 0
+            
+            def blocks():
+                nonlocal characters
+                for block in _nfc_blocks(iter_text(text)):
+                    characters += len(block)
+                    yield block
+            
+            fd, spool = tempfile.mkstemp(prefix="ingest-", suffix=".jsonl")
+            count = 0
+            with open(fd, "w", encoding="utf-8") as out:
+                for chunk in iter_chunks(blocks(), chunk_size, overlap):
+                    out.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+                    count += 1
+    except OSError as e:
+        if spool is not None:
+            os.remove(spool)
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "sha256": reader.sha256.hexdigest(),
+        "characters": characters,
+        "chunks": count,
+        "spool": spool,
+    }
+
+
+def read_spool(result: Dict[str, Any]) -> Iterator[str]:
+    """Yield the chunks of a prepare_file() result, deleting its spool file afterwards."""
+    try:
+        with open(result["spool"], "r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+    finally:
+        os.remove(result["spool"])
+
+
+def _discard(result: Dict[str, Any]) -> None:
+    """Delete the spool file of a prepare_file() result whose chunks are not needed."""
+    if "spool" in result and os.path.exists(result["spool"]):
+        os.remove(result["spool"])
+
+
+class IngestManifest:
+    """
+    Append-only record of the files fully uploaded, for resuming.
+    
+    A file is recorded only after all of its chunks uploaded. On the next
+    run it is skipped if its size and modification time are unchanged, or
+    if its content hash is. Later lines override earlier ones.
+    """
+    
+    def __init__(self, path: str = DEFAULT_MANIFEST):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["path"]] = entry
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+    
+    def unchanged(self, path: str, stat: os.stat_result) -> bool:
+        entry = self.entries.get(os.path.abspath(path))
+        return bool(entry) and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+    
+    def same_content(self, path: str, sha256: str) -> bool:
+        entry = self.entries.get(os.path.abspath(path))
+        return bool(entry) and entry["sha256"] == sha256
+    
+    def chunks(self, path: str) -> Optional[int]:
+        """Chunk count of the last recorded upload of `path`, or None."""
+        entry = self.entries.get(os.path.abspath(path))
+        return entry["chunks"] if entry else None
+    
+    def record(self, path: str, sha256: str, chunks: int) -> None:
+        stat = os.stat(path)
+        entry = {
+            "path": os.path.abspath(path),
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunks": chunks,
+        }
+        self.entries[entry["path"]] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+def _prepared(
+    paths: List[str],
+    cpu_workers: int,
+    chunk_size: int,
+    overlap: int,
+    encoding: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield prepare_file() results, computed by `cpu_workers` processes (0: inline).
+    
+    Spool files of results that were prepared but never yielded (the
+    consumer stopped early) are deleted.
+    """
+    if cpu_workers <= 0:
+        for path in paths:
+            yield prepare_file(path, chunk_size, overlap, encoding)
+        return
+    
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    ready = []
+    pending = set()
+    try:
+        with ProcessPoolExecutor(max_workers=cpu_workers) as pool:
+            queue = iter(paths)
+            while True:
+                for path in queue:
+                    pending.add(pool.submit(prepare_file, path, chunk_size, overlap, encoding))
+                    if len(pending) >= 2 * cpu_workers:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                ready.extend(done)
+                while ready:
+                    yield ready.pop().result()
+    finally:
+        for future in ready + list(pending):
+            if not future.cancelled() and future.exception() is None:
+                _discard(future.result())
+
+
+def ingest_paths(
+    client: Any,
+    paths: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    cpu_workers: Optional[int] = None,
+    upload_workers: int = 8,
+    max_in_flight: Optional[int] = None,
+    manifest: Optional[IngestManifest] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    encoding: str = "utf-8",
+    dry_run: bool = False,
+    prune: bool = True,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Ingest files as chunk memories, preparing them in processes and uploading in threads.
+    
+    The two stages are pipelined. Files are prepared by `cpu_workers`
+    processes, at most two per worker ahead of the upload stage. Their
+    chunks are read back lazily from the workers' spool files and stream
+    into the client's bulk uploader with `upload_workers`
+    concurrent uploads. Chunks carry the same metadata and custom IDs as
+    ingest_stream() ("<document_id>-<chunk_index>"), so re-ingesting a
+    file updates its memories. If a file got shorter, the chunks past its
+    new end are deleted once all of its chunks uploaded (see
+    prune_chunks()). Deleting stops at the chunk count in the manifest,
+    or probes for the end when the file has no manifest entry.
+    
+    Args:
+        client: SupermemoryClient to upload through (unused for dry runs)
+        paths: Files to ingest (see expand_paths())
+        chunk_size: Maximum characters per chunk
+        overlap: Characters of context shared by consecutive chunks
+        cpu_workers: Processes for reading and chunking (default: CPU
+                     count; 0 prepares files in this process)
+        upload_workers: Concurrent uploads
+        max_in_flight: Maximum chunks queued ahead of completed uploads
+        manifest: IngestManifest for skipping files already uploaded and
+                  recording new ones
+        metadata: Extra metadata attached to every chunk
+        encoding: Text encoding of the files
+        dry_run: Prepare files but upload nothing (measures the CPU stage)
+        prune: Delete chunks left over from a longer earlier version
+        progress: Called with the stats dict after every file and chunk
+        **kwargs: Other add_memory() arguments (user_id, container_tags, ...)
+    
+    Returns:
+        dict with 'files', 'skipped', 'chunks', 'characters', 'failed_chunks',
+        'pruned' (stale chunks deleted), 'errors' (path -> message) and
+        'elapsed'
+    """
+    paths = list(paths)
+    if cpu_workers is None:
+        cpu_workers = os.cpu_count() or 1
+    started = time.perf_counter()
+    stats = {
+        "total_files": len(paths), "files": 0, "skipped": 0, "chunks": 0,
+        "characters": 0, "failed_chunks": 0, "pruned": 0, "errors": {}, "elapsed": 0.0,
+    }
+    
+    def report():
+        stats["elapsed"] = time.perf_counter() - started
+        if progress:
+            progress(stats)
+    
+    todo = []
+    for path in paths:
+        if manifest is not None and manifest.unchanged(path, os.stat(path)):
+            stats["skipped"] += 1
+        else:
+            todo.append(path)
+    
+    files = {}      # path -> {'sha256', 'chunks', 'previous', 'remaining', 'failed'}
+    owners = {}     # upload index -> path
+    submitted = 0
+    
+    def finish(path):
+        state = files.pop(path)
+        if state["failed"]:
+            stats["errors"].setdefault(path, "some chunks failed to upload")
+            report()
+            return
+        if prune and not dry_run:
+            try:
+                stats["pruned"] += prune_chunks(
+                    client, document_id_for_path(path), state["chunks"], state["previous"],
+                    user_id=kwargs.get("user_id"), container_tags=kwargs.get("container_tags")
+                )
+            except Exception as e:
+                stats["errors"][path] = f"deleting stale chunks failed: {e}"
+                report()
+                return
+        stats["files"] += 1
+        if manifest is not None and not dry_run:
+            manifest.record(path, state["sha256"], state["chunks"])
+        report()
+    
+    def items():
+        nonlocal submitted
+        for result in _prepared(todo, cpu_workers, chunk_size, overlap, encoding):
+            path = result["path"]
+            if "error" in result:
+                stats["errors"][path] = result["error"]
+                report()
+                continue
+            if "skipped" in result or (manifest is not None and manifest.same_content(path, result["sha256"])):
+                _discard(result)
+                stats["skipped"] += 1
+                if manifest is not None and "sha256" in result and not dry_run:
+                    manifest.record(path, result["sha256"], result["chunks"])
+                report()
+                continue
+            
+            chunks = result["chunks"]
+            stats["characters"] += result["characters"]
+            files[path] = {"sha256": result["sha256"], "chunks": chunks,
+                           "previous": manifest.chunks(path) if manifest is not None else None,
+                           "remaining": chunks, "failed": False}
+            if dry_run or not chunks:
+                _discard(result)
+                stats["chunks"] += chunks
+                finish(path)
+                continue
+            
+            document_id = document_id_for_path(path)
+            base_metadata = dict(metadata or {}, document_id=document_id,
+                                 source=os.path.basename(path))
+            for index, chunk in enumerate(read_spool(result)):
+                owners[submitted] = path
+                submitted += 1
+                yield dict(
+                    kwargs,
+                    content=chunk,
+                    metadata=dict(base_metadata, chunk_index=index),
+                    custom_id=f"{document_id}-{index}"
+                )
+    
+    if dry_run:
+        for _ in items():
+            pass
+        report()
+        return stats
+    
+    for outcome in client.iter_add_memories_bulk(
+        items(), max_workers=upload_workers, ordered=False, max_in_flight=max_in_flight
+    ):
+        path = owners.pop(outcome["index"])
+        state = files[path]
+        if outcome["error"] is not None:
+            stats["failed_chunks"] += 1
+            state["failed"] = True
+        else:
+            stats["chunks"] += 1
+        state["remaining"] -= 1
+        if state["remaining"] == 0:
+            finish(path)
+        else:
+            report()
+    report()
+    return stats
+
+
+def progress_printer(interval: float = 0.25) -> Callable[[Dict[str, Any]], None]:
+    """Return a progress callback that rewrites one stderr line at most every `interval` seconds."""
+    last = 0.0
+    shown = None
+    
+    def show(stats):
+        nonlocal last, shown
+        now = time.perf_counter()
+        done = stats["files"] + stats["skipped"] + len(stats["errors"])
+        state = (done, stats["chunks"])
+        if state == shown or (now - last < interval and done < stats["total_files"]):
+            return
+        last, shown = now, state
+        rate = stats["chunks"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        print(
+            f"\r   files {done}/{stats['total_files']}  chunks {stats['chunks']}"
+            f"  ({rate:.1f}/s)  errors {len(stats['errors'])}",
+            end="", file=sys.stderr, flush=True
+        )
+    
+    return show
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest files and directories into Supermemory.ai")
+    parser.add_argument("paths", nargs="+", help="files, directories or glob patterns")
+    parser.add_argument("--include", nargs="+", default=list(DEFAULT_INCLUDE),
+                        help="file patterns picked up when walking directories")
+    parser.add_argument("--exclude", nargs="+", default=[], help="file or path patterns to skip")
+    parser.add_argument("--project", help="metadata project name for every chunk")
+    parser.add_argument("--container-tags", nargs="+", help="container tags for every chunk")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    parser.add_argument("--cpu-workers", type=int, default=os.cpu_count() or 1,
+                        help="processes for reading and chunking (0: in-process)")
+    parser.add_argument("--upload-workers", type=int, default=8, help="concurrent uploads")
+    parser.add_argument("--max-in-flight", type=int, help="chunks queued ahead of uploads")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="resume manifest file")
+    parser.add_argument("--no-resume", action="store_true", help="ignore the manifest and ingest everything")
+    parser.add_argument("--rate-limit", action="store_true", help="use the client-side rate limiter")
+    parser.add_argument("--dry-run", action="store_true", help="prepare files without uploading")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="keep chunks left over from longer earlier versions")
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+    
+    paths = expand_paths(args.paths, args.include, args.exclude)
+    if not paths:
+        print("No matching files", file=sys.stderr)
+        return 1
+    
+    client = None
+    if not args.dry_run:
+        from supermemory_client import SupermemoryClient
+        
+        client = SupermemoryClient(rate_limit=True if args.rate_limit else None)
+    manifest = None if args.no_resume or args.dry_run else IngestManifest(args.manifest)
+    kwargs = {"container_tags": args.container_tags} if args.container_tags else {}
+    try:
+        stats = ingest_paths(
+            client,
+            paths,
+            chunk_size=args.chunk_size,
+            overlap=args.overlap,
+            cpu_workers=args.cpu_workers,
+            upload_workers=args.upload_workers,
+            max_in_flight=args.max_in_flight,
+            manifest=manifest,
+            metadata={"project": args.project} if args.project else None,
+            dry_run=args.dry_run,
+            prune=not args.no_prune,
+            progress=None if args.quiet else progress_printer(),
+            **kwargs
+        )
+    finally:
+        if manifest is not None:
+            manifest.close()
+    
+    verb = "Prepared" if args.dry_run else "Ingested"
+    print(
+        f"\n✅ {verb} {stats['files']} files ({stats['chunks']} chunks, "
+        f"{stats['characters']} characters) in {stats['elapsed']:.1f}s; "
+        f"{stats['skipped']} skipped"
+    )
+    if stats["errors"]:
+        print(f"⚠️  {len(stats['errors'])} files failed; rerun to retry them:")
+        for path, message in sorted(stats["errors"].items()):
+            print(f"   - {path}: {message}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+"""
+Instrumentation hooks for SupermemoryClient.
+Per-call timing, payload sizes, retries, cache hit rates and indexing lag,
+exported as Prometheus text or OpenTelemetry spans.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Histogram bucket upper bounds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+INDEXING_LAG_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Instrumentation:
+    """
+    Interface for instrumentation backends; every hook is a no-op.
+    
+    Hooks are called after the fact with the measured values, so a backend
+    never adds work to the request path itself. A client without
+    instrumentation skips the hooks entirely.
+    """
+    
+    def record_call(
+        self,
+        operation: str,
+        started: float,
+        duration: float,
+        error: Optional[BaseException] = None,
+        attempts: int = 1,
+        payload_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Record one completed call.
+        
+        Args:
+            operation: Name such as "memories.add" or "save_session_end"
+            started: Wall-clock start time (time.time())
+            duration: Seconds the call took, retries included
+            error: The exception if the call failed
+            attempts: Number of attempts made (1 + retries)
+            payload_bytes: Size of the request body content, if known
+        """
+    
+    def record_cache(self, hit: bool) -> None:
+        """Record one search cache lookup."""
+    
+    def record_indexing_lag(self, seconds: float, status: Optional[str]) -> None:
+        """Record how long a memory took to reach `status` after being polled for."""
+    
+    def record_hedge(self, operation: str, winner: str) -> None:
+        """Record a hedged call and which request answered ("primary", "hedge" or "none")."""
+    
+    def record_circuit(self, state: str) -> None:
+        """Record a circuit breaker transition to `state` ("closed", "open", "half_open")."""
+
+
+class MultiInstrumentation(Instrumentation):
+    """Fan each hook out to several backends (e.g. metrics and tracing)."""
+    
+    def __init__(self, *backends: Instrumentation):
+        self.backends = backends
+    
+    def record_call(self, *args, **kwargs) -> None:
+        for backend in self.backends:
+            backend.record_call(*args, **kwargs)
+    
+    def record_cache(self, hit: bool) -> None:
+        for backend in self.backends:
+            backend.record_cache(hit)
+    
+    def record_indexing_lag(self, seconds: float, status: Optional[str]) -> None:
+        for backend in self.backends:
+            backend.record_indexing_lag(seconds, status)
+    
+    def record_hedge(self, operation: str, winner: str) -> None:
+        for backend in self.backends:
+            backend.record_hedge(operation, winner)
+    
+    def record_circuit(self, state: str) -> None:
+        for backend in self.backends:
+            backend.record_circuit(state)
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRecorder(Instrumentation):
+    """
+    In-memory counters and histograms, rendered in Prometheus text format.
+    
+    Metrics:
+        supermemory_calls_total{operation,outcome}
+        supermemory_call_duration_seconds{operation} (histogram)
+        supermemory_call_retries_total{operation}
+        supermemory_payload_bytes{operation} (histogram)
+        supermemory_cache_lookups_total{result}
+        supermemory_indexing_lag_seconds{status} (histogram)
+        supermemory_hedged_calls_total{operation,winner}
+        supermemory_circuit_transitions_total{state}
+        supermemory_circuit_open (gauge, 1 while open or half-open)
+    
+    The outcome label is "success", "error", "rejected" (circuit open) or
+    "deadline" (deadline exceeded).
+    """
+    
+    def __init__(
+        self,
+        duration_buckets: Sequence[float] = DURATION_BUCKETS,
+        payload_buckets: Sequence[float] = PAYLOAD_BUCKETS,
+        indexing_lag_buckets: Sequence[float] = INDEXING_LAG_BUCKETS
+    ):
+        self.duration_buckets = tuple(duration_buckets)
+        self.payload_buckets = tuple(payload_buckets)
+        self.indexing_lag_buckets = tuple(indexing_lag_buckets)
+        
+        self._calls = {}
+        self._retries = {}
+        self._durations = {}
+        self._payloads = {}
+        self._cache = {"hit": 0, "miss": 0}
+        self._indexing_lag = {}
+        self._hedges = {}
+        self._circuit = {}
+        self._circuit_open = 0
+        self._lock = threading.Lock()
+    
+    def record_call(
+        self,
+        operation: str,
+        started: float,
+        duration: float,
+        error: Optional[BaseException] = None,
+        attempts: int = 1,
+        payload_bytes: Optional[int] = None
+    ) -> None:
+        outcome = "success" if error is None else getattr(error, "outcome", "error")
+        with self._lock:
+            key = (operation, outcome)
+            self._calls[key] = self._calls.get(key, 0) + 1
+            if attempts > 1:
+                self._retries[operation] = self._retries.get(operation, 0) + attempts - 1
+            histogram = self._durations.get(operation)
+            if histogram is None:
+                histogram = self._durations[operation] = _Histogram(self.duration_buckets)
+            histogram.observe(duration)
+            if payload_bytes is not None:
+                histogram = self._payloads.get(operation)
+                if histogram is None:
+                    histogram = self._payloads[operation] = _Histogram(self.payload_buckets)
+                histogram.observe(payload_bytes)
+    
+    def record_cache(self, hit: bool) -> None:
+        with self._lock:
+            self._cache["hit" if hit else "miss"] += 1
+    
+    def record_indexing_lag(self, seconds: float, status: Optional[str]) -> None:
+        status = status or "unknown"
+        with self._lock:
+            histogram = self._indexing_lag.get(status)
+            if histogram is None:
+                histogram = self._indexing_lag[status] = _Histogram(self.indexing_lag_buckets)
+            histogram.observe(seconds)
+    
+    def record_hedge(self, operation: str, winner: str) -> None:
+        with self._lock:
+            key = (operation, winner)
+            self._hedges[key] = self._hedges.get(key, 0) + 1
+    
+    def record_circuit(self, state: str) -> None:
+        with self._lock:
+            self._circuit[state] = self._circuit.get(state, 0) + 1
+            self._circuit_open = 0 if state == "closed" else 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a summary of the recorded metrics as plain dicts.
+        
+        Returns:
+            dict with 'calls' (per operation: count, errors, retries,
+            mean_duration), 'cache' (hits, misses, hit_rate) and
+            'indexing_lag' (per status: count, mean), 'hedges' (per
+            operation: count per winner) and 'circuit' (transitions per
+            state, open)
+        """
+        with self._lock:
+            calls = {}
+            for (operation, outcome), count in self._calls.items():
+                entry = calls.setdefault(operation, {"count": 0, "errors": 0})
+                entry["count"] += count
+                if outcome != "success":
+                    entry["errors"] += count
+            for operation, entry in calls.items():
+                histogram = self._durations[operation]
+                entry["retries"] = self._retries.get(operation, 0)
+                entry["mean_duration"] = histogram.sum / histogram.count
+            lookups = self._cache["hit"] + self._cache["miss"]
+            hedges = {}
+            for (operation, winner), count in self._hedges.items():
+                hedges.setdefault(operation, {})[winner] = count
+            return {
+                "calls": calls,
+                "cache": {
+                    "hits": self._cache["hit"],
+                    "misses": self._cache["miss"],
+                    "hit_rate": self._cache["hit"] / lookups if lookups else 0.0
+                },
+                "indexing_lag": {
+                    status: {"count": h.count, "mean": h.sum / h.count}
+                    for status, h in self._indexing_lag.items()
+                },
+                "hedges": hedges,
+                "circuit": {"transitions": dict(self._circuit), "open": bool(self._circuit_open)}
+            }
+    
+    def _render_histogram(self, lines, name, label, histograms) -> None:
+        for value, histogram in sorted(histograms.items()):
+            cumulative = 0
+            bounds = histogram.buckets + (float("inf"),)
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{name}_bucket{_labels((label,), (value,), le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels((label,), (value,))} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{_labels((label,), (value,))} {histogram.count}")
+    
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines.append("# HELP supermemory_calls_total Completed calls by operation and outcome")
+            lines.append("# TYPE supermemory_calls_total counter")
+            for (operation, outcome), count in sorted(self._calls.items()):
+                labels = _labels(("operation", "outcome"), (operation, outcome))
+                lines.append(f"supermemory_calls_total{labels} {count}")
+            
+            lines.append("# HELP supermemory_call_duration_seconds Call latency including retries")
+            lines.append("# TYPE supermemory_call_duration_seconds histogram")
+            self._render_histogram(lines, "supermemory_call_duration_seconds", "operation", self._durations)
+            
+            lines.append("# HELP supermemory_call_retries_total Retried attempts by operation")
+            lines.append("# TYPE supermemory_call_retries_total counter")
+            for operation, count in sorted(self._retries.items()):
+                lines.append(f"supermemory_call_retries_total{_labels(('operation',), (operation,))} {count}")
+            
+            lines.append("# HELP supermemory_payload_bytes Request content size in bytes")
+            lines.append("# TYPE supermemory_payload_bytes histogram")
+            self._render_histogram(lines, "supermemory_payload_bytes", "operation", self._payloads)
+            
+            lines.append("# HELP supermemory_cache_lookups_total Search cache lookups by result")
+            lines.append("# TYPE supermemory_cache_lookups_total counter")
+            for result, count in sorted(self._cache.items()):
+                lines.append(f"supermemory_cache_lookups_total{_labels(('result',), (result,))} {count}")
+            
+            lines.append("# HELP supermemory_indexing_lag_seconds Time from polling start to final status")
+            lines.append("# TYPE supermemory_indexing_lag_seconds histogram")
+            self._render_histogram(lines, "supermemory_indexing_lag_seconds", "status", self._indexing_lag)
+            
+            lines.append("# HELP supermemory_hedged_calls_total Hedged calls by operation and winning request")
+            lines.append("# TYPE supermemory_hedged_calls_total counter")
+            for (operation, winner), count in sorted(self._hedges.items()):
+                labels = _labels(("operation", "winner"), (operation, winner))
+                lines.append(f"supermemory_hedged_calls_total{labels} {count}")
+            
+            lines.append("# HELP supermemory_circuit_transitions_total Circuit breaker transitions by new state")
+            lines.append("# TYPE supermemory_circuit_transitions_total counter")
+            for state, count in sorted(self._circuit.items()):
+                lines.append(f"supermemory_circuit_transitions_total{_labels(('state',), (state,))} {count}")
+            
+            lines.append("# HELP supermemory_circuit_open Whether the circuit breaker is open")
+            lines.append("# TYPE supermemory_circuit_open gauge")
+            lines.append(f"supermemory_circuit_open {self._circuit_open}")
+        return "\n".join(lines) + "\n"
+    
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._calls.clear()
+            self._retries.clear()
+            self._durations.clear()
+            self._payloads.clear()
+            self._cache = {"hit": 0, "miss": 0}
+            self._indexing_lag.clear()
+            self._hedges.clear()
+            self._circuit.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    recorder: MetricsRecorder = None
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = self.recorder.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve_prometheus(
+    recorder: MetricsRecorder,
+    port: int = 9464,
+    host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """
+    Serve `recorder` at http://host:port/metrics from a daemon thread.
+    
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"recorder": recorder})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Emit one OpenTelemetry span per recorded call and indexing wait.
+    
+    Spans are created with their real start and end timestamps after the
+    call finishes, so they nest under whatever span was current at the
+    time. Cache lookups are added as events on the current span.
+    Requires `pip install opentelemetry-api` (plus an SDK and exporter to
+    actually ship spans).
+    """
+    
+    def __init__(self, tracer: Optional[Any] = None):
+        """
+        Args:
+            tracer: An opentelemetry Tracer (default: trace.get_tracer(__name__))
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires the opentelemetry-api package: "
+                "pip install opentelemetry-api"
+            ) from e
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer(__name__)
+    
+    def _span(self, name: str, started: float, duration: float, attributes: Dict[str, Any],
+              error: Optional[BaseException] = None) -> None:
+        start_ns = int(started * 1e9)
+        span = self.tracer.start_span(name, start_time=start_ns, attributes=attributes)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        span.end(end_time=start_ns + int(duration * 1e9))
+    
+    def record_call(
+        self,
+        operation: str,
+        started: float,
+        duration: float,
+        error: Optional[BaseException] = None,
+        attempts: int = 1,
+        payload_bytes: Optional[int] = None
+    ) -> None:
+        attributes = {"supermemory.attempts": attempts}
+        if payload_bytes is not None:
+            attributes["supermemory.payload_bytes"] = payload_bytes
+        self._span(f"supermemory {operation}", started, duration, attributes, error)
+    
+    def record_cache(self, hit: bool) -> None:
+        self._trace.get_current_span().add_event(
+            "supermemory.cache", {"supermemory.cache_hit": hit}
+        )
+    
+    def record_hedge(self, operation: str, winner: str) -> None:
+        self._trace.get_current_span().add_event(
+            "supermemory.hedge", {"supermemory.operation": operation, "supermemory.winner": winner}
+        )
+    
+    def record_circuit(self, state: str) -> None:
+        self._trace.get_current_span().add_event(
+            "supermemory.circuit", {"supermemory.circuit_state": state}
+        )
+    
+    def record_indexing_lag(self, seconds: float, status: Optional[str]) -> None:
+        self._span(
+            "supermemory wait_until_indexed",
+            time.time() - seconds,
+            seconds,
+            {"supermemory.status": status or "unknown"}
+        )
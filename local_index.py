@@ -0,0 +1,270 @@
+"""
+Local lexical index of memories for offline search.
+BM25 over content and metadata, no embeddings or network required.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class LocalChunk:
+    """A matching chunk of a local search result (mirrors the SDK's chunk shape)"""
+    
+    __slots__ = ("content", "score", "is_relevant")
+    
+    def __init__(self, content: str, score: float, is_relevant: bool = True):
+        self.content = content
+        self.score = score
+        self.is_relevant = is_relevant
+    
+    def __repr__(self) -> str:
+        return f"LocalChunk(score={self.score:.3f}, content={self.content[:40]!r})"
+
+
+class LocalResult:
+    """A search result served from the local index (mirrors the SDK's result shape)"""
+    
+    __slots__ = ("document_id", "score", "chunks", "metadata", "created_at", "title", "source")
+    
+    def __init__(
+        self,
+        document_id: str,
+        score: float,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        created_at: Optional[str] = None,
+        title: Optional[str] = None,
+        source: str = "local"
+    ):
+        self.document_id = document_id
+        self.score = score
+        self.chunks = [LocalChunk(content, score)]
+        self.metadata = metadata
+        self.created_at = created_at
+        self.title = title
+        self.source = source
+    
+    def __repr__(self) -> str:
+        return f"LocalResult(document_id={self.document_id!r}, score={self.score:.3f})"
+
+
+class LocalSearchResponse:
+    """Search response with a `.results` list, like the SDK's search response"""
+    
+    def __init__(self, results: List[Any], total: Optional[int] = None):
+        self.results = results
+        self.total = len(results) if total is None else total
+    
+    def __repr__(self) -> str:
+        return f"LocalSearchResponse(total={self.total}, results={self.results!r})"
+
+
+class LocalIndex:
+    """
+    Thread-safe in-memory BM25 inverted index over memory content and metadata.
+    
+    SupermemoryClient(local_index=LocalIndex()) indexes everything written
+    through add_memory() and can answer search_memories(..., mode="local")
+    without touching the network.
+    """
+    
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index.
+        
+        Args:
+            path: Optional JSON file the index is loaded from and saved to
+                  with save(), so it survives restarts
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalisation
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._docs = {}      # document_id -> stored record
+        self._postings = {}  # term -> {document_id: term frequency}
+        self._lengths = {}   # document_id -> token count
+        self._terms = {}     # document_id -> distinct terms, for removal
+        self._total_length = 0
+        self._lock = threading.RLock()
+        
+        if path and os.path.exists(path):
+            self.load(path)
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    def add(
+        self,
+        document_id: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        container_tags: Optional[Iterable[str]] = None,
+        user_id: Optional[str] = None,
+        created_at: Optional[str] = None
+    ) -> None:
+        """Index a memory, replacing any earlier version with the same id."""
+        text = content
+        if metadata:
+            text += " " + " ".join(str(value) for value in metadata.values())
+        terms = Counter(tokenize(text))
+        
+        with self._lock:
+            self._remove(document_id)
+            self._docs[document_id] = {
+                "content": content,
+                "metadata": metadata,
+                "container_tags": sorted(container_tags or ()),
+                "user_id": user_id,
+                "created_at": created_at
+            }
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[document_id] = tf
+            length = sum(terms.values())
+            self._terms[document_id] = list(terms)
+            self._lengths[document_id] = length
+            self._total_length += length
+    
+    def _remove(self, document_id: str) -> None:
+        if self._docs.pop(document_id, None) is None:
+            return
+        for term in self._terms.pop(document_id):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(document_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(document_id, 0)
+    
+    def remove(self, document_id: str) -> None:
+        """Remove a memory from the index (no-op if unknown)."""
+        with self._lock:
+            self._remove(document_id)
+    
+    def _in_scope(self, record, container_tags, user_id) -> bool:
+        if user_id is not None and record["user_id"] != user_id:
+            return False
+        if container_tags and not set(container_tags) & set(record["container_tags"]):
+            return False
+        return True
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        container_tags: Optional[Iterable[str]] = None,
+        user_id: Optional[str] = None
+    ) -> LocalSearchResponse:
+        """
+        Rank indexed memories against a query with BM25.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            container_tags: Only return memories sharing one of these tags
+            user_id: Only return memories written for this user
+        
+        Returns:
+            LocalSearchResponse whose results are LocalResult objects, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not terms:
+                return LocalSearchResponse([])
+            avg_length = self._total_length / n_docs
+            
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for document_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[document_id] / avg_length)
+                    scores[document_id] = scores.get(document_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for document_id, score in ranked:
+                record = self._docs[document_id]
+                if not self._in_scope(record, container_tags, user_id):
+                    continue
+                results.append(LocalResult(
+                    document_id,
+                    score,
+                    record["content"],
+                    metadata=record["metadata"],
+                    created_at=record["created_at"]
+                ))
+                if len(results) >= limit:
+                    break
+        return LocalSearchResponse(results)
+    
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the indexed memories to a JSON file (atomically)."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the local index")
+        with self._lock:
+            data = {document_id: record for document_id, record in self._docs.items()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    
+    def load(self, path: Optional[str] = None) -> None:
+        """Load memories from a JSON file written by save() and rebuild the index."""
+        path = path or self.path
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for document_id, record in data.items():
+            self.add(
+                document_id,
+                record["content"],
+                metadata=record.get("metadata"),
+                container_tags=record.get("container_tags"),
+                user_id=record.get("user_id"),
+                created_at=record.get("created_at")
+            )
+
+
+def merge_results(local_results: List[Any], remote_results: List[Any], limit: int) -> List[Any]:
+    """
+    Merge local BM25 hits with remote hits by score.
+    
+    BM25 scores are unbounded, so local scores are divided by the best local
+    score to put them on the same 0..1 scale as the API's similarity scores.
+    When both sides return the same document, the remote result is kept
+    with the higher of the two scores.
+    
+    Returns:
+        Up to `limit` results, best first
+    """
+    best_local = max((result.score for result in local_results), default=0.0) or 1.0
+    merged = {}
+    for result in local_results:
+        result.score = result.score / best_local
+        merged[result.document_id] = (result.score, result)
+    for result in remote_results:
+        score = getattr(result, "score", None) or 0.0
+        previous = merged.get(result.document_id)
+        if previous is not None:
+            score = max(score, previous[0])
+        merged[result.document_id] = (score, result)
+    ranked = sorted(merged.values(), key=lambda item: item[0], reverse=True)
+    return [result for _, result in ranked[:limit]]
@@ -0,0 +1,352 @@
+"""
+Bulk export and import of Supermemory memories.
+Streams all memories to compressed JSONL or Parquet, and uploads them back with a resumable checkpoint.
+
+Usage:
+    python memory_export.py export backup.jsonl.gz
+    python memory_export.py export backup.parquet --container-tags my-project
+    python memory_export.py import backup.jsonl.gz --checkpoint backup.ckpt
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from memory_fields import format_timestamp, get_field
+
+# Fields written per memory, in column order
+COLUMNS = (
+    "id", "custom_id", "content", "title", "summary", "metadata",
+    "container_tags", "status", "created_at", "updated_at",
+)
+
+# Columns stored as JSON text in Parquet (their values vary in shape)
+_JSON_COLUMNS = ("metadata", "container_tags")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export requires pyarrow: pip install pyarrow "
+            "(or use a .jsonl.gz file)"
+        ) from e
+    return pyarrow
+
+
+def to_record(item: Any) -> Dict[str, Any]:
+    """Convert a listed or fetched memory to a plain export record."""
+    return {
+        "id": get_field(item, "id"),
+        "custom_id": get_field(item, "custom_id", "customId"),
+        "content": get_field(item, "content"),
+        "title": get_field(item, "title"),
+        "summary": get_field(item, "summary"),
+        "metadata": dict(get_field(item, "metadata") or {}),
+        "container_tags": list(get_field(item, "container_tags", "containerTags") or []),
+        "status": get_field(item, "status"),
+        "created_at": format_timestamp(get_field(item, "created_at", "createdAt")),
+        "updated_at": format_timestamp(get_field(item, "updated_at", "updatedAt")),
+    }
+
+
+def _is_parquet(path: str) -> bool:
+    return path.endswith(".parquet")
+
+
+def _open_text(path: str, mode: str, compressed: Optional[bool] = None):
+    if path.endswith(".gz") if compressed is None else compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+class _JsonlWriter:
+    def __init__(self, path: str, compressed: bool):
+        self._file = _open_text(path, "w", compressed)
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Writes each page as one row group, so memory use stays at one page."""
+    
+    def __init__(self, path: str):
+        pa = _pyarrow()
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+        self._writer = pa.parquet.ParquetWriter(path, self._schema, compression="zstd")
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        columns = {
+            column: [
+                json.dumps(record[column], ensure_ascii=False) if column in _JSON_COLUMNS
+                else record[column]
+                for record in records
+            ]
+            for column in COLUMNS
+        }
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+    
+    def close(self) -> None:
+        self._writer.close()
+
+
+def read_export(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the records of an export file (.jsonl, .jsonl.gz or .parquet)."""
+    if _is_parquet(path):
+        pq = _pyarrow().parquet
+        for batch in pq.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                for column in _JSON_COLUMNS:
+                    row[column] = json.loads(row[column]) if row.get(column) else None
+                yield row
+        return
+    with _open_text(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def export_memories(
+    client: Any,
+    path: str,
+    page_size: int = 100,
+    max_workers: int = 4,
+    fetch_content: bool = True,
+    list_kwargs: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Write every memory to `path` (.parquet, or JSONL, gzip-compressed if it
+    ends in .gz).
+    
+    Pages are listed with their content, so each page is one request. The
+    first page reports the page count. The remaining pages are fetched
+    in parallel, oldest first, and written in order as they arrive, with at
+    most 2 * max_workers pages held in memory. Listing oldest first means
+    memories added during the export land after the pages being fetched.
+    
+    Args:
+        client: SupermemoryClient
+        path: Output file
+        page_size: Memories per list request
+        max_workers: Pages fetched concurrently
+        fetch_content: Include each memory's content in the list requests
+        list_kwargs: Extra list_memories() arguments (e.g. container_tags)
+        progress: Called with (pages_done, total_pages) after each page
+    
+    Returns:
+        dict with 'pages', 'memories' and 'path'
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    list_kwargs = dict(list_kwargs or {})
+    list_kwargs.setdefault("include_content", fetch_content)
+    
+    def fetch_page(page):
+        response = client.list_memories(
+            limit=page_size, page=page, sort="createdAt", order="asc", **list_kwargs
+        )
+        return response, [to_record(item) for item in get_field(response, "memories") or []]
+    
+    tmp_path = path + ".tmp"
+    writer = _ParquetWriter(tmp_path) if _is_parquet(path) else _JsonlWriter(tmp_path, path.endswith(".gz"))
+    stats = {"pages": 0, "memories": 0, "path": path}
+    try:
+        first, records = fetch_page(1)
+        pagination = get_field(first, "pagination")
+        total_pages = int((get_field(pagination, "total_pages", "totalPages") if pagination else None) or 1)
+        writer.write(records)
+        stats["pages"] = 1
+        stats["memories"] = len(records)
+        if progress:
+            progress(1, total_pages)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            pages = iter(range(2, total_pages + 1))
+            while True:
+                for page in pages:
+                    pending.append(executor.submit(fetch_page, page))
+                    if len(pending) >= 2 * max_workers:
+                        break
+                if not pending:
+                    break
+                _, records = pending.popleft().result()
+                writer.write(records)
+                stats["pages"] += 1
+                stats["memories"] += len(records)
+                if progress:
+                    progress(stats["pages"], total_pages)
+    except BaseException:
+        writer.close()
+        os.remove(tmp_path)
+        raise
+    writer.close()
+    os.replace(tmp_path, path)
+    return stats
+
+
+class ImportCheckpoint:
+    """
+    Append-only log of the record numbers already uploaded.
+    
+    Each finished record is appended and flushed, so an interrupted import
+    loses at most the uploads that were in flight.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.done = {int(line) for line in f if line.strip()}
+        self._file = open(path, "a", encoding="utf-8")
+    
+    def mark(self, index: int) -> None:
+        self.done.add(index)
+        self._file.write(f"{index}\n")
+        self._file.flush()
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+def import_memories(
+    client: Any,
+    path: str,
+    checkpoint: Optional[str] = None,
+    max_workers: int = 8,
+    container_tags: Optional[List[str]] = None,
+    keep_ids: bool = True,
+    progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Upload the memories of an export file through add_memories_bulk.
+    
+    Args:
+        client: SupermemoryClient to upload to
+        path: Export file written by export_memories()
+        checkpoint: Checkpoint file (default: <path>.checkpoint). Records it
+                    lists are skipped, so a rerun resumes where the last
+                    one stopped.
+        max_workers: Concurrent uploads
+        container_tags: Override the container tags of every memory
+        keep_ids: Use each memory's custom ID (or its old ID) as custom_id.
+                  A record uploaded twice then updates the same memory
+                  instead of creating a duplicate.
+        progress: Called with the number of records uploaded so far
+    
+    Returns:
+        dict with 'uploaded', 'skipped' (already in the checkpoint),
+        'empty' (records without content, e.g. from an export written with
+        fetch_content=False, which cannot be uploaded), 'failed' and
+        'errors' (record number -> exception)
+    """
+    state = ImportCheckpoint(checkpoint or path + ".checkpoint")
+    stats = {"uploaded": 0, "skipped": 0, "empty": 0, "failed": 0, "errors": {}}
+    numbers = []
+    
+    def items():
+        for number, record in enumerate(read_export(path)):
+            if number in state.done:
+                stats["skipped"] += 1
+                continue
+            if not record.get("content"):
+                stats["empty"] += 1
+                continue
+            params = {
+                "content": record["content"],
+                "metadata": record.get("metadata") or None,
+                "container_tags": container_tags or record.get("container_tags") or None,
+            }
+            if keep_ids:
+                params["custom_id"] = record.get("custom_id") or record.get("id")
+            numbers.append(number)
+            yield params
+    
+    try:
+        for outcome in client.iter_add_memories_bulk(items(), max_workers=max_workers, ordered=False):
+            number = numbers[outcome["index"]]
+            if outcome["error"] is not None:
+                stats["failed"] += 1
+                stats["errors"][number] = outcome["error"]
+                continue
+            state.mark(number)
+            stats["uploaded"] += 1
+            if progress:
+                progress(stats["uploaded"])
+    finally:
+        state.close()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export or import Supermemory memories")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    export_parser = commands.add_parser("export", help="write all memories to a file")
+    export_parser.add_argument("path", help="output file (.jsonl, .jsonl.gz or .parquet)")
+    export_parser.add_argument("--page-size", type=int, default=100)
+    export_parser.add_argument("--workers", type=int, default=4, help="concurrent page fetches")
+    export_parser.add_argument("--container-tags", nargs="+", help="only export these container tags")
+    export_parser.add_argument("--no-content", action="store_true",
+                               help="list memories without their content")
+    
+    import_parser = commands.add_parser("import", help="upload memories from an export file")
+    import_parser.add_argument("path", help="export file")
+    import_parser.add_argument("--checkpoint", help="checkpoint file (default: <path>.checkpoint)")
+    import_parser.add_argument("--workers", type=int, default=8, help="concurrent uploads")
+    import_parser.add_argument("--container-tags", nargs="+", help="override container tags")
+    import_parser.add_argument("--new-ids", action="store_true",
+                               help="do not reuse the exported IDs as custom IDs")
+    args = parser.parse_args(argv)
+    
+    from supermemory_client import SupermemoryClient
+    
+    client = SupermemoryClient()
+    if args.command == "export":
+        stats = export_memories(
+            client,
+            args.path,
+            page_size=args.page_size,
+            max_workers=args.workers,
+            fetch_content=not args.no_content,
+            list_kwargs={"container_tags": args.container_tags} if args.container_tags else None,
+            progress=lambda done, total: print(f"\r   page {done}/{total}", end="", flush=True)
+        )
+        print(f"\n✅ Exported {stats['memories']} memories to {stats['path']}")
+        return 0
+    
+    stats = import_memories(
+        client,
+        args.path,
+        checkpoint=args.checkpoint,
+        max_workers=args.workers,
+        container_tags=args.container_tags,
+        keep_ids=not args.new_ids,
+        progress=lambda done: print(f"\r   uploaded {done}", end="", flush=True)
+    )
+    print(f"\n✅ Imported {stats['uploaded']} memories ({stats['skipped']} already imported)")
+    if stats["empty"]:
+        print(f"⚠️  {stats['empty']} records have no content and were not uploaded "
+              f"(was the file exported with --no-content?)")
+    if stats["failed"]:
+        print(f"⚠️  {stats['failed']} failed; rerun the same command to retry them")
+    return 1 if stats["failed"] or stats["empty"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
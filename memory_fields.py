@@ -0,0 +1,29 @@
+"""
+Field access for Supermemory SDK models and decoded JSON.
+Shared by the modules that read listed, fetched or searched memories.
+"""
+
+from typing import Any, Optional
+
+
+def get_field(item: Any, name: str, camel: Optional[str] = None) -> Any:
+    """
+    Read a field from an SDK model or a decoded JSON dict.
+    
+    Args:
+        item: SDK model, dict, or None
+        name: Attribute name (snake_case, as on SDK models)
+        camel: Key used in raw JSON (e.g. "createdAt"), tried if `name` is missing
+    """
+    if isinstance(item, dict):
+        value = item.get(name)
+        return item.get(camel) if value is None and camel else value
+    value = getattr(item, name, None)
+    return getattr(item, camel, None) if value is None and camel else value
+
+
+def format_timestamp(value: Any) -> Optional[str]:
+    """Normalise a datetime or ISO string to an ISO string (comparable as text)."""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
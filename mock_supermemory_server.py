@@ -0,0 +1,330 @@
+"""
+Local stand-in for the Supermemory.ai HTTP API
+Used by benchmark.py to measure the client without touching the live service.
+"""
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+_NUMERIC = {
+    "=": lambda a, b: a == b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+
+
+def _matches(metadata: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    """Evaluate an API `filters` condition ({"AND": [...]}, {"OR": [...]} or a leaf) on metadata."""
+    if "AND" in condition:
+        return all(_matches(metadata, item) for item in condition["AND"])
+    if "OR" in condition:
+        return any(_matches(metadata, item) for item in condition["OR"])
+    actual = metadata.get(condition.get("key"))
+    if condition.get("filterType") == "numeric":
+        try:
+            matched = _NUMERIC[condition.get("numericOperator", "=")](
+                float(actual), float(condition.get("value"))
+            )
+        except (KeyError, TypeError, ValueError):
+            matched = False
+    else:
+        matched = actual is not None and str(actual) == str(condition.get("value"))
+    return matched != bool(condition.get("negate"))
+
+
+def _selected(memory: Dict[str, Any], body: Dict[str, Any]) -> bool:
+    """Apply a list or search request's containerTags and filters to a memory."""
+    tags = body.get("containerTags")
+    if tags and not set(tags) <= set(memory["containerTags"]):
+        return False
+    filters = body.get("filters")
+    return not filters or _matches(memory["metadata"], filters)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes the subset of the API used by this project to the mock server."""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # waits on Nagle + delayed ACK (~40 ms) and skews the benchmark latencies
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+    
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+    
+    def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+    
+    def _dispatch(self, method: str) -> None:
+        mock = self.server.mock
+        body = self._read_json() if method == "POST" else {}
+        path = self.path.split("?", 1)[0].rstrip("/")
+        
+        failure = mock.simulate()
+        if failure is not None:
+            status, headers = failure
+            self._send(status, {"error": "simulated failure"}, headers)
+            return
+        
+        parts = path.split("/")
+        if len(parts) >= 3 and parts[1] == "v3" and parts[2] in ("memories", "documents"):
+            if len(parts) == 3 and method == "POST":
+                self._send(200, mock.add(body))
+                return
+            if len(parts) == 4 and parts[3] == "list" and method == "POST":
+                self._send(200, mock.list(body))
+                return
+            if len(parts) == 4 and method == "GET":
+                memory = mock.get(parts[3])
+                if memory is None:
+                    self._send(404, {"error": "not found"})
+                else:
+                    self._send(200, memory)
+                return
+            if len(parts) == 4 and method == "DELETE":
+                if mock.delete(parts[3]):
+                    self._send(200, {})
+                else:
+                    self._send(404, {"error": "not found"})
+                return
+        if path == "/v3/search" and method == "POST":
+            self._send(200, mock.search(body))
+            return
+        self._send(404, {"error": f"no route for {method} {path}"})
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockSupermemoryServer"
+
+
+class MockSupermemoryServer:
+    """
+    In-process HTTP server mimicking memories.add, memories.get,
+    memories.list, memories.delete and search.execute. Adding with a
+    known custom ID replaces that memory, as the API does. Lists and
+    searches honour `containerTags` (a memory must carry every tag) and
+    metadata `filters`; lists omit content unless `includeContent` is set.
+    
+    Every request waits `latency` ± `jitter` seconds. A fraction
+    `error_rate` of requests fail, half with HTTP 500 and half with HTTP 429
+    plus a Retry-After header. Added memories report status "queued" until
+    `indexing_delay` seconds have passed, then "done".
+    
+    Usage:
+        with MockSupermemoryServer(latency=0.02) as server:
+            client = SupermemoryClient(api_key="test", base_url=server.url)
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.02,
+        jitter: float = 0.005,
+        error_rate: float = 0.0,
+        indexing_delay: float = 0.2,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.indexing_delay = indexing_delay
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._memories = {}
+        self._lock = threading.Lock()
+        self._server = _HTTPServer((host, port), _Handler)
+        self._server.mock = self
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+    
+    def start(self) -> "MockSupermemoryServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "MockSupermemoryServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def simulate(self):
+        """Apply latency and maybe fail; return (status, headers) for a failure."""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+        time.sleep(delay)
+        if roll < self.error_rate / 2:
+            return 500, {}
+        if roll < self.error_rate:
+            return 429, {"retry-after-ms": "50"}
+        return None
+    
+    def _find(self, memory_id: str) -> Optional[str]:
+        """Resolve an ID or custom ID to the stored memory's ID (lock held)."""
+        if memory_id in self._memories:
+            return memory_id
+        for memory in self._memories.values():
+            if memory["customId"] == memory_id:
+                return memory["id"]
+        return None
+    
+    def add(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now_iso()
+        custom_id = body.get("customId") or body.get("custom_id")
+        with self._lock:
+            memory_id = self._find(custom_id) if custom_id else None
+            created = self._memories[memory_id]["createdAt"] if memory_id else now
+            memory_id = memory_id or f"mem_{next(self._ids)}"
+            self._memories[memory_id] = {
+                "id": memory_id,
+                "content": body.get("content", ""),
+                "metadata": body.get("metadata") or {},
+                "customId": custom_id,
+                "containerTags": body.get("containerTags") or [],
+                "createdAt": created,
+                "updatedAt": now,
+                "_added": time.monotonic(),
+            }
+        return {"id": memory_id, "status": "queued"}
+    
+    def delete(self, memory_id: str) -> bool:
+        with self._lock:
+            memory_id = self._find(memory_id)
+            if memory_id is None:
+                return False
+            del self._memories[memory_id]
+        return True
+    
+    def _public(self, memory: Dict[str, Any]) -> Dict[str, Any]:
+        status = "done" if time.monotonic() - memory["_added"] >= self.indexing_delay else "queued"
+        data = {key: value for key, value in memory.items() if not key.startswith("_")}
+        data.update(status=status, title=None, summary=None)
+        return data
+    
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            memory = self._memories.get(memory_id)
+        return self._public(memory) if memory else None
+    
+    def list(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        limit = int(body.get("limit") or 10)
+        page = int(body.get("page") or 1)
+        with self._lock:
+            memories = [memory for memory in self._memories.values() if _selected(memory, body)]
+        memories.sort(key=lambda memory: memory[body.get("sort") or "createdAt"])
+        if body.get("order") != "asc":
+            memories.reverse()
+        window = [self._public(memory) for memory in memories[(page - 1) * limit:page * limit]]
+        if not body.get("includeContent"):
+            for memory in window:
+                memory.pop("content")
+        return {
+            "memories": window,
+            "pagination": {
+                "currentPage": page,
+                "limit": limit,
+                "totalItems": len(memories),
+                "totalPages": max(1, -(-len(memories) // limit)),
+            },
+        }
+    
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        terms = set(_TOKEN_RE.findall((body.get("q") or "").lower()))
+        limit = int(body.get("limit") or 10)
+        with self._lock:
+            memories = [memory for memory in self._memories.values()
+                        if time.monotonic() - memory["_added"] >= self.indexing_delay
+                        and _selected(memory, body)]
+        scored = []
+        for memory in memories:
+            words = set(_TOKEN_RE.findall(memory["content"].lower()))
+            overlap = len(terms & words)
+            if overlap:
+                scored.append((overlap / len(terms), memory))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        results = [
+            {
+                "documentId": memory["id"],
+                "score": score,
+                "title": None,
+                "type": "text",
+                "metadata": memory["metadata"],
+                "createdAt": memory["createdAt"],
+                "updatedAt": memory["updatedAt"],
+                "chunks": [{"content": memory["content"], "score": score, "isRelevant": True}],
+            }
+            for score, memory in scored[:limit]
+        ]
+        return {
+            "results": results,
+            "total": len(results),
+            "timing": int((time.perf_counter() - started) * 1000),
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run a local mock Supermemory API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    
+    server = MockSupermemoryServer(port=args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"Mock Supermemory API listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
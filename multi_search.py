@@ -0,0 +1,70 @@
+"""
+Multi-query search helpers for SupermemoryClient.
+Reciprocal-rank fusion of several result lists into one ranking.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+# Standard RRF smoothing constant (Cormack et al.)
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[Any]],
+    k: int = DEFAULT_RRF_K,
+    limit: Optional[int] = None
+) -> List[Any]:
+    """
+    Fuse ranked result lists, deduplicating by document_id.
+    
+    Each document scores sum(1 / (k + rank)) over the lists it appears in
+    (rank starting at 1). Documents found by several queries rise to the
+    top, and no single query's raw scores dominate.
+    
+    Args:
+        result_lists: One ranked list of results per query
+        k: RRF constant; larger values flatten the rank weighting
+        limit: Maximum number of fused results
+    
+    Returns:
+        List of (result, fused_score) tuples, best first. For duplicates
+        the result object from the earliest list is kept.
+    """
+    scores = {}
+    first_seen = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, 1):
+            document_id = getattr(result, "document_id", None) or id(result)
+            scores[document_id] = scores.get(document_id, 0.0) + 1.0 / (k + rank)
+            first_seen.setdefault(document_id, result)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [(first_seen[document_id], score) for document_id, score in ranked]
+
+
+class MultiSearchResponse:
+    """Result of SupermemoryClient.search_memories_many()"""
+    
+    def __init__(
+        self,
+        fused: List[Any],
+        responses: Dict[str, Any],
+        errors: Dict[str, Exception]
+    ):
+        """
+        Args:
+            fused: (result, fused_score) tuples from reciprocal_rank_fusion()
+            responses: Raw search response per unique query
+            errors: Exception per query that failed
+        """
+        self.results = [result for result, _ in fused]
+        self.scores = [score for _, score in fused]
+        self.responses = responses
+        self.errors = errors
+    
+    def __repr__(self) -> str:
+        return (
+            f"MultiSearchResponse(results={len(self.results)}, "
+            f"queries={len(self.responses)}, errors={len(self.errors)})"
+        )
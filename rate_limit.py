@@ -0,0 +1,271 @@
+"""
+Rate-limit-aware request scheduling for Supermemory.ai
+Client-side token bucket, Retry-After handling and prioritised admission.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Lower value = admitted first when several callers wait for a token
+PRIORITIES = {"search": 0, "read": 0, "write": 1}
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Retries retry_call() makes by default, matching the SDK's own default
+DEFAULT_MAX_RETRIES = 2
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Extract the server's retry hint from an API error, if any.
+    
+    Understands `retry-after-ms`, and `retry-after` given either as seconds
+    or as an HTTP date.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for rate limiting, transient server errors and connection failures."""
+    if getattr(error, "status_code", None) in RETRYABLE_STATUSES:
+        return True
+    try:
+        from supermemory import APIConnectionError
+    except ImportError:
+        return False
+    return isinstance(error, APIConnectionError)
+
+
+def retry_call(
+    fn: Callable[[], Any],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_backoff: float = 0.5,
+    max_backoff: float = 8.0
+) -> Any:
+    """
+    Run `fn`, retrying rate-limited and transient failures.
+    
+    Waits for the server's Retry-After hint, or a full-jitter exponential
+    backoff, between attempts, as the SDK does. Used instead of the SDK's
+    retries when every attempt has to be seen by the caller.
+    
+    Raises:
+        The last error once retries are exhausted, or any non-retryable
+        error immediately
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            attempt += 1
+            hint = retry_after_seconds(e)
+            if hint is None:
+                hint = random.uniform(0, min(max_backoff, base_backoff * 2 ** attempt))
+            time.sleep(min(hint, max_backoff))
+
+
+class RateLimitScheduler:
+    """
+    Token bucket in front of the API, shared by every caller using one key.
+    
+    Each request takes one token. Tokens refill at `rate` per second up to
+    `burst`. When several callers are waiting, searches and reads are
+    admitted before writes, so background ingestion cannot delay
+    interactive lookups.
+    
+    A 429 response pauses the whole bucket for the server's Retry-After
+    time (or a jittered exponential backoff if there is none), so the other
+    threads back off too instead of all failing at once. Rate-limited and
+    transient failures are retried up to `max_retries` times.
+    """
+    
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 60.0
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket capacity, i.e. how many requests may go out at once
+                   after an idle period (defaults to `rate`)
+            max_retries: Retries per request for retryable errors
+            base_backoff: First backoff delay in seconds
+            max_backoff: Upper bound for any single backoff or Retry-After wait
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(burst if burst is not None else rate, 1.0)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, kind: str = "write") -> float:
+        """
+        Block until a token is available for a request of the given kind.
+        
+        Args:
+            kind: "search", "read" or "write"
+        
+        Returns:
+            Seconds spent waiting
+        """
+        entry = (PRIORITIES[kind], next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiters[0] == entry
+                    if is_head and now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        self.requests += 1
+                        self.wait_time += now - started
+                        heapq.heappop(self._waiters)
+                        self._cond.notify_all()
+                        break
+                    if now < self._paused_until:
+                        timeout = self._paused_until - now
+                    elif is_head:
+                        timeout = (1 - self._tokens) / self.rate
+                    else:
+                        timeout = None  # woken when the head changes
+                    self._cond.wait(timeout)
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+        
+        return time.monotonic() - started
+    
+    def pause(self, seconds: float) -> None:
+        """Stop admitting requests for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._cond.notify_all()
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+    
+    def call(self, fn: Callable[[], Any], kind: str = "write") -> Any:
+        """
+        Run `fn` once a token is available, retrying rate-limited and
+        transient failures.
+        
+        Args:
+            fn: Zero-argument callable performing one API request
+            kind: "search", "read" or "write"
+        
+        Returns:
+            Whatever `fn` returns
+        
+        Raises:
+            The last error once retries are exhausted, or any
+            non-retryable error immediately
+        """
+        attempt = 0
+        while True:
+            self.acquire(kind)
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                attempt += 1
+                throttled = getattr(e, "status_code", None) == 429
+                with self._cond:
+                    self.retries += 1
+                    if throttled:
+                        self.throttled += 1
+                
+                hint = retry_after_seconds(e)
+                if throttled:
+                    delay = hint if hint is not None else self._backoff(attempt)
+                    # A little jitter so paused callers do not resume in lockstep
+                    self.pause(min(delay, self.max_backoff) + random.uniform(0, self.base_backoff))
+                else:
+                    time.sleep(min(hint if hint is not None else self._backoff(attempt), self.max_backoff))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request, retry and throttling counters."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "wait_time": self.wait_time
+        }
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api_key: str, **kwargs) -> RateLimitScheduler:
+    """
+    Return the process-wide scheduler for an API key, creating it on first
+    use with `kwargs`. All clients using the same key share its bucket.
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(api_key)
+        if scheduler is None:
+            scheduler = RateLimitScheduler(**kwargs)
+            _schedulers[api_key] = scheduler
+        return scheduler
@@ -0,0 +1,338 @@
+"""
+Offline-first local replica of a project's Supermemory memories.
+Incremental created-at sync into SQLite, with local reads and full-text search.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from local_index import LocalResult, LocalSearchResponse, tokenize
+from memory_fields import format_timestamp, get_field
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id TEXT PRIMARY KEY,
+    content TEXT,
+    title TEXT,
+    metadata TEXT NOT NULL,
+    container_tags TEXT NOT NULL,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS memories_created_at ON memories (created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(content, title);
+"""
+
+
+class MemoryReplica:
+    """
+    Local SQLite mirror of the memories of one project.
+    
+    Only memories whose metadata["project"] equals `project` are kept, as
+    written by DualMemoryHelper. The project is pushed down as a metadata
+    filter on the list request, and content is included in the listing,
+    so no per-memory fetches are needed. sync() pulls pages newest first
+    and stops at the created-at watermark of the previous sync. An
+    incremental sync therefore costs one or two list requests when little
+    has changed.
+    Memories edited after they were mirrored are only picked up by
+    sync(full=True).
+    
+    Reads (get, recent, search) are served from the local database. If the
+    last successful sync is older than `max_staleness` seconds, a read
+    first syncs. A failed sync (e.g. offline) is recorded in `last_error`,
+    and the read still returns the local data. Only one thread syncs at a
+    time; the others keep reading the local data meanwhile.
+    
+    Usage:
+        replica = MemoryReplica(client, "my-project", max_staleness=300)
+        replica.sync()
+        replica.search("deployment decision", limit=5)
+    """
+    
+    def __init__(
+        self,
+        client: Any,
+        project: str,
+        path: Optional[str] = None,
+        max_staleness: Optional[float] = 300.0,
+        page_size: int = 100,
+        list_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            client: SupermemoryClient to sync from
+            project: Project name to mirror (metadata["project"])
+            path: SQLite file (default: .supermemory/replica-<project>.sqlite3)
+            max_staleness: Seconds after which a read syncs first (None never
+                           syncs automatically)
+            page_size: Memories per list request
+            list_kwargs: Extra arguments for client.list_memories()
+                         (e.g. {"container_tags": [...]}). A `filters`
+                         entry is combined with the project filter.
+        """
+        self.client = client
+        self.project = project
+        self.path = path or os.path.join(".supermemory", f"replica-{project}.sqlite3")
+        self.max_staleness = max_staleness
+        self.page_size = page_size
+        self.list_kwargs = dict(list_kwargs or {})
+        self.last_error = None
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False  # SQLite built without FTS5: fall back to LIKE
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, conn: sqlite3.Connection, name: str, value: Any) -> None:
+        conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (name, None if value is None else str(value))
+        )
+    
+    @property
+    def watermark(self) -> Optional[str]:
+        """created_at of the newest memory seen by the last sync"""
+        return self._meta("watermark")
+    
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful sync, or None if never synced."""
+        synced_at = self._meta("synced_at")
+        return time.time() - float(synced_at) if synced_at else None
+    
+    def _store(self, conn: sqlite3.Connection, item: Any, metadata: Dict[str, Any]) -> None:
+        memory_id = get_field(item, "id")
+        content = get_field(item, "content") or get_field(item, "summary") or ""
+        title = get_field(item, "title")
+        if self.has_fts:
+            # FTS rows share the rowid of their memories row
+            row = conn.execute("SELECT rowid FROM memories WHERE id = ?", (memory_id,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM memories_fts WHERE rowid = ?", (row[0],))
+        cursor = conn.execute(
+            "INSERT OR REPLACE INTO memories "
+            "(id, content, title, metadata, container_tags, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                memory_id,
+                content,
+                title,
+                json.dumps(metadata, default=str),
+                json.dumps(list(get_field(item, "container_tags", "containerTags") or [])),
+                get_field(item, "status"),
+                format_timestamp(get_field(item, "created_at", "createdAt")),
+                format_timestamp(get_field(item, "updated_at", "updatedAt")),
+            )
+        )
+        if self.has_fts:
+            conn.execute(
+                "INSERT INTO memories_fts (rowid, content, title) VALUES (?, ?, ?)",
+                (cursor.lastrowid, content, title or "")
+            )
+    
+    def sync(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Pull memories created since the watermark (or all, if `full`).
+        
+        Returns:
+            dict with 'pages', 'fetched' (memories listed), 'stored' (of this
+            project) and 'watermark'
+        """
+        project_filter = {"key": "project", "value": self.project, "negate": False}
+        list_kwargs = dict(self.list_kwargs, include_content=True)
+        extra_filters = list_kwargs.pop("filters", None)
+        list_kwargs["filters"] = {
+            "AND": [project_filter, extra_filters] if extra_filters else [project_filter]
+        }
+        
+        with self._sync_lock:
+            watermark = None if full else self.watermark
+            newest = watermark
+            stats = {"pages": 0, "fetched": 0, "stored": 0}
+            conn = self._connection()
+            page = 1
+            while True:
+                response = self.client.list_memories(
+                    limit=self.page_size, page=page, sort="createdAt", order="desc",
+                    **list_kwargs
+                )
+                stats["pages"] += 1
+                items = list(get_field(response, "memories") or [])
+                reached = False
+                
+                conn.execute("BEGIN")
+                try:
+                    for item in items:
+                        created_at = format_timestamp(get_field(item, "created_at", "createdAt"))
+                        # Strictly older than the watermark: already mirrored. Equal
+                        # timestamps are re-stored, which is harmless (upsert).
+                        if watermark and created_at and created_at < watermark:
+                            reached = True
+                            break
+                        stats["fetched"] += 1
+                        if created_at and (newest is None or created_at > newest):
+                            newest = created_at
+                        metadata = dict(get_field(item, "metadata") or {})
+                        if metadata.get("project") != self.project:
+                            continue
+                        self._store(conn, item, metadata)
+                        stats["stored"] += 1
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                
+                pagination = get_field(response, "pagination")
+                total_pages = get_field(pagination, "total_pages", "totalPages") if pagination else None
+                if reached or len(items) < self.page_size or (total_pages and page >= int(total_pages)):
+                    break
+                page += 1
+            
+            conn.execute("BEGIN")
+            self._set_meta(conn, "watermark", newest)
+            self._set_meta(conn, "synced_at", time.time())
+            conn.execute("COMMIT")
+            self.last_error = None
+            stats["watermark"] = newest
+            return stats
+    
+    def ensure_fresh(self) -> bool:
+        """
+        Sync if the replica is older than `max_staleness`.
+        
+        Returns:
+            True if the local data is within the freshness bound afterwards
+        """
+        if self.max_staleness is None:
+            return True
+        age = self.age()
+        if age is not None and age <= self.max_staleness:
+            return True
+        if self._sync_lock.locked():
+            return False  # another thread is syncing; serve what we have
+        try:
+            self.sync()
+            return True
+        except Exception as e:
+            self.last_error = e
+            return False
+    
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "content": row[1],
+            "title": row[2],
+            "metadata": json.loads(row[3]),
+            "container_tags": json.loads(row[4]),
+            "status": row[5],
+            "created_at": row[6],
+            "updated_at": row[7],
+        }
+    
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Return a mirrored memory as a dict, or None."""
+        self.ensure_fresh()
+        row = self._connection().execute(
+            "SELECT id, content, title, metadata, container_tags, status, created_at, updated_at "
+            "FROM memories WHERE id = ?", (memory_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+    
+    def recent(self, limit: int = 10, memory_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return the newest mirrored memories.
+        
+        Args:
+            limit: Maximum number of memories
+            memory_type: Only memories with this metadata["type"]
+                         (e.g. "session_end" or "decision")
+        """
+        self.ensure_fresh()
+        sql = ("SELECT id, content, title, metadata, container_tags, status, created_at, updated_at "
+               "FROM memories")
+        args = []
+        if memory_type is not None:
+            sql += " WHERE json_extract(metadata, '$.type') = ?"
+            args.append(memory_type)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        return [self._row_to_dict(row) for row in self._connection().execute(sql, args)]
+    
+    def search(self, query: str, limit: int = 10) -> LocalSearchResponse:
+        """
+        Full-text search over the mirrored memories.
+        
+        Uses SQLite FTS5 with BM25 ranking when available, otherwise a
+        substring match ranked by the number of matching terms.
+        
+        Returns:
+            LocalSearchResponse of LocalResult objects (source "replica")
+        """
+        self.ensure_fresh()
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return LocalSearchResponse([])
+        conn = self._connection()
+        
+        if self.has_fts:
+            match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+            rows = conn.execute(
+                "SELECT m.id, m.content, m.title, m.metadata, m.created_at, -bm25(memories_fts) "
+                "FROM memories_fts JOIN memories m ON m.rowid = memories_fts.rowid "
+                "WHERE memories_fts MATCH ? ORDER BY bm25(memories_fts) LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        else:
+            score = " + ".join("(instr(lower(content), ?) > 0)" for _ in terms)
+            rows = conn.execute(
+                f"SELECT id, content, title, metadata, created_at, {score} AS score "
+                "FROM memories WHERE score > 0 ORDER BY score DESC, created_at DESC LIMIT ?",
+                terms + [limit]
+            ).fetchall()
+        
+        return LocalSearchResponse([
+            LocalResult(
+                row[0], float(row[5]), row[1] or "",
+                metadata=json.loads(row[3]),
+                created_at=row[4],
+                title=row[2],
+                source="replica"
+            )
+            for row in rows
+        ])
+    
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM memories").fetchone()[0]
@@ -0,0 +1,330 @@
+"""
+Tail-latency and failure controls for SupermemoryClient.
+Per-operation deadlines, hedged requests and a circuit breaker.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from rate_limit import is_retryable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open"""
+    
+    outcome = "rejected"  # metrics outcome label
+    
+    def __init__(self, operation: str, retry_after: float):
+        super().__init__(
+            f"Circuit open: {operation} not attempted; retry in {retry_after:.2f}s"
+        )
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an operation does not finish within its deadline"""
+    
+    outcome = "deadline"  # metrics outcome label
+    
+    def __init__(self, operation: str, deadline: float):
+        super().__init__(f"{operation} did not finish within {deadline:.3f}s")
+        self.operation = operation
+        self.deadline = deadline
+
+
+def counts_as_failure(error: BaseException) -> bool:
+    """
+    Return True for errors that indicate an unhealthy service: deadlines,
+    timeouts, rate limiting, 5xx and connection failures. Client errors
+    such as a bad request do not trip the breaker.
+    """
+    return isinstance(error, TimeoutError) or is_retryable(error) or (
+        type(error).__name__ == "APITimeoutError"
+    )
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the API is erroring.
+    
+    Outcomes of the last `window` seconds are kept. Once at least
+    `min_calls` were made and the share of failures reaches
+    `failure_rate`, the circuit opens and calls are rejected with
+    CircuitOpenError for `cooldown` seconds. Then a single probe call is let
+    through (half-open). If it succeeds the circuit closes, otherwise it
+    opens for another cooldown.
+    """
+    
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 20,
+        window: float = 30.0,
+        cooldown: float = 10.0,
+        on_state_change: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            failure_rate: Share of failed calls (0 to 1) that opens the circuit
+            min_calls: Calls in the window before the rate is considered
+            window: Seconds of history the failure rate is computed over
+            cooldown: Seconds the circuit stays open before a probe
+            on_state_change: Called with the new state on every transition
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self.on_state_change = on_state_change
+        self._state = CLOSED
+        self._outcomes = deque()  # (monotonic time, failed)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+    
+    def _transition(self, state: str) -> None:
+        self._state = state
+        if self.on_state_change is not None:
+            self.on_state_change(state)
+    
+    def try_acquire(self) -> float:
+        """Return 0 if a call may proceed, or the seconds until the next probe."""
+        with self._lock:
+            if self._state == CLOSED:
+                return 0.0
+            remaining = self._opened_at + self.cooldown - time.monotonic()
+            if self._state == OPEN and remaining > 0:
+                return remaining
+            if self._probing:
+                return max(remaining, 0.0) or self.cooldown
+            if self._state == OPEN:
+                self._transition(HALF_OPEN)
+            self._probing = True
+            return 0.0
+    
+    def record(self, failed: bool) -> None:
+        """Record the outcome of a call admitted by try_acquire()."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+                self._outcomes.clear()
+                self._failures = 0
+                if failed:
+                    self._opened_at = now
+                    self._transition(OPEN)
+                else:
+                    self._transition(CLOSED)
+                return
+            if self._state == OPEN:
+                return  # a call admitted before the circuit opened
+            
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._failures -= self._outcomes.popleft()[1]
+            calls = len(self._outcomes)
+            if calls >= self.min_calls and self._failures / calls >= self.failure_rate:
+                self._opened_at = now
+                self._transition(OPEN)
+
+
+class LatencyTracker:
+    """Rolling latency samples per operation, for hedging thresholds."""
+    
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.size = size
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = deque(maxlen=self.size)
+            samples.append(seconds)
+    
+    def quantile(self, operation: str, fraction: float) -> Optional[float]:
+        """Return the `fraction` quantile, or None until min_samples were seen."""
+        with self._lock:
+            samples = self._samples.get(operation)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResiliencePolicy:
+    """
+    Deadlines, hedging and circuit breaking for SupermemoryClient calls.
+    
+    Pass one as SupermemoryClient(resilience=...). Policies apply per
+    operation name ("search.execute", "memories.add", "memories.get",
+    "memories.list").
+    
+    - Deadline: the call (retries included) fails with DeadlineExceeded
+      after this many seconds. The abandoned request finishes in the
+      background, as an in-flight HTTP call cannot be cancelled.
+    - Hedging: when a call is still running after the operation's observed
+      `hedge_quantile` latency (p95 by default), an identical second
+      request is sent and whichever answers first wins. Only use it for
+      idempotent operations such as searches and reads.
+    - Circuit breaker: while open, calls fail immediately with
+      CircuitOpenError. search_memories() then serves a cached result,
+      even an expired one, or else the local index, if the client has
+      one.
+    
+    The hedge delay is based on the latency of every primary attempt,
+    including failed ones and those abandoned at the deadline or beaten
+    by their hedge (recorded when the request finishes).
+    
+    Calls with neither a deadline nor hedging run on the caller's thread;
+    the others run on a small shared thread pool.
+    """
+    
+    def __init__(
+        self,
+        deadlines: Optional[Dict[str, float]] = None,
+        default_deadline: Optional[float] = None,
+        hedge: Iterable[str] = ("search.execute",),
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.01,
+        breaker: Optional[CircuitBreaker] = None,
+        max_workers: int = 32
+    ):
+        """
+        Args:
+            deadlines: Seconds per operation name, e.g. {"search.execute": 2.0}
+            default_deadline: Deadline for operations not in `deadlines`
+            hedge: Operation names that may be hedged
+            hedge_quantile: Latency quantile after which a hedge is sent
+            hedge_min_delay: Lower bound for the hedge delay in seconds
+            breaker: CircuitBreaker shared by all operations (None disables)
+            max_workers: Threads for deadline and hedged calls
+        """
+        self.deadlines = dict(deadlines or {})
+        self.default_deadline = default_deadline
+        self.hedge = frozenset(hedge)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = breaker
+        self.max_workers = max_workers
+        self.latency = LatencyTracker()
+        self.instrumentation = None
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def _pool(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="supermemory-hedge"
+                    )
+        return self._executor
+    
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """Seconds after which a hedge is sent, or None (not hedged / too few samples)."""
+        if operation not in self.hedge:
+            return None
+        latency = self.latency.quantile(operation, self.hedge_quantile)
+        return None if latency is None else max(latency, self.hedge_min_delay)
+    
+    def execute(self, operation: str, fn: Callable[[], Any]) -> Any:
+        """Run `fn` under the breaker, deadline and hedging settings for `operation`."""
+        breaker = self.breaker
+        if breaker is not None:
+            wait = breaker.try_acquire()
+            if wait:
+                raise CircuitOpenError(operation, wait)
+        
+        deadline = self.deadlines.get(operation, self.default_deadline)
+        delay = self.hedge_delay(operation)
+        try:
+            if deadline is None and delay is None:
+                t0 = time.perf_counter()
+                try:
+                    result = fn()
+                finally:
+                    self.latency.observe(operation, time.perf_counter() - t0)
+            else:
+                result = self._run(operation, fn, deadline, delay)
+        except BaseException as e:
+            if breaker is not None:
+                breaker.record(counts_as_failure(e))
+            raise
+        if breaker is not None:
+            breaker.record(False)
+        return result
+    
+    def _run(
+        self,
+        operation: str,
+        fn: Callable[[], Any],
+        deadline: Optional[float],
+        delay: Optional[float]
+    ) -> Any:
+        """Run `fn` on the pool, sending a hedge after `delay` and giving up at `deadline`."""
+        from concurrent.futures import FIRST_COMPLETED, wait
+        
+        executor = self._pool()
+        start = time.monotonic()
+        end = None if deadline is None else start + deadline
+        hedge_at = None if delay is None else start + delay
+        t0 = time.perf_counter()
+        primary = executor.submit(fn)
+        # Observed whenever the primary finishes, even after a deadline or a hedge won
+        primary.add_done_callback(
+            lambda _: self.latency.observe(operation, time.perf_counter() - t0)
+        )
+        pending = {primary: "primary"}
+        hedged = False
+        error = None
+        
+        while pending:
+            now = time.monotonic()
+            if end is not None and now >= end:
+                raise DeadlineExceeded(operation, deadline)
+            limits = [limit for limit in (end, hedge_at) if limit is not None]
+            timeout = max(min(limits) - now, 0.0) if limits else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                role = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if hedged and self.instrumentation is not None:
+                    self.instrumentation.record_hedge(operation, role)
+                return result
+            
+            if hedge_at is not None and pending and time.monotonic() >= hedge_at:
+                pending[executor.submit(fn)] = "hedge"
+                hedge_at = None
+                hedged = True
+        
+        if hedged and self.instrumentation is not None:
+            self.instrumentation.record_hedge(operation, "none")
+        raise error
@@ -1,14 +1,12 @@
 """Save session summary to actual Supermemory.ai"""
-from supermemory import Supermemory
 import os
-from dotenv import load_dotenv
-from datetime import datetime
 
-load_dotenv()
+from dedupe import ContentDeduper
+from supermemory_client import SupermemoryClient
 
-client = Supermemory(
-    api_key=os.getenv('SUPERMEMORY_API_KEY'),
-    base_url=os.getenv('SUPERMEMORY_BASE_URL')
+# Re-running this script must not upload the same summary again
+client = SupermemoryClient(
+    dedupe=ContentDeduper(path=os.path.join(".supermemory", "uploaded_hashes.txt"))
 )
 
 # Session summary
@@ -34,7 +32,7 @@ Last worked: 2025-10-25 5:30 PM EDT
 
 # Save to Supermemory.ai
 print("Saving session summary to Supermemory.ai...")
-response = client.memories.add(
+response = client.add_memory(
     content=session_summary,
     metadata={
         "project": "supermemory-integration",
@@ -46,6 +44,9 @@ response = client.memories.add(
     }
 )
 
-print(f"✅ Session summary saved to Supermemory.ai!")
+if response.status == "duplicate":
+    print(f"ℹ️  Session summary already uploaded, skipped")
+else:
+    print(f"✅ Session summary saved to Supermemory.ai!")
 print(f"   Memory ID: {response.id}")
 print(f"   Status: {response.status}")
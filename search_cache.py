@@ -0,0 +1,200 @@
+"""
+In-process search result cache for SupermemoryClient.
+TTL + LRU bounded, with scope-aware invalidation on writes.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional, Tuple
+
+# (user_id, container_tags) a search is restricted to, or a write lands in
+Scope = Tuple[Optional[str], FrozenSet[str]]
+
+# The API has no user field; a user ID is sent as the container tag "user:<id>"
+USER_TAG_PREFIX = "user:"
+
+
+def user_container_tag(user_id: str) -> str:
+    """Return the container tag that scopes memories to `user_id`."""
+    return USER_TAG_PREFIX + user_id
+
+
+def make_search_key(params: Dict[str, Any]) -> Tuple[str, Optional[int], str]:
+    """
+    Build a hashable cache key from search.execute parameters.
+    
+    The key is (query, limit, remaining kwargs as canonical JSON), so two
+    calls only share an entry when every argument matches.
+    """
+    extra = {k: v for k, v in params.items() if k not in ("q", "limit")}
+    return (
+        params.get("q"),
+        params.get("limit"),
+        json.dumps(extra, sort_keys=True, default=str)
+    )
+
+
+def params_scope(params: Dict[str, Any]) -> Scope:
+    """
+    Extract the (user_id, container_tags) scope from add or search parameters.
+    
+    Both the API's camelCase and snake_case spellings are recognised. A
+    "user:<id>" container tag (see user_container_tag()) is reported as the
+    user ID rather than as a tag.
+    """
+    user_id = params.get("userId") or params.get("user_id")
+    tags = (
+        params.get("containerTags")
+        or params.get("container_tags")
+        or ([params["containerTag"]] if params.get("containerTag") else None)
+        or ([params["container_tag"]] if params.get("container_tag") else None)
+        or ()
+    )
+    other_tags = set()
+    for tag in tags:
+        if user_id is None and tag.startswith(USER_TAG_PREFIX):
+            user_id = tag[len(USER_TAG_PREFIX):]
+        else:
+            other_tags.add(tag)
+    return user_id, frozenset(other_tags)
+
+
+def scopes_overlap(search_scope: Scope, write_scope: Scope) -> bool:
+    """
+    Return True if a memory written in `write_scope` could appear in the
+    results of a search restricted to `search_scope`.
+    
+    Unscoped searches see everything, so any write affects them. A scoped
+    search is affected when the write shares its user id or any container tag.
+    """
+    search_user, search_tags = search_scope
+    write_user, write_tags = write_scope
+    if search_user is None and not search_tags:
+        return True
+    if search_user is not None and search_user == write_user:
+        return True
+    return bool(search_tags & write_tags)
+
+
+class SearchCache:
+    """Thread-safe TTL + LRU cache for search_memories() results"""
+    
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 300.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached searches; the least recently
+                         used entry is evicted when full
+            ttl: Seconds an entry stays valid, or None to never expire
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, scope, value)
+        self._generation = 0  # bumped on every invalidation
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+            self.misses += 1
+            return False, None
+    
+    def get_stale(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key even if its entry has expired. Expired entries are
+        kept until they are replaced or evicted, so they can be served
+        while the API is unavailable.
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            return True, entry[2]
+    
+    def put(self, key: Hashable, value: Any, scope: Scope = (None, frozenset())) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, scope, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        scope: Scope = (None, frozenset())
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `fetch()` on a miss.
+        
+        If an invalidation happens while `fetch()` is running, the result is
+        returned but not cached, since it may predate the write.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        generation = self._generation
+        value = fetch()
+        if generation == self._generation:
+            self.put(key, value, scope)
+        return value
+    
+    def invalidate(self, scope: Scope = (None, frozenset())) -> int:
+        """
+        Drop every entry whose search could include a memory written in `scope`.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, (_, entry_scope, _) in self._entries.items()
+                if scopes_overlap(entry_scope, scope)
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
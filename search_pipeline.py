@@ -0,0 +1,232 @@
+"""
+Metadata filtering and recency reranking for search results.
+Pushes what the API can filter into the request and handles the rest locally.
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from memory_fields import get_field
+
+# Comparison operators accepted in a `where` condition ({"date": {">=": "2025-01-01"}})
+OPERATORS = ("=", "!=", ">", ">=", "<", "<=", "in")
+
+# Operators the API's numeric metadata filters support
+_NUMERIC_PUSHDOWN = ("=", ">", ">=", "<", "<=")
+
+_COMPARE = {
+    "=": lambda actual, expected: actual == expected,
+    "!=": lambda actual, expected: actual != expected,
+    ">": lambda actual, expected: actual > expected,
+    ">=": lambda actual, expected: actual >= expected,
+    "<": lambda actual, expected: actual < expected,
+    "<=": lambda actual, expected: actual <= expected,
+    "in": lambda actual, expected: actual in expected,
+}
+
+
+def _conditions(where: Dict[str, Any]) -> List[Tuple[str, str, Any]]:
+    """
+    Normalise a `where` dict to (key, operator, value) triples.
+    
+    A plain value means equality, a list or set means "in", a callable is
+    kept as a predicate (operator "fn"), and a dict maps operators to values.
+    """
+    conditions = []
+    for key, spec in where.items():
+        if callable(spec):
+            conditions.append((key, "fn", spec))
+        elif isinstance(spec, dict):
+            for operator, value in spec.items():
+                if operator not in OPERATORS:
+                    raise ValueError(f"Unknown operator {operator!r} for {key!r}")
+                conditions.append((key, operator, value))
+        elif isinstance(spec, (list, tuple, set, frozenset)):
+            conditions.append((key, "in", frozenset(spec)))
+        else:
+            conditions.append((key, "=", spec))
+    return conditions
+
+
+def split_filters(where: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[Tuple[str, str, Any]]]:
+    """
+    Split metadata conditions into an API `filters` argument and local conditions.
+    
+    Pushed down: string equality and inequality, and numeric
+    comparisons. Kept local: "in" lists, string ordering (e.g. ISO dates)
+    and callables. All conditions are returned in the local list as well,
+    so results are still correct if the server (or a cache) ignores a filter.
+    
+    Returns:
+        ({"AND": [...]} or None, every condition as (key, operator, value))
+    """
+    conditions = _conditions(where)
+    pushed = []
+    for key, operator, value in conditions:
+        numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if numeric and operator in _NUMERIC_PUSHDOWN:
+            pushed.append({
+                "filterType": "numeric",
+                "key": key,
+                "value": str(value),
+                "numericOperator": operator,
+                "negate": False,
+            })
+        elif isinstance(value, str) and operator in ("=", "!="):
+            pushed.append({"key": key, "value": value, "negate": operator == "!="})
+    return ({"AND": pushed} if pushed else None), conditions
+
+
+def matches(metadata: Optional[Dict[str, Any]], conditions: Sequence[Tuple[str, str, Any]]) -> bool:
+    """
+    Return True if `metadata` satisfies every (key, operator, value) condition.
+    
+    A missing key satisfies "!=" (as a negated API filter does) and fails
+    every other operator.
+    """
+    metadata = metadata or {}
+    for key, operator, expected in conditions:
+        if key not in metadata:
+            if operator == "!=":
+                continue
+            return False
+        actual = metadata[key]
+        if operator == "fn":
+            if not expected(actual):
+                return False
+            continue
+        try:
+            if not _COMPARE[operator](actual, expected):
+                return False
+        except TypeError:
+            return False  # e.g. comparing a string to a number
+    return True
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Convert a datetime or ISO 8601 string to a POSIX timestamp (None if unknown)."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def recency_rerank(
+    results: Sequence[Any],
+    half_life: float,
+    weight: float = 0.5,
+    now: Optional[float] = None
+) -> List[Tuple[Any, float]]:
+    """
+    Rerank results by relevance blended with exponential recency decay.
+    
+    Each result scores (1 - weight) * score + weight * 0.5 ** (age / half_life),
+    so a memory `half_life` seconds old gets half the recency boost of a new
+    one. Results without a created_at get no boost. Scoring is vectorised
+    with numpy when it is installed.
+    
+    Args:
+        results: Search results with `score` and `created_at`
+        half_life: Seconds after which the recency boost halves
+        weight: Share of recency in the final score (0 to 1)
+        now: Reference POSIX time (default: now)
+    
+    Returns:
+        List of (result, blended_score) tuples, best first
+    """
+    if half_life <= 0:
+        raise ValueError("half_life must be positive")
+    now = time.time() if now is None else now
+    scores = [float(get_field(result, "score") or 0.0) for result in results]
+    created = [parse_timestamp(get_field(result, "created_at", "createdAt")) for result in results]
+    
+    try:
+        import numpy as np
+    except ImportError:
+        blended = [
+            (1 - weight) * score
+            + (weight * 0.5 ** (max(now - ts, 0.0) / half_life) if ts is not None else 0.0)
+            for score, ts in zip(scores, created)
+        ]
+    else:
+        ages = np.array([now - ts if ts is not None else math.inf for ts in created], dtype=float)
+        boost = np.power(0.5, np.clip(ages, 0.0, None) / half_life)
+        blended = ((1 - weight) * np.array(scores, dtype=float) + weight * boost).tolist()
+    
+    order = sorted(range(len(blended)), key=blended.__getitem__, reverse=True)
+    return [(results[i], blended[i]) for i in order]
+
+
+class FilteredSearchResponse:
+    """Result of SupermemoryClient.search_filtered()"""
+    
+    def __init__(
+        self,
+        results: List[Any],
+        scores: List[float],
+        fetched: int,
+        filters: Optional[Dict[str, Any]],
+        response: Any
+    ):
+        """
+        Args:
+            results: Filtered (and reranked) results, best first
+            scores: Final score of each result
+            fetched: Number of results the API returned
+            filters: The `filters` argument pushed down to the API
+            response: Raw search response
+        """
+        self.results = results
+        self.scores = scores
+        self.fetched = fetched
+        self.filters = filters
+        self.response = response
+        self.total = len(results)
+    
+    def __repr__(self) -> str:
+        return f"FilteredSearchResponse(total={self.total}, fetched={self.fetched})"
+
+
+def filter_and_rerank(
+    response: Any,
+    conditions: Sequence[Tuple[str, str, Any]],
+    limit: int,
+    filters: Optional[Dict[str, Any]] = None,
+    half_life: Optional[float] = None,
+    weight: float = 0.5,
+    now: Optional[float] = None
+) -> FilteredSearchResponse:
+    """
+    Apply local conditions and optional recency reranking to a search response.
+    
+    Args:
+        response: Search response with `.results`
+        conditions: Conditions from split_filters()
+        limit: Maximum number of results to keep
+        filters: Pushed-down filters (recorded on the response)
+        half_life: Recency half-life in seconds (None keeps the API order)
+        weight: Share of recency in the final score
+        now: Reference POSIX time for recency
+    """
+    fetched = list(get_field(response, "results") or [])
+    kept = [result for result in fetched if matches(get_field(result, "metadata"), conditions)]
+    if half_life is not None:
+        ranked = recency_rerank(kept, half_life, weight, now)
+    else:
+        ranked = [(result, float(get_field(result, "score") or 0.0)) for result in kept]
+    ranked = ranked[:limit]
+    return FilteredSearchResponse(
+        [result for result, _ in ranked],
+        [score for _, score in ranked],
+        len(fetched),
+        filters,
+        response
+    )
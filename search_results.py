@@ -0,0 +1,138 @@
+"""
+Lazy, paginated search results for SupermemoryClient.
+Compact __slots__ records built straight from the response JSON.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Record attribute -> key in the API's JSON response
+FIELD_KEYS = {
+    "document_id": "documentId",
+    "score": "score",
+    "title": "title",
+    "type": "type",
+    "summary": "summary",
+    "metadata": "metadata",
+    "created_at": "createdAt",
+    "updated_at": "updatedAt",
+    "chunks": "chunks",
+}
+
+DEFAULT_FIELDS = tuple(FIELD_KEYS)
+
+
+class ChunkRecord:
+    """One matching chunk of a search result"""
+    
+    __slots__ = ("content", "score", "is_relevant")
+    
+    def __init__(self, data: Dict[str, Any]):
+        self.content = data.get("content")
+        self.score = data.get("score")
+        self.is_relevant = data.get("isRelevant", data.get("is_relevant"))
+    
+    def __repr__(self) -> str:
+        return f"ChunkRecord(score={self.score}, content={(self.content or '')[:40]!r})"
+
+
+class SearchRecord:
+    """
+    A compact search result holding only the requested fields.
+    
+    Values are references into the decoded response, not copies, and no
+    SDK model objects are built (chunks are wrapped in lightweight
+    ChunkRecord objects). Reading a field that was not requested raises
+    AttributeError.
+    """
+    
+    __slots__ = tuple(FIELD_KEYS)
+    
+    def __init__(self, data: Dict[str, Any], fields: Iterable[str]):
+        for field in fields:
+            value = data.get(FIELD_KEYS[field])
+            if value is None and field != FIELD_KEYS[field]:
+                value = data.get(field)
+            if field == "chunks" and value is not None:
+                value = [ChunkRecord(chunk) for chunk in value]
+            setattr(self, field, value)
+    
+    def __repr__(self) -> str:
+        document_id = getattr(self, "document_id", None)
+        score = getattr(self, "score", None)
+        return f"SearchRecord(document_id={document_id!r}, score={score})"
+
+
+class SearchResults:
+    """
+    Iterator over search results that fetches further pages only on demand.
+    
+    The search endpoint has no offset parameter, so page N is fetched by
+    repeating the query with limit = N * page_size and skipping documents
+    that were already yielded. Nothing beyond the first page is requested
+    unless the caller keeps iterating.
+    """
+    
+    def __init__(
+        self,
+        fetch: Callable[[int], Dict[str, Any]],
+        page_size: int = 10,
+        max_results: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            fetch: Callable taking a limit and returning the decoded JSON
+                   response of one search request
+            page_size: Results requested per page
+            max_results: Stop after this many results (None for no limit)
+            fields: Record fields to keep (default: all of FIELD_KEYS)
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.fields = tuple(fields) if fields is not None else DEFAULT_FIELDS
+        unknown = set(self.fields) - set(FIELD_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown search result fields: {sorted(unknown)}")
+        if "document_id" not in self.fields:
+            self.fields = ("document_id",) + self.fields  # needed to skip seen results
+        
+        self._fetch = fetch
+        self.page_size = page_size
+        self.max_results = max_results
+        self.pages_fetched = 0
+        self.total = None
+    
+    def __iter__(self) -> Iterator[SearchRecord]:
+        seen = set()
+        yielded = 0
+        limit = self.page_size
+        while True:
+            data = self._fetch(limit)
+            self.pages_fetched += 1
+            self.total = data.get("total", self.total)
+            results = data.get("results") or []
+            
+            for item in results:
+                document_id = item.get("documentId", item.get("document_id"))
+                if document_id in seen:
+                    continue
+                seen.add(document_id)
+                yield SearchRecord(item, self.fields)
+                yielded += 1
+                if self.max_results is not None and yielded >= self.max_results:
+                    return
+            
+            if len(results) < limit:
+                return  # the server has no more matches
+            limit += self.page_size
+    
+    def first(self, n: int) -> List[SearchRecord]:
+        """Return up to the first `n` results, fetching no more pages than needed."""
+        records = []
+        if n <= 0:
+            return records
+        for record in self:
+            records.append(record)
+            if len(records) >= n:
+                break
+        return records
@@ -0,0 +1,463 @@
+"""
+Semantic search cache for SupermemoryClient.
+Paraphrased queries hit the cache via hashed query vectors and an
+approximate nearest-neighbour (IVF) index.
+"""
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from local_index import tokenize
+from search_cache import Scope, scopes_overlap
+
+# Words that carry no meaning in a search query ("what are neural nets")
+_STOPWORDS = frozenset(
+    "a about an and any are can could do does for from give how i in is it "
+    "list me my of on or our please show tell the there to us was we what whats "
+    "when where which who why with you".split()
+)
+
+
+def _numpy():
+    """Import numpy, with a hint if it is missing."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "The IVF index requires numpy: pip install numpy "
+            "(or pass use_numpy=False for the pure-Python index)"
+        ) from e
+    return numpy
+
+
+def content_words(query: str) -> List[str]:
+    """Words of a query without stopwords, with a crude plural folding."""
+    words = [word for word in tokenize(query) if word not in _STOPWORDS] or tokenize(query)
+    return [word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words]
+
+
+def _same_word(a: str, b: str) -> bool:
+    """One word is a prefix of the other ("net", "network"), or they share a 5-letter stem."""
+    return a.startswith(b) or b.startswith(a) or (len(a) >= 5 and len(b) >= 5 and a[:5] == b[:5])
+
+
+def same_content_words(query: str, other: str) -> bool:
+    """
+    Return True if every content word of each query matches one of the
+    other's (see _same_word()). Vectors of "enable caching" and "disable
+    caching" are close because their trigrams overlap; this check keeps
+    them apart.
+    """
+    words, other_words = set(content_words(query)), set(content_words(other))
+    return (
+        all(any(_same_word(word, match) for match in other_words) for word in words)
+        and all(any(_same_word(word, match) for match in words) for word in other_words)
+    )
+
+
+def query_features(query: str) -> List[Tuple[str, float]]:
+    """
+    Weighted features of a query: its content words plus their character
+    trigrams, so that "nets" and "networks" or "docker" and "dockerfile"
+    still overlap. Numbers and other non-alphabetic tokens only match exactly.
+    """
+    features = []
+    for word in content_words(query):
+        features.append(("w:" + word, 1.0))
+        if not word.isalpha():
+            continue  # "107" and "2107" must not look alike
+        padded = f"#{word}#"
+        features.extend(("c:" + padded[i:i + 3], 0.5) for i in range(len(padded) - 2))
+    return features
+
+
+def exact_tokens(query: str) -> Tuple[str, ...]:
+    """
+    Sorted tokens with a digit ("3" in "python 3", "v2", "2024"). Two
+    queries can only share a cached result if these are equal, because
+    "python 3 migration" and "python 2 migration" are similar as vectors
+    but ask for different things.
+    """
+    return tuple(sorted(token for token in tokenize(query) if any(c.isdigit() for c in token)))
+
+
+class HashingVectorizer:
+    """
+    Map queries to L2-normalised vectors of size `dim` with the hashing
+    trick (CRC32 bucket, sign from a second hash bit). No vocabulary or
+    model is needed, and vectors are stable across processes.
+    """
+    
+    def __init__(self, dim: int = 1024):
+        if dim < 16:
+            raise ValueError("dim must be at least 16")
+        self.dim = dim
+    
+    def sparse(self, query: str) -> Dict[int, float]:
+        """Return the normalised vector as {index: weight}."""
+        vector = {}
+        for feature, weight in query_features(query):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            index = digest % self.dim
+            sign = 1.0 if (digest >> 31) & 1 == 0 else -1.0
+            vector[index] = vector.get(index, 0.0) + sign * weight
+        norm = sum(value * value for value in vector.values()) ** 0.5
+        if not norm:
+            return {}
+        return {index: value / norm for index, value in vector.items() if value}
+    
+    def dense(self, query: str) -> Any:
+        """Return the normalised vector as a float32 numpy array."""
+        np = _numpy()
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for index, value in self.sparse(query).items():
+            vector[index] = value
+        return vector
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over unit vectors (inner product = cosine).
+    
+    Storage starts at `capacity` vectors and doubles as needed. Until it
+    holds `n_lists * 8` vectors, the index does an exact brute-force scan.
+    After that it trains `n_lists` k-means centroids and scans only the
+    vectors in the `n_probe` nearest lists. It retrains whenever its size
+    has doubled since the last training. Requires numpy.
+    """
+    
+    def __init__(self, dim: int, n_lists: int = 32, n_probe: int = 4, capacity: int = 8):
+        np = _numpy()
+        self._np = np
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = min(n_probe, n_lists)
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._lists = np.full(capacity, -1, dtype=np.int32)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._ids = [None] * capacity
+        self._slot_of = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self._centroids = None
+        self._trained_size = 0
+    
+    def __len__(self) -> int:
+        return len(self._slot_of)
+    
+    def _grow(self) -> None:
+        np = self._np
+        size = len(self._ids)
+        self._vectors = np.vstack([self._vectors, np.zeros((size, self.dim), dtype=np.float32)])
+        self._lists = np.concatenate([self._lists, np.full(size, -1, dtype=np.int32)])
+        self._live = np.concatenate([self._live, np.zeros(size, dtype=bool)])
+        self._ids.extend([None] * size)
+        self._free.extend(range(2 * size - 1, size - 1, -1))
+    
+    def _train(self) -> None:
+        """Run a few k-means iterations on the live vectors and reassign lists."""
+        np = self._np
+        slots = np.flatnonzero(self._live)
+        data = self._vectors[slots]
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(len(data), self.n_lists, replace=False)]
+        for _ in range(8):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            for list_id in range(self.n_lists):
+                members = data[assign == list_id]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[list_id] = centroid / norm
+        self._centroids = centroids
+        self._lists[slots] = np.argmax(data @ centroids.T, axis=1)
+        self._trained_size = len(slots)
+    
+    def add(self, item_id: Hashable, vector: Any) -> None:
+        if item_id in self._slot_of:
+            self.remove(item_id)
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._vectors[slot] = vector
+        self._live[slot] = True
+        self._ids[slot] = item_id
+        self._slot_of[item_id] = slot
+        if self._centroids is not None:
+            self._lists[slot] = int(self._np.argmax(self._centroids @ vector))
+        
+        size = len(self._slot_of)
+        if size >= self.n_lists * 8 and size >= 2 * self._trained_size:
+            self._train()
+    
+    def remove(self, item_id: Hashable) -> None:
+        slot = self._slot_of.pop(item_id, None)
+        if slot is None:
+            return
+        self._live[slot] = False
+        self._lists[slot] = -1
+        self._ids[slot] = None
+        self._free.append(slot)
+    
+    def search(self, vector: Any, k: int = 8) -> List[Tuple[Hashable, float]]:
+        """Return up to `k` (item_id, cosine similarity) pairs, best first."""
+        np = self._np
+        if not self._slot_of:
+            return []
+        if self._centroids is None:
+            candidates = np.flatnonzero(self._live)
+        else:
+            probes = np.argsort(self._centroids @ vector)[-self.n_probe:]
+            candidates = np.flatnonzero(self._live & np.isin(self._lists, probes))
+            if not len(candidates):
+                return []
+        scores = self._vectors[candidates] @ vector
+        if len(candidates) > k:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(self._ids[candidates[i]], float(scores[i])) for i in top]
+
+
+class BruteForceIndex:
+    """Pure-Python exact index over sparse vectors (used without numpy)."""
+    
+    def __init__(self):
+        self._vectors = {}
+    
+    def __len__(self) -> int:
+        return len(self._vectors)
+    
+    def add(self, item_id: Hashable, vector: Dict[int, float]) -> None:
+        self._vectors[item_id] = vector
+    
+    def remove(self, item_id: Hashable) -> None:
+        self._vectors.pop(item_id, None)
+    
+    def search(self, vector: Dict[int, float], k: int = 8) -> List[Tuple[Hashable, float]]:
+        scored = []
+        for item_id, other in self._vectors.items():
+            if len(other) < len(vector):
+                score = sum(value * vector.get(index, 0.0) for index, value in other.items())
+            else:
+                score = sum(value * other.get(index, 0.0) for index, value in vector.items())
+            scored.append((item_id, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+
+class SemanticSearchCache:
+    """
+    Search cache that also answers paraphrases of earlier queries.
+    
+    Drop-in alternative to SearchCache:
+    SupermemoryClient(cache=SemanticSearchCache()). An exact repeat of a
+    query is a plain dictionary hit. Otherwise the query is embedded with a
+    HashingVectorizer and looked up in the ANN index of earlier queries
+    with the same limit, filters, user ID and container tags (one index
+    per combination). The nearest one is returned if its cosine similarity
+    is at least `threshold`, it has the same numbers and versions (see
+    exact_tokens()) and the same content words (see same_content_words()).
+    
+    Similarity alone is not enough: "enable caching" / "disable caching"
+    (0.65) or "user login flow" / "user logout flow" (0.71) share most of
+    their trigrams. With the word check, a paraphrase such as "neural
+    networks" / "what are neural nets" (0.67) still hits, while none of
+    these pairs can. Entries are evicted least-recently-used beyond
+    `max_entries` and expire after `ttl`. Writes invalidate the entries
+    whose scope they overlap, as in SearchCache.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        threshold: float = 0.65,
+        dim: int = 1024,
+        n_lists: int = 32,
+        n_probe: int = 4,
+        use_numpy: Optional[bool] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached searches
+            ttl: Seconds an entry stays valid, or None to never expire
+            threshold: Minimum cosine similarity for a semantic hit (the
+                       word check in same_content_words() also applies)
+            dim: Size of the hashed query vectors
+            n_lists: IVF lists (clusters) once the index is large enough
+            n_probe: IVF lists scanned per lookup
+            use_numpy: Use the numpy IVF index (True), the pure-Python exact
+                       index (False), or numpy if installed (None)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.vectorizer = HashingVectorizer(dim)
+        
+        if use_numpy is None:
+            try:
+                _numpy()
+                use_numpy = True
+            except ImportError:
+                use_numpy = False
+        self.use_numpy = use_numpy
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self._indexes = {}  # key[1:] (limit, filters, scope) -> ANN index of queries
+        
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, scope, value)
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def _embed(self, query: str) -> Any:
+        return self.vectorizer.dense(query) if self.use_numpy else self.vectorizer.sparse(query)
+    
+    def _remove(self, key: Hashable) -> None:
+        del self._entries[key]
+        index = self._indexes[key[1:]]
+        index.remove(key)
+        if not len(index):
+            del self._indexes[key[1:]]
+    
+    def _alive(self, key: Hashable, now: float) -> bool:
+        # Expired entries stay until replaced or evicted (see get_stale())
+        expires_at = self._entries[key][0]
+        return expires_at is None or expires_at > now
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a search key from make_search_key(): exactly, then by
+        query similarity among entries with the same limit, filters and
+        scope, and the same numbers, versions and content words.
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries and self._alive(key, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][2]
+            
+            query, partition = key[0] or "", key[1:]
+            index = self._indexes.get(partition)
+            candidates = index.search(self._embed(query)) if index is not None else []
+            numbers = exact_tokens(query)
+            for candidate, score in candidates:
+                if score < self.threshold:
+                    break
+                other = candidate[0] or ""
+                if (exact_tokens(other) == numbers and same_content_words(query, other)
+                        and self._alive(candidate, now)):
+                    self._entries.move_to_end(candidate)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return True, self._entries[candidate][2]
+            
+            self.misses += 1
+            return False, None
+    
+    def get_stale(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key exactly, even if its entry has expired (for serving
+        while the API is unavailable).
+        
+        Returns:
+            (found, value) tuple; value is None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            return True, entry[2]
+    
+    def put(self, key: Hashable, value: Any, scope: Scope = (None, frozenset())) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        vector = self._embed(key[0] or "")
+        with self._lock:
+            self._entries[key] = (expires_at, scope, value)
+            self._entries.move_to_end(key)
+            index = self._indexes.get(key[1:])
+            if index is None:
+                index = self._indexes[key[1:]] = (
+                    IVFIndex(self.vectorizer.dim, self.n_lists, self.n_probe)
+                    if self.use_numpy else BruteForceIndex()
+                )
+            index.add(key, vector)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        scope: Scope = (None, frozenset())
+    ) -> Any:
+        """
+        Return the cached (or semantically matching) value for `key`,
+        calling `fetch()` on a miss. Results fetched while an invalidation
+        happened are returned but not cached.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        generation = self._generation
+        value = fetch()
+        if generation == self._generation:
+            self.put(key, value, scope)
+        return value
+    
+    def invalidate(self, scope: Scope = (None, frozenset())) -> int:
+        """
+        Drop every entry whose search could include a memory written in `scope`.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, (_, entry_scope, _) in self._entries.items()
+                if scopes_overlap(entry_scope, scope)
+            ]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters (semantic hits included in hits) and the size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
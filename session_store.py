@@ -0,0 +1,314 @@
+"""
+Structured per-project session state with incremental uploads.
+Keeps a local snapshot and uploads only the fields that changed.
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Session fields in display order, with their labels in memory content
+FIELDS = {
+    "summary": "Summary",
+    "next_steps": "Next Steps",
+    "status": "Status",
+    "github_url": "GitHub",
+    "commit_hash": "Commit",
+}
+
+STATE_TYPE = "session_state"
+DELTA_TYPE = "session_delta"
+
+_UNSAFE_ID_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def diff_fields(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the fields of `new` whose value differs from `old`.
+    
+    Fields that are None in `new` count as "not given" and keep their old
+    value, so they never appear in the delta.
+    """
+    return {
+        field: value for field, value in new.items()
+        if value is not None and old.get(field) != value
+    }
+
+
+def _metadata(memory: Any) -> Dict[str, Any]:
+    if isinstance(memory, dict):
+        return memory.get("metadata") or {}
+    return getattr(memory, "metadata", None) or {}
+
+
+def rebuild_state(memories: Iterable[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a session state from its uploaded state and delta memories.
+    
+    The latest full state is taken as the base and every later delta is
+    applied in version order.
+    
+    Args:
+        memories: Memory objects or dicts (from get_memory(), list or search)
+                  of one project; unrelated memories are ignored
+    
+    Returns:
+        dict with 'version', 'fields' and 'last_worked', or None if no full
+        state is among `memories`
+    """
+    records = []
+    for memory in memories:
+        metadata = _metadata(memory)
+        if metadata.get("type") not in (STATE_TYPE, DELTA_TYPE) or "state" not in metadata:
+            continue
+        records.append((int(metadata["version"]), metadata["type"], metadata))
+    records.sort(key=lambda record: record[0])
+    
+    base = None
+    for index, (_, kind, _) in enumerate(records):
+        if kind == STATE_TYPE:
+            base = index
+    if base is None:
+        return None
+    
+    state = {"version": 0, "fields": {}, "last_worked": None}
+    for version, _, metadata in records[base:]:
+        state["fields"].update(json.loads(metadata["state"]))
+        state["version"] = version
+        state["last_worked"] = metadata.get("last_worked", state["last_worked"])
+    return state
+
+
+class SessionStore:
+    """
+    Session record for one project, saved as a full state plus deltas.
+    
+    Each save is diffed against a local JSON snapshot of the last saved
+    state. Only the changed fields are uploaded, as a "session_delta"
+    memory that carries its version and the version it builds on. Every
+    `full_every` versions (and on the first save) the complete state is
+    uploaded as a "session_state" memory instead, so rebuilding never has
+    to walk a long chain. A save that changes nothing but the timestamp
+    uploads nothing.
+    
+    Usage:
+        store = SessionStore("my-project")
+        record = store.save(client, {"summary": "...", "status": "wip"})
+        store.state()             # from the local snapshot
+        store.load_remote(client) # rebuilt from the uploaded memories
+    """
+    
+    def __init__(
+        self,
+        project_name: str,
+        path: Optional[str] = None,
+        full_every: int = 10
+    ):
+        """
+        Args:
+            project_name: Name of the project
+            path: Snapshot file (default: .supermemory/session-<project>.json)
+            full_every: Upload the full state after this many versions
+        """
+        if full_every < 1:
+            raise ValueError("full_every must be at least 1")
+        self.project_name = project_name
+        self.path = path or os.path.join(".supermemory", f"session-{project_name}.json")
+        self.full_every = full_every
+        self._id_prefix = "session-" + _UNSAFE_ID_RE.sub("-", project_name).strip("-")
+        self._lock = threading.Lock()
+        self._snapshot = self._read()
+    
+    def _read(self) -> Dict[str, Any]:
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"version": 0, "fields": {}, "last_worked": None, "base_version": None, "chain": []}
+    
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def state(self) -> Dict[str, Any]:
+        """Return the last saved state: 'version', 'fields' and 'last_worked'."""
+        with self._lock:
+            return {
+                "version": self._snapshot["version"],
+                "fields": dict(self._snapshot["fields"]),
+                "last_worked": self._snapshot["last_worked"],
+            }
+    
+    def _content(self, fields: Dict[str, Any], version: int, full: bool, last_worked: str) -> str:
+        heading = "Session State" if full else "Session Update"
+        lines = [f"{self.project_name} - {heading} (v{version})", ""]
+        for field, label in FIELDS.items():
+            if fields.get(field) is not None:
+                lines.append(f"{label}: {fields[field]}")
+                lines.append("")
+        lines.append(f"Last Worked: {last_worked}")
+        return "\n".join(lines)
+    
+    def prepare(
+        self,
+        fields: Dict[str, Any],
+        last_worked: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Diff `fields` against the snapshot and build the memory to upload.
+        
+        Args:
+            fields: Session fields (keys from FIELDS); None values keep the
+                    previous value
+            last_worked: Timestamp text (default: now)
+        
+        Returns:
+            None if nothing changed, otherwise a record with 'content',
+            'metadata', 'custom_id', 'version', 'full', 'changed' and
+            'fields' (the complete new state). Pass it to commit() once the
+            upload succeeded.
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown session fields: {sorted(unknown)}")
+        last_worked = last_worked or datetime.now().strftime("%Y-%m-%d %I:%M %p")
+        
+        with self._lock:
+            snapshot = self._snapshot
+            changed = diff_fields(snapshot["fields"], fields)
+            if not changed:
+                return None
+            version = snapshot["version"] + 1
+            base_version = snapshot["base_version"]
+            full = base_version is None or version - base_version >= self.full_every
+            new_fields = dict(snapshot["fields"], **changed)
+        
+        uploaded = new_fields if full else changed
+        metadata = {
+            "project": self.project_name,
+            "type": STATE_TYPE if full else DELTA_TYPE,
+            "version": version,
+            "changed": ",".join(sorted(changed)),
+            "state": json.dumps(uploaded, sort_keys=True),
+            "last_worked": last_worked,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+        }
+        if not full:
+            metadata["base_version"] = version - 1
+        if new_fields.get("status") is not None:
+            metadata["status"] = new_fields["status"]
+        
+        return {
+            "content": self._content(uploaded, version, full, last_worked),
+            "metadata": metadata,
+            "custom_id": f"{self._id_prefix}-v{version}",
+            "version": version,
+            "full": full,
+            "changed": sorted(changed),
+            "fields": new_fields,
+        }
+    
+    def commit(self, record: Dict[str, Any], memory_id: Optional[str] = None) -> None:
+        """
+        Make a prepared record the new snapshot.
+        
+        Args:
+            record: Return value of prepare()
+            memory_id: ID of the uploaded memory, if known (None when spooled)
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if record["version"] != snapshot["version"] + 1:
+                raise ValueError(
+                    f"Stale session record v{record['version']} "
+                    f"(snapshot is at v{snapshot['version']})"
+                )
+            entry = {"version": record["version"], "id": memory_id, "custom_id": record["custom_id"]}
+            if record["full"]:
+                snapshot["base_version"] = record["version"]
+                snapshot["chain"] = [entry]
+            else:
+                snapshot["chain"].append(entry)
+            snapshot["version"] = record["version"]
+            snapshot["fields"] = record["fields"]
+            snapshot["last_worked"] = record["metadata"]["last_worked"]
+            self._write()
+    
+    def save(
+        self,
+        client: Any,
+        fields: Dict[str, Any],
+        last_worked: Optional[str] = None,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Upload the changes in `fields` through client.add_memory() and
+        update the snapshot.
+        
+        Args:
+            client: SupermemoryClient
+            fields: Session fields; None values keep the previous value
+            last_worked: Timestamp text (default: now)
+            **kwargs: Other add_memory() arguments (user_id, container_tags, ...)
+        
+        Returns:
+            The committed record plus 'response' (the API response), or None
+            if nothing changed
+        """
+        record = self.prepare(fields, last_worked)
+        if record is None:
+            return None
+        response = client.add_memory(
+            content=record["content"],
+            metadata=record["metadata"],
+            custom_id=record["custom_id"],
+            **kwargs
+        )
+        self.commit(record, getattr(response, "id", None))
+        record["response"] = response
+        return record
+    
+    def chain_ids(self) -> List[str]:
+        """IDs of the uploaded memories the current state is built from (known ones only)."""
+        with self._lock:
+            return [entry["id"] for entry in self._snapshot["chain"] if entry["id"]]
+    
+    def load_remote(self, client: Any, page_size: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the state from the uploaded memories, without the local snapshot.
+        
+        The project's memories are listed newest first with a metadata
+        filter on the project. Listing stops after the page holding the
+        newest full state, since older memories cannot change the result.
+        Works on a fresh machine and for saves that were spooled (whose
+        memory IDs were never known locally).
+        
+        Args:
+            client: SupermemoryClient
+            page_size: Memories per list request
+        
+        Returns:
+            The rebuilt state (see rebuild_state()), or None if no full
+            state has been uploaded
+        """
+        filters = {"AND": [{"key": "project", "value": self.project_name, "negate": False}]}
+        memories = []
+        page = 1
+        while True:
+            response = client.list_memories(
+                limit=page_size, page=page, sort="createdAt", order="desc", filters=filters
+            )
+            items = list(getattr(response, "memories", None) or [])
+            memories.extend(item for item in items if _metadata(item).get("project") == self.project_name)
+            if any(_metadata(item).get("type") == STATE_TYPE for item in memories):
+                break
+            pagination = getattr(response, "pagination", None)
+            if not items or pagination is None or page >= int(pagination.total_pages):
+                break
+            page += 1
+        return rebuild_state(memories)
@@ -0,0 +1,278 @@
+"""
+Streaming ingestion of large documents into Supermemory.ai
+Reads incrementally, chunks on sentence boundaries and uploads through a pipelined pool.
+"""
+
+import codecs
+import hashlib
+import io
+import itertools
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 4000
+DEFAULT_OVERLAP = 200
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+# Sentence end followed by whitespace, or a paragraph break
+_SENTENCE_END_RE = re.compile(r"(?:[.!?][\"')\]]*\s+|\n\s*\n)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+Source = Union[str, os.PathLike, io.IOBase, Iterable[str]]
+
+
+def iter_text(
+    source: Source,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encoding: str = "utf-8"
+) -> Iterator[str]:
+    """
+    Yield a source's text in blocks of about `buffer_size` characters.
+    
+    Args:
+        source: A file path, a text or binary file object, or an iterable
+                of strings (e.g. a generator of log lines)
+        buffer_size: Read size in bytes/characters
+        encoding: Encoding for paths and binary file objects; invalid bytes
+                  are replaced rather than aborting the ingest
+    
+    Yields:
+        Text blocks; only one block is held in memory at a time
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding=encoding, errors="replace", buffering=buffer_size) as f:
+            yield from iter_text(f, buffer_size, encoding)
+        return
+    
+    if hasattr(source, "read"):
+        decoder = None
+        while True:
+            block = source.read(buffer_size)
+            if not block:
+                break
+            if isinstance(block, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                block = decoder.decode(block)
+            if block:
+                yield block
+        if decoder is not None:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+        return
+    
+    for block in source:
+        if block:
+            yield block
+
+
+def _find_cut(text: str, chunk_size: int, start: int = 0) -> int:
+    """
+    Choose where to end a chunk within the `chunk_size` characters from
+    `start`: the last sentence boundary in the second half, else the last
+    whitespace, else a hard cut. Returns an absolute position in `text`.
+    """
+    end = start + chunk_size
+    half = start + chunk_size // 2
+    cut = 0
+    for match in _SENTENCE_END_RE.finditer(text, half, end):
+        cut = match.end()
+    if cut:
+        return cut
+    space = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+    if space > half:
+        return space + 1
+    return end
+
+
+def _overlap_start(text: str, cut: int, overlap: int) -> int:
+    """Start the next chunk `overlap` characters back, snapped forward to a word start."""
+    if overlap <= 0:
+        return cut
+    start = max(cut - overlap, 0)
+    match = _WHITESPACE_RE.search(text, start, cut)
+    return match.end() if match else start
+
+
+def iter_chunks(
+    blocks: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP
+) -> Iterator[str]:
+    """
+    Split a stream of text blocks into overlapping chunks.
+    
+    Chunks end on a sentence boundary where possible, otherwise on
+    whitespace, and never exceed `chunk_size` characters. Consecutive
+    chunks share about `overlap` characters of context. At most one chunk
+    plus one input block is buffered at any time.
+    
+    Chunks are cut from a moving start offset; the consumed prefix of the
+    buffer is dropped only when the next block is read, so each character
+    is copied a bounded number of times however large the blocks are.
+    
+    Args:
+        blocks: Text blocks, e.g. from iter_text()
+        chunk_size: Maximum characters per chunk
+        overlap: Characters repeated at the start of the next chunk
+    
+    Yields:
+        Non-empty chunk strings
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if not 0 <= overlap < chunk_size // 2:
+        raise ValueError("overlap must be between 0 and half of chunk_size")
+    
+    buffer = ""
+    start = 0
+    for block in blocks:
+        buffer = buffer[start:] + block
+        start = 0
+        while len(buffer) - start > chunk_size:
+            cut = _find_cut(buffer, chunk_size, start)
+            chunk = buffer[start:cut].strip()
+            if chunk:
+                yield chunk
+            start = _overlap_start(buffer, cut, overlap)
+    
+    tail = buffer[start:].strip()
+    if tail:
+        yield tail
+
+
+def document_id_for_path(path: Union[str, os.PathLike]) -> str:
+    """Stable document id for a file path, so re-ingesting it updates its chunks."""
+    path = os.path.abspath(os.fspath(path))
+    return "doc-" + hashlib.sha256(path.encode("utf-8")).hexdigest()[:24]
+
+
+def _default_document_id(source: Source) -> str:
+    """Stable id for file paths, random otherwise."""
+    if isinstance(source, (str, os.PathLike)):
+        return document_id_for_path(source)
+    import uuid
+    
+    return "doc-" + uuid.uuid4().hex[:24]
+
+
+def prune_chunks(
+    client: Any,
+    document_id: str,
+    start: int,
+    end: Optional[int] = None,
+    user_id: Optional[str] = None,
+    container_tags: Optional[List[str]] = None
+) -> int:
+    """
+    Delete the chunks of `document_id` numbered `start` and above.
+    
+    Chunks are deleted by custom_id ("<document_id>-<chunk_index>") through
+    client.delete_memories(), which invalidates the search cache once for
+    the whole batch (scoped to `user_id` and `container_tags`). With `end`
+    (the previous chunk count), chunks start..end-1 are deleted and no
+    other request is made. Without it, deleting continues until the API
+    reports a chunk as missing (HTTP 404), so no listing is needed.
+    
+    Returns:
+        Number of chunks deleted
+    """
+    if end is not None:
+        if end <= start:
+            return 0
+        ids = (f"{document_id}-{index}" for index in range(start, end))
+    else:
+        ids = (f"{document_id}-{index}" for index in itertools.count(start))
+    return client.delete_memories(
+        ids, user_id=user_id, container_tags=container_tags, stop_at_missing=end is None
+    )
+
+
+def ingest_stream(
+    client: Any,
+    source: Source,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+    metadata: Optional[Dict[str, Any]] = None,
+    document_id: Optional[str] = None,
+    max_workers: int = 8,
+    max_in_flight: Optional[int] = None,
+    encoding: str = "utf-8",
+    prune: bool = True,
+    previous_chunks: Optional[int] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Stream a large document into Supermemory as a series of chunk memories.
+    
+    Reading, chunking and uploading are pipelined. Chunks are produced
+    lazily and handed to the client's bounded bulk uploader, so memory use
+    is flat no matter how large the input is.
+    
+    Every chunk carries metadata `document_id`, `chunk_index` and (for file
+    paths) `source`, plus anything in `metadata`. Its custom_id is
+    "<document_id>-<chunk_index>", so re-ingesting the same document
+    updates its chunks instead of duplicating them. If the document got
+    shorter, the chunks past its new end are deleted afterwards (see
+    prune_chunks()), unless an upload failed or `prune` is False.
+    
+    Args:
+        client: SupermemoryClient to upload through
+        source: File path, file object, or iterable of strings
+        chunk_size: Maximum characters per chunk
+        overlap: Characters of context shared by consecutive chunks
+        metadata: Extra metadata attached to every chunk
+        document_id: Id grouping the chunks (derived from the path, or random)
+        max_workers: Concurrent uploads
+        max_in_flight: Maximum chunks read ahead of completed uploads
+        encoding: Text encoding for paths and binary file objects
+        prune: Delete chunks left over from a longer earlier version. Only
+               done for file paths and explicit document ids, since a
+               random id has no earlier version.
+        previous_chunks: Chunk count of the earlier version, if known, so
+                         pruning stops there instead of probing for the end
+        **kwargs: Other add_memory() arguments (user_id, container_tags, ...)
+    
+    Returns:
+        dict with 'document_id', 'chunks' (number uploaded), 'characters',
+        'errors' (list of (chunk_index, exception) tuples) and 'pruned'
+        (stale chunks deleted)
+    """
+    prune = prune and (document_id is not None or isinstance(source, (str, os.PathLike)))
+    document_id = document_id or _default_document_id(source)
+    base_metadata = dict(metadata or {}, document_id=document_id)
+    if isinstance(source, (str, os.PathLike)):
+        base_metadata.setdefault("source", os.path.basename(os.fspath(source)))
+    
+    stats = {"document_id": document_id, "chunks": 0, "characters": 0, "errors": [], "pruned": 0}
+    
+    def items():
+        for index, chunk in enumerate(iter_chunks(
+            iter_text(source, encoding=encoding), chunk_size, overlap
+        )):
+            stats["characters"] += len(chunk)
+            yield dict(
+                kwargs,
+                content=chunk,
+                metadata=dict(base_metadata, chunk_index=index),
+                custom_id=f"{document_id}-{index}"
+            )
+    
+    for item in client.iter_add_memories_bulk(
+        items(),
+        max_workers=max_workers,
+        max_in_flight=max_in_flight
+    ):
+        if item["error"] is not None:
+            stats["errors"].append((item["index"], item["error"]))
+        else:
+            stats["chunks"] += 1
+    
+    if prune and not stats["errors"]:
+        stats["pruned"] = prune_chunks(
+            client, document_id, stats["chunks"], previous_chunks,
+            user_id=kwargs.get("user_id"), container_tags=kwargs.get("container_tags")
+        )
+    return stats
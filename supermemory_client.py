@@ -4,15 +4,245 @@ A Python wrapper using the official Supermemory SDK.
 """
 
 import os
-from typing import Dict, List, Optional, Any
-from dotenv import load_dotenv
-from supermemory import Supermemory
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+
+from dedupe import DuplicateMemory, content_hash, custom_id_for_hash
+from local_index import LocalSearchResponse, merge_results
+from multi_search import DEFAULT_RRF_K, MultiSearchResponse, reciprocal_rank_fusion
+from rate_limit import get_scheduler, retry_call
+from resilience import CircuitOpenError
+from search_cache import make_search_key, params_scope, user_container_tag
+from search_pipeline import FilteredSearchResponse, filter_and_rerank, split_filters
+from search_results import SearchResults
+from streaming_ingest import ingest_stream
+
+if TYPE_CHECKING:
+    from supermemory import Supermemory
+
+
+DEFAULT_BASE_URL = "https://api.supermemory.ai/"
+
+# Used for any transport setting that is not given explicitly
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+# Processing states after which a memory's status no longer changes
+TERMINAL_STATUSES = ("done", "failed")
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """
+    Load variables from a .env file into the environment, once per process.
+    
+    python-dotenv is imported on the first call only, and later calls
+    return immediately.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def resolve_credentials(
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Resolve the API key and base URL from arguments or the environment.
+    
+    Raises:
+        ValueError: If no API key is available
+    """
+    load_env()
+    api_key = api_key or os.getenv("SUPERMEMORY_API_KEY")
+    base_url = base_url or os.getenv("SUPERMEMORY_BASE_URL", DEFAULT_BASE_URL)
+    
+    if not api_key:
+        raise ValueError(
+            "API key is required. Either pass it directly or set "
+            "SUPERMEMORY_API_KEY environment variable."
+        )
+    return api_key, base_url
+
+
+def scoped_tags(
+    user_id: Optional[str] = None,
+    container_tags: Optional[List[str]] = None
+) -> Optional[List[str]]:
+    """
+    Combine a user ID and container tags into the API's container_tags.
+    
+    The API has no user field, so the user is scoped with the container tag
+    "user:<id>" (see search_cache.user_container_tag()), placed first.
+    """
+    tags = list(container_tags or ())
+    if user_id:
+        tag = user_container_tag(user_id)
+        tags = [tag] + [t for t in tags if t != tag]
+    return tags or None
+
+
+def build_add_params(
+    content: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+    container_tags: Optional[List[str]] = None,
+    custom_id: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Build the keyword arguments for a memories.add call."""
+    params = {"content": content}
+    container_tags = scoped_tags(user_id, container_tags)
+    
+    if metadata:
+        params["metadata"] = metadata
+    if container_tags:
+        params["container_tags"] = container_tags
+    if custom_id:
+        params["custom_id"] = custom_id
+    
+    params.update(kwargs)
+    return params
+
+
+def build_search_params(
+    query: str,
+    limit: Optional[int] = None,
+    user_id: Optional[str] = None,
+    container_tags: Optional[List[str]] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Build the keyword arguments for a search.execute call."""
+    params = {"q": query}
+    container_tags = scoped_tags(user_id, container_tags)
+    
+    if limit:
+        params["limit"] = limit
+    if container_tags:
+        params["container_tags"] = container_tags
+    
+    params.update(kwargs)
+    return params
+
+
+def build_http_client(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    http2: bool = False
+) -> Any:
+    """
+    Build an httpx client for the SDK with the given connection pool settings.
+    
+    Args:
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Enable HTTP/2 (requires the `h2` package: pip install httpx[http2])
+    
+    Returns:
+        A supermemory.DefaultHttpxClient instance
+    """
+    import httpx
+    from supermemory import DefaultHttpxClient
+    
+    limits = httpx.Limits(
+        max_connections=max_connections or DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=(
+            DEFAULT_MAX_KEEPALIVE_CONNECTIONS if max_keepalive_connections is None
+            else max_keepalive_connections
+        ),
+        keepalive_expiry=(
+            DEFAULT_KEEPALIVE_EXPIRY if keepalive_expiry is None else keepalive_expiry
+        )
+    )
+    return DefaultHttpxClient(limits=limits, http2=http2)
+
+
+def build_timeout(
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None
+) -> Any:
+    """Build an httpx.Timeout from separate connect and read timeouts."""
+    import httpx
+    
+    return httpx.Timeout(
+        DEFAULT_READ_TIMEOUT if read_timeout is None else read_timeout,
+        connect=DEFAULT_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout
+    )
+
+
+_shared_clients: Dict[Tuple, "SupermemoryClient"] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    **transport
+) -> "SupermemoryClient":
+    """
+    Return a process-wide SupermemoryClient, creating it on first use.
+    
+    Callers asking for the same credentials and transport settings get the
+    same instance, so they share one warm connection pool instead of each
+    paying for new TCP/TLS handshakes.
+    
+    Args:
+        api_key: Your Supermemory API key (or from env)
+        base_url: Base URL for the API (or from env)
+        **transport: Transport settings accepted by SupermemoryClient
+                     (max_connections, keepalive_expiry, http2, ...)
+    
+    Returns:
+        The shared SupermemoryClient instance
+    """
+    api_key, base_url = resolve_credentials(api_key, base_url)
+    key = (api_key, base_url, tuple(sorted(transport.items())))
+    
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = SupermemoryClient(api_key=api_key, base_url=base_url, **transport)
+            _shared_clients[key] = client
+        return client
 
 
 class SupermemoryClient:
     """Client for interacting with Supermemory.ai API using the official SDK"""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[Any] = None,
+        local_index: Optional[Any] = None,
+        dedupe: Optional[Any] = None,
+        rate_limit: Optional[Any] = None,
+        instrumentation: Optional[Any] = None,
+        resilience: Optional[Any] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None
+    ):
         """
         Initialize the Supermemory client.
         
@@ -21,22 +251,186 @@ class SupermemoryClient:
                     SUPERMEMORY_API_KEY environment variable.
             base_url: Base URL for the API. If not provided, will look for
                      SUPERMEMORY_BASE_URL environment variable or use default.
+            cache: Optional SearchCache, DiskSearchCache or SemanticSearchCache
+                   for search_memories()
+                   results. Entries are invalidated when add_memory() writes
+                   to a matching user id or container tag. If not provided and
+                   SUPERMEMORY_SEARCH_CACHE is set, a DiskSearchCache at that
+                   path is used.
+            local_index: Optional local_index.LocalIndex. Memories written
+                         through add_memory() are indexed into it, and
+                         search_memories(mode="local" or "hybrid") reads it.
+            dedupe: Optional dedupe.ContentDeduper. add_memory() hashes the
+                    normalized content and metadata, derives a stable
+                    custom_id from it, and applies the deduper's policy.
+            rate_limit: Optional rate_limit.RateLimitScheduler, or True to use
+                        the process-wide scheduler for this API key. Requests
+                        then go through its token bucket, with searches
+                        prioritised over writes and 429s retried after the
+                        server's Retry-After. Unless max_retries is given, the
+                        SDK's own retries are disabled to avoid retrying twice.
+            instrumentation: Optional instrumentation.Instrumentation (e.g. a
+                             MetricsRecorder) notified of every API call,
+                             search cache lookup and indexing wait. When
+                             None, no measurements are taken. Unless
+                             rate_limit or max_retries is given, the SDK's
+                             retries are then replaced by the client's own
+                             (rate_limit.retry_call), so retries are counted.
+            resilience: Optional resilience.ResiliencePolicy with
+                        per-operation deadlines, hedged requests and a
+                        circuit breaker. While the breaker is open,
+                        search_memories() serves cached results, expired
+                        ones included, and falls back to the local index if
+                        there is one.
+            max_connections: Maximum concurrent HTTP connections in the pool
+            max_keepalive_connections: Maximum idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept alive
+            http2: Use HTTP/2 (requires `pip install httpx[http2]`)
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for a response
+            max_retries: SDK-level retry count for failed requests
+        
+        Transport settings left as None use the SDK defaults. The SDK is
+        imported and its client built on the first API call (or the first
+        access to `.client`), not here.
         """
-        load_dotenv()
-        self.api_key = api_key or os.getenv("SUPERMEMORY_API_KEY")
-        self.base_url = base_url or os.getenv("SUPERMEMORY_BASE_URL", "https://api.supermemory.ai/")
+        self.api_key, self.base_url = resolve_credentials(api_key, base_url)
         
-        if not self.api_key:
-            raise ValueError(
-                "API key is required. Either pass it directly or set "
-                "SUPERMEMORY_API_KEY environment variable."
+        cache_path = os.getenv("SUPERMEMORY_SEARCH_CACHE")
+        if cache is None and cache_path:
+            from disk_search_cache import DiskSearchCache
+            cache = DiskSearchCache(cache_path)
+        self.cache = cache
+        self.local_index = local_index
+        self.dedupe = dedupe
+        if rate_limit is True:
+            rate_limit = get_scheduler(self.api_key)
+        self.rate_limit = rate_limit
+        self.instrumentation = instrumentation
+        # SDK retries are invisible to the instrumentation; retry here instead
+        self._client_retries = (
+            instrumentation is not None and rate_limit is None and max_retries is None
+        )
+        self.resilience = resilience
+        if resilience is not None and instrumentation is not None:
+            resilience.instrumentation = instrumentation
+            breaker = resilience.breaker
+            if breaker is not None and breaker.on_state_change is None:
+                breaker.on_state_change = instrumentation.record_circuit
+        
+        self._transport = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+            "http2": http2,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "max_retries": max_retries
+        }
+        self._client = None
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self) -> "Supermemory":
+        """The underlying SDK client, imported and built on first access."""
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+                client = self._client
+        return client
+    
+    def _build_client(self) -> "Supermemory":
+        """Import the SDK and construct its client from the stored settings."""
+        from supermemory import Supermemory
+        
+        transport = self._transport
+        options = {}
+        if (transport["max_connections"] is not None
+                or transport["max_keepalive_connections"] is not None
+                or transport["keepalive_expiry"] is not None or transport["http2"]):
+            options["http_client"] = build_http_client(
+                max_connections=transport["max_connections"],
+                max_keepalive_connections=transport["max_keepalive_connections"],
+                keepalive_expiry=transport["keepalive_expiry"],
+                http2=transport["http2"]
             )
+        if transport["connect_timeout"] is not None or transport["read_timeout"] is not None:
+            options["timeout"] = build_timeout(transport["connect_timeout"], transport["read_timeout"])
+        if transport["max_retries"] is not None:
+            options["max_retries"] = transport["max_retries"]
+        elif self.rate_limit is not None or self._client_retries:
+            options["max_retries"] = 0
         
-        self.client = Supermemory(
+        return Supermemory(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            **options
         )
     
+    def _call(
+        self,
+        kind: str,
+        fn: Callable[[], Any],
+        operation: Optional[str] = None,
+        payload_bytes: Optional[int] = None
+    ) -> Any:
+        """
+        Perform one API request, through the resilience policy and the rate
+        limit scheduler if configured.
+        
+        Args:
+            kind: "search", "read" or "write"
+            fn: Zero-argument callable making the SDK call
+            operation: Name reported to the instrumentation (defaults to kind)
+            payload_bytes: Request content size reported to the instrumentation
+        """
+        if self.instrumentation is None:
+            if self.resilience is not None:
+                return self.resilience.execute(operation or kind, self._scheduled(fn, kind))
+            if self.rate_limit is not None:
+                return self.rate_limit.call(fn, kind)
+            return fn()
+        
+        attempts = 0
+        
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            return fn()
+        
+        started = time.time()
+        t0 = time.perf_counter()
+        error = None
+        try:
+            if self.resilience is not None:
+                return self.resilience.execute(operation or kind, self._scheduled(attempt, kind))
+            return self._scheduled(attempt, kind)()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.instrumentation.record_call(
+                operation or kind,
+                started,
+                time.perf_counter() - t0,
+                error=error,
+                attempts=max(attempts, 1),
+                payload_bytes=payload_bytes
+            )
+    
+    def _scheduled(self, fn: Callable[[], Any], kind: str) -> Callable[[], Any]:
+        """
+        Wrap `fn` so that it goes through the rate limit scheduler, if any,
+        or is retried by the client when the SDK's retries are disabled.
+        """
+        if self.rate_limit is not None:
+            return lambda: self.rate_limit.call(fn, kind)
+        if self._client_retries:
+            return lambda: retry_call(fn)
+        return fn
+    
     def add_memory(
         self, 
         content: str,
@@ -44,6 +438,7 @@ class SupermemoryClient:
         user_id: Optional[str] = None,
         container_tags: Optional[List[str]] = None,
         custom_id: Optional[str] = None,
+        dedupe_policy: Optional[str] = None,
         **kwargs
     ) -> Any:
         """
@@ -52,33 +447,155 @@ class SupermemoryClient:
         Args:
             content: The content to store as a memory (text or URL)
             metadata: Optional metadata dict to attach to the memory
-            user_id: Optional user ID for partitioning memories
+            user_id: Optional user ID for partitioning memories, sent as
+                     the container tag "user:<id>"
             container_tags: Optional list of tags for grouping memories
             custom_id: Optional custom ID for the memory
+            dedupe_policy: Override the client's dedupe policy for this call
+                           ("skip", "upsert" or "force")
             **kwargs: Additional arguments to pass to the API
-            
+        
         Returns:
-            Response from the API containing the created memory details
+            Response from the API containing the created memory details,
+            or a dedupe.DuplicateMemory if the upload was skipped
         """
-        params = {"content": content}
+        digest = None
+        if self.dedupe is not None:
+            digest = content_hash(content, metadata, container_tags)
+            policy = dedupe_policy or self.dedupe.policy
+            if custom_id is None and policy != "force":
+                custom_id = custom_id_for_hash(digest)
+            if self.dedupe.check(digest, policy):
+                return DuplicateMemory(custom_id or custom_id_for_hash(digest), digest)
         
-        if metadata:
-            params["metadata"] = metadata
-        if user_id:
-            params["userId"] = user_id
-        if container_tags:
-            params["containerTags"] = container_tags
-        if custom_id:
-            params["customId"] = custom_id
+        params = build_add_params(
+            content, metadata, user_id, container_tags, custom_id, **kwargs
+        )
         
-        params.update(kwargs)
+        response = self._call(
+            "write",
+            lambda: self.client.memories.add(**params),
+            operation="memories.add",
+            payload_bytes=len(content.encode("utf-8")) if self.instrumentation is not None else None
+        )
+        if digest is not None:
+            self.dedupe.record(digest)
+        scope = params_scope(params)
+        if self.cache is not None:
+            self.cache.invalidate(scope)
+        if self.local_index is not None and getattr(response, "id", None):
+            user_id, tags = scope
+            self.local_index.add(
+                response.id,
+                content,
+                metadata=metadata,
+                container_tags=tags,
+                user_id=user_id,
+                created_at=datetime.now(timezone.utc).isoformat()
+            )
+        return response
+    
+    def add_memories_bulk(
+        self,
+        items: Iterable[Union[str, Dict[str, Any]]],
+        max_workers: int = 8,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Add many memories concurrently over a bounded worker pool.
+        
+        Args:
+            items: Iterable of content strings or dicts of add_memory() arguments
+            max_workers: Number of concurrent add_memory() calls
+            ordered: If True, results follow input order; otherwise they are
+                     returned in completion order
+            max_in_flight: Maximum number of submitted but unfinished items
+                           (defaults to 4 * max_workers). The input iterable is
+                           consumed lazily, so memory use stays bounded.
         
-        return self.client.memories.add(**params)
+        Returns:
+            List of dicts with 'index', 'result' and 'error' for each item.
+            A failed item has 'result' set to None and 'error' set to the
+            exception; other items are unaffected.
+        """
+        return list(self.iter_add_memories_bulk(
+            items,
+            max_workers=max_workers,
+            ordered=ordered,
+            max_in_flight=max_in_flight
+        ))
+    
+    def iter_add_memories_bulk(
+        self,
+        items: Iterable[Union[str, Dict[str, Any]]],
+        max_workers: int = 8,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of add_memories_bulk() that yields each per-item
+        result as soon as it is available (subject to the ordering setting).
+        """
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+        
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        window = max_in_flight or max_workers * 4
+        
+        def run(index, item):
+            params = {"content": item} if isinstance(item, str) else dict(item)
+            try:
+                return {"index": index, "result": self.add_memory(**params), "error": None}
+            except Exception as e:
+                return {"index": index, "result": None, "error": e}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            source = enumerate(items)
+            exhausted = False
+            
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        index, item = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append(executor.submit(run, index, item))
+                
+                if not pending:
+                    return
+                
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+    
+    def add_document_stream(self, source: Any, **kwargs) -> Dict[str, Any]:
+        """
+        Stream a large document (file path, file object or iterable of
+        strings) into Supermemory as overlapping chunk memories, with flat
+        memory use.
+        
+        See streaming_ingest.ingest_stream() for the available options
+        (chunk_size, overlap, metadata, document_id, max_workers, ...).
+        
+        Returns:
+            dict with 'document_id', 'chunks', 'characters' and 'errors'
+        """
+        return ingest_stream(self, source, **kwargs)
     
     def search_memories(
         self,
         query: str,
         limit: Optional[int] = None,
+        mode: str = "remote",
+        user_id: Optional[str] = None,
+        container_tags: Optional[List[str]] = None,
         **kwargs
     ) -> Any:
         """
@@ -87,21 +604,403 @@ class SupermemoryClient:
         Args:
             query: The search query
             limit: Maximum number of results to return
+            mode: "remote" (the API), "local" (the local BM25 index only, no
+                  network) or "hybrid" (both, merged by score; falls back to
+                  local results if the API call fails)
+            user_id: Only search memories added with this user ID (its
+                     "user:<id>" container tag)
+            container_tags: Only search memories with these container tags
             **kwargs: Additional arguments to pass to the API
+        
+        Returns:
+            Search results from the API, or a LocalSearchResponse with the
+            same `.results` shape for "local" and "hybrid" modes
+        """
+        params = build_search_params(query, limit, user_id, container_tags, **kwargs)
+        
+        if mode == "remote":
+            if self.local_index is None:
+                return self._search_remote(params)
+            try:
+                return self._search_remote(params)
+            except CircuitOpenError:
+                mode = "local"  # API is failing; serve the local index
+        if mode not in ("local", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode!r}")
+        if self.local_index is None:
+            raise ValueError(f"search mode {mode!r} requires a local_index")
+        
+        user_id, tags = params_scope(params)
+        local_limit = limit or 10
+        local = self.local_index.search(
+            query, local_limit, container_tags=tags, user_id=user_id
+        )
+        if mode == "local":
+            return local
+        
+        try:
+            remote = self._search_remote(params)
+        except Exception:
+            return local
+        return LocalSearchResponse(
+            merge_results(local.results, list(remote.results), local_limit)
+        )
+    
+    def iter_search(
+        self,
+        query: str,
+        page_size: int = 10,
+        max_results: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> SearchResults:
+        """
+        Search lazily, fetching further pages only while the caller iterates.
+        
+        Results are compact SearchRecord objects built directly from the
+        response JSON, skipping SDK model parsing. Pages go through the
+        search cache like search_memories(). Pass `fields` to keep only
+        what you need. Without "chunks", the request asks for matching
+        chunks only and no full documents, which shrinks the payload.
+        
+        Args:
+            query: The search query
+            page_size: Results fetched per page
+            max_results: Stop after this many results
+            fields: Record fields to keep, e.g. ("document_id", "score")
+            **kwargs: Additional arguments to pass to the API
+        
+        Returns:
+            A SearchResults iterator of SearchRecord objects
+        """
+        if fields is not None and "chunks" not in fields:
+            kwargs.setdefault("only_matching_chunks", True)
+            kwargs.setdefault("include_full_docs", False)
+        
+        def fetch(limit):
+            return self._search_remote(build_search_params(query, limit, **kwargs), raw=True)
+        
+        return SearchResults(fetch, page_size=page_size, max_results=max_results, fields=fields)
+    
+    def search_memories_many(
+        self,
+        queries: Iterable[str],
+        limit: Optional[int] = None,
+        max_workers: int = 8,
+        rrf_k: int = DEFAULT_RRF_K,
+        **kwargs
+    ) -> MultiSearchResponse:
+        """
+        Run several related searches concurrently and fuse their results.
+        
+        Identical queries are only sent once. Every search goes through
+        search_memories() on this client's shared connection pool, so the
+        cache and rate limiting still apply. The call takes about as long as
+        the slowest query rather than the sum of all of them.
+        
+        Args:
+            queries: Search queries
+            limit: Maximum results per query, and of the fused list
+            max_workers: Maximum concurrent searches
+            rrf_k: Reciprocal-rank fusion constant
+            **kwargs: Additional arguments passed to every search_memories() call
+        
+        Returns:
+            MultiSearchResponse with `.results` deduplicated by document_id
+            and ranked by reciprocal-rank fusion, `.responses` per query and
+            `.errors` for queries that failed
+        
+        Raises:
+            The first error if every query failed
+        """
+        unique = list(dict.fromkeys(query.strip() for query in queries))
+        if not unique:
+            return MultiSearchResponse([], {}, {})
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        responses = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            futures = {
+                query: executor.submit(self.search_memories, query, limit, **kwargs)
+                for query in unique
+            }
+            for query, future in futures.items():
+                try:
+                    responses[query] = future.result()
+                except Exception as e:
+                    errors[query] = e
+        
+        if not responses:
+            raise next(iter(errors.values()))
+        
+        fused = reciprocal_rank_fusion(
+            [list(response.results) for response in responses.values()],
+            k=rrf_k,
+            limit=limit
+        )
+        return MultiSearchResponse(fused, responses, errors)
+    
+    def search_filtered(
+        self,
+        query: str,
+        limit: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        recency_half_life: Optional[float] = None,
+        recency_weight: float = 0.5,
+        overfetch: int = 3,
+        **kwargs
+    ) -> FilteredSearchResponse:
+        """
+        Search with metadata conditions and optional recency reranking.
+        
+        Conditions the API can evaluate (string equality, numeric
+        comparisons) are sent as its `filters` argument, so fewer results
+        come back over the wire. The rest ("in" lists, ISO date ranges,
+        callables) are applied locally. Only when something is filtered or
+        reranked locally are `limit * overfetch` results requested.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            where: Metadata conditions, e.g. {"project": "my-project",
+                   "type": ["decision", "session_end"],
+                   "date": {">=": "2025-01-01"}}
+            recency_half_life: Blend in recency with this half-life in
+                               seconds (None keeps the API ranking)
+            recency_weight: Share of recency in the final score (0 to 1)
+            overfetch: Result multiplier when filtering or reranking locally
+            **kwargs: Additional arguments passed to search_memories()
+        
+        Returns:
+            FilteredSearchResponse with `.results`, `.scores`, `.fetched`
+            and the pushed-down `.filters`
+        """
+        filters, conditions = split_filters(where or {})
+        pushed = len(filters["AND"]) if filters else 0
+        local_work = len(conditions) > pushed or recency_half_life is not None
+        if filters and "filters" not in kwargs:
+            kwargs["filters"] = filters
+        else:
+            filters = kwargs.get("filters")
+        
+        response = self.search_memories(query, limit * overfetch if local_work else limit, **kwargs)
+        return filter_and_rerank(
+            response, conditions, limit, filters, recency_half_life, recency_weight
+        )
+    
+    def _search_remote(self, params: Dict[str, Any], raw: bool = False) -> Any:
+        """
+        Run search.execute, going through the search cache if configured.
+        
+        With `raw`, the decoded response JSON is returned (and cached under
+        a separate key) instead of the SDK model. While the circuit breaker
+        is open, an expired cache entry for the same search is returned
+        instead of raising CircuitOpenError.
+        """
+        def request():
+            if raw:
+                return self.client.search.with_raw_response.execute(**params).http_response.json()
+            return self.client.search.execute(**params)
+        
+        def fetch():
+            return self._call("search", request, operation="search.execute")
+        
+        if self.cache is None:
+            return fetch()
+        key = make_search_key(dict(params, response="json") if raw else params)
+        try:
+            if self.instrumentation is None:
+                return self.cache.get_or_fetch(key, fetch, params_scope(params))
+            
+            missed = False
             
+            def fetch_on_miss():
+                nonlocal missed
+                missed = True
+                return fetch()
+            
+            try:
+                return self.cache.get_or_fetch(key, fetch_on_miss, params_scope(params))
+            finally:
+                self.instrumentation.record_cache(not missed)
+        except CircuitOpenError:
+            get_stale = getattr(self.cache, "get_stale", None)
+            found, value = get_stale(key) if get_stale is not None else (False, None)
+            if not found:
+                raise
+            return value
+    
+    def get_memory(self, memory_id: str) -> Any:
+        """
+        Get a memory by ID.
+        
+        Args:
+            memory_id: ID returned by add_memory()
+        
         Returns:
-            Search results from the API
+            The memory details from the API, including its processing status
+        """
+        return self._call(
+            "read",
+            lambda: self.client.memories.get(memory_id),
+            operation="memories.get"
+        )
+    
+    def delete_memory(self, memory_id: str) -> None:
+        """
+        Delete a memory by ID or custom ID.
+        
+        The search cache is cleared, since the memory's scope is not known
+        here, and the memory is dropped from the local index.
+        
+        Args:
+            memory_id: ID returned by add_memory(), or the custom_id it was
+                       added with
         """
-        params = {"q": query}
+        self._call(
+            "write",
+            lambda: self.client.memories.delete(memory_id),
+            operation="memories.delete"
+        )
+        if self.cache is not None:
+            self.cache.clear()
+        if self.local_index is not None:
+            self.local_index.remove(memory_id)
+    
+    def delete_memories(
+        self,
+        memory_ids: Iterable[str],
+        user_id: Optional[str] = None,
+        container_tags: Optional[List[str]] = None,
+        stop_at_missing: bool = False
+    ) -> int:
+        """
+        Delete memories by ID or custom ID, with one cache invalidation.
+        
+        Memories that do not exist (HTTP 404) are skipped. The search cache
+        is invalidated once, after the last delete: only the entries that
+        overlap the given user and container tags, or all of them if no
+        scope is given.
+        
+        Args:
+            memory_ids: IDs or custom IDs, deleted in order
+            user_id: User the memories were added with, if known
+            container_tags: Container tags the memories were added with
+            stop_at_missing: Stop at the first memory that does not exist
         
+        Returns:
+            Number of memories deleted
+        """
+        deleted = 0
+        try:
+            for memory_id in memory_ids:
+                try:
+                    self._call(
+                        "write",
+                        lambda memory_id=memory_id: self.client.memories.delete(memory_id),
+                        operation="memories.delete"
+                    )
+                except Exception as e:
+                    if getattr(e, "status_code", None) != 404:
+                        raise
+                    if stop_at_missing:
+                        break
+                    continue
+                deleted += 1
+                if self.local_index is not None:
+                    self.local_index.remove(memory_id)
+        finally:
+            if deleted and self.cache is not None:
+                scope = params_scope({"container_tags": scoped_tags(user_id, container_tags) or ()})
+                if scope == (None, frozenset()):
+                    self.cache.clear()
+                else:
+                    self.cache.invalidate(scope)
+        return deleted
+    
+    def list_memories(
+        self,
+        limit: Optional[int] = None,
+        page: Optional[int] = None,
+        sort: str = "createdAt",
+        order: str = "desc",
+        container_tags: Optional[List[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        List memories one page at a time.
+        
+        Args:
+            limit: Memories per page
+            page: Page number, starting at 1
+            sort: "createdAt" or "updatedAt"
+            order: "desc" (newest first) or "asc"
+            container_tags: Only list memories with these container tags
+            **kwargs: Additional arguments to pass to the API
+        
+        Returns:
+            The API response with `.memories` and `.pagination`
+        """
+        params = {"sort": sort, "order": order}
         if limit:
             params["limit"] = limit
-        
+        if page:
+            params["page"] = page
+        if container_tags:
+            params["container_tags"] = container_tags
         params.update(kwargs)
         
-        return self.client.search.execute(**params)
+        return self._call(
+            "read",
+            lambda: self.client.memories.list(**params),
+            operation="memories.list"
+        )
+    
+    def wait_until_indexed(
+        self,
+        memory_id: str,
+        timeout: float = 10.0,
+        initial_delay: float = 0.1,
+        max_delay: float = 2.0
+    ) -> str:
+        """
+        Poll a memory's processing status until it is done, failed or the
+        deadline passes.
+        
+        The delay between polls starts at `initial_delay` and doubles up to
+        `max_delay`. Short indexing jobs are seen quickly, and slow ones do
+        not flood the API with requests.
+        
+        Args:
+            memory_id: ID returned by add_memory()
+            timeout: Seconds to wait before giving up
+            initial_delay: Delay before the second poll
+            max_delay: Upper bound for the delay between polls
+        
+        Returns:
+            The last observed status ('done', 'failed', or an in-progress
+            status such as 'queued' or 'embedding' on timeout)
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        delay = initial_delay
+        while True:
+            status = getattr(self.get_memory(memory_id), "status", None)
+            if status in TERMINAL_STATUSES:
+                if self.instrumentation is not None:
+                    self.instrumentation.record_indexing_lag(time.monotonic() - started, status)
+                return status
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if self.instrumentation is not None:
+                    self.instrumentation.record_indexing_lag(time.monotonic() - started, status)
+                return status
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
     
-    def get_raw_client(self) -> Supermemory:
+    def get_raw_client(self) -> "Supermemory":
         """
         Get the underlying Supermemory client for advanced usage.
         
@@ -0,0 +1,308 @@
+"""
+Multi-tenant layer over a shared SupermemoryClient.
+Per-user scoping, search caches, quotas and fair-share concurrency.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from search_cache import SearchCache, make_search_key, params_scope
+from supermemory_client import SupermemoryClient, build_search_params
+
+
+class TenantQuotaExceeded(RuntimeError):
+    """Raised when a tenant has used up its request quota"""
+    
+    def __init__(self, user_id: str, retry_after: float):
+        super().__init__(
+            f"Request quota exceeded for tenant {user_id!r}; retry in {retry_after:.2f}s"
+        )
+        self.user_id = user_id
+        self.retry_after = retry_after
+
+
+class _Quota:
+    """Non-blocking token bucket: `rate` requests per second, bursts up to `burst`."""
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def is_full(self) -> bool:
+        """Return True once the bucket has refilled (same as a new bucket)."""
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return self._tokens + elapsed * self.rate >= self.capacity
+
+
+class _Slots:
+    """Concurrency slots of one tenant, with a count of those in use."""
+    
+    def __init__(self, size: int):
+        self._semaphore = threading.BoundedSemaphore(size)
+        self._in_use = 0
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> "_Slots":
+        self._semaphore.acquire()
+        with self._lock:
+            self._in_use += 1
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._semaphore.release()
+    
+    def busy(self) -> bool:
+        """Return True while a request holds one of the slots."""
+        with self._lock:
+            return self._in_use > 0
+
+
+class TenantClient:
+    """
+    View of the shared client for one user.
+    
+    The API has no user field, so every write carries the tenant's
+    container tag "user:<id>" and every search is restricted to it.
+    Searches go through the tenant's own cache. Requests count against the
+    tenant's quota and concurrency share, so one busy tenant cannot crowd
+    out the others.
+    """
+    
+    def __init__(
+        self,
+        router: "TenantRouter",
+        user_id: str,
+        container_tags: Optional[List[str]] = None
+    ):
+        self.router = router
+        self.user_id = user_id
+        self.container_tags = list(container_tags) if container_tags else None
+        self.cache = (
+            SearchCache(router.cache_entries, router.cache_ttl) if router.cache_entries else None
+        )
+        self.requests = 0
+        self.rejected = 0
+        self._quota, self._slots = router._limits_for(user_id)
+    
+    @contextmanager
+    def _admit(self) -> Iterator[None]:
+        """Charge the quota, then hold one of the tenant's concurrency slots."""
+        if self._quota is not None:
+            wait = self._quota.try_acquire()
+            if wait:
+                self.rejected += 1
+                raise TenantQuotaExceeded(self.user_id, wait)
+        with self._slots:
+            self.requests += 1
+            yield
+    
+    def add_memory(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        container_tags: Optional[List[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Add a memory for this tenant (see SupermemoryClient.add_memory()).
+        
+        Container tags default to the tenant's own tags.
+        """
+        tags = container_tags or self.container_tags
+        with self._admit():
+            response = self.router.client.add_memory(
+                content,
+                metadata=metadata,
+                user_id=self.user_id,
+                container_tags=tags,
+                **kwargs
+            )
+        if self.cache is not None:
+            self.cache.invalidate((self.user_id, frozenset(tags or ())))
+        return response
+    
+    def search_memories(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        container_tags: Optional[List[str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Search this tenant's memories, through the tenant's cache.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            container_tags: Narrow the search to these tags (default: the
+                            tenant's own tags)
+            **kwargs: Additional arguments to pass to the API
+        """
+        tags = container_tags or self.container_tags
+        params = build_search_params(query, limit, self.user_id, tags, **kwargs)
+        
+        def fetch():
+            with self._admit():
+                return self.router.client.search_memories(
+                    query, limit, user_id=self.user_id, container_tags=tags, **kwargs
+                )
+        
+        if self.cache is None:
+            return fetch()
+        return self.cache.get_or_fetch(make_search_key(params), fetch, params_scope(params))
+    
+    def get_memory(self, memory_id: str) -> Any:
+        """Get a memory by ID, counted against this tenant's quota."""
+        with self._admit():
+            return self.router.client.get_memory(memory_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request, rejection and cache counters for this tenant."""
+        return {
+            "user_id": self.user_id,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+class TenantRouter:
+    """
+    Route requests for many users through one shared SupermemoryClient.
+    
+    All tenants share one connection pool and, if configured, one rate
+    limit scheduler. Each tenant gets its own search cache, an optional
+    request quota, and at most `max_concurrent` requests in flight.
+    Because of that cap, a hot tenant holds a bounded share of the pool and
+    of the scheduler queue, and other tenants' requests still get through.
+    
+    Tenant state is created on first use and kept for the `max_tenants`
+    most recently active users. Older entries are dropped along with
+    their caches. Quota buckets and concurrency slots are kept separately,
+    so an evicted tenant cannot reset its quota or exceed its concurrency
+    share by coming back. They are also kept for at most `max_tenants`
+    users. When full, the user seen longest ago whose bucket has refilled
+    and who has no request in flight is dropped, or else simply the user
+    seen longest ago.
+    
+    Usage:
+        router = TenantRouter(SupermemoryClient(rate_limit=True), quota_rate=2)
+        router.tenant("user-42").add_memory("...")
+        router.search_memories("user-42", "query")
+    """
+    
+    def __init__(
+        self,
+        client: Optional[SupermemoryClient] = None,
+        cache_entries: int = 64,
+        cache_ttl: Optional[float] = 300.0,
+        quota_rate: Optional[float] = None,
+        quota_burst: Optional[float] = None,
+        max_concurrent: int = 4,
+        max_tenants: int = 10000
+    ):
+        """
+        Args:
+            client: Shared SupermemoryClient (default: one built from the
+                    environment)
+            cache_entries: Search results cached per tenant (0 disables)
+            cache_ttl: Seconds a cached search stays valid
+            quota_rate: Requests per second each tenant may make (None for
+                        no quota)
+            quota_burst: Requests a tenant may make at once after being idle
+                         (defaults to quota_rate)
+            max_concurrent: Requests one tenant may have in flight
+            max_tenants: Tenants whose state is kept
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.client = client or SupermemoryClient()
+        self.cache_entries = cache_entries
+        self.cache_ttl = cache_ttl
+        self.quota_rate = quota_rate
+        self.quota_burst = max(quota_burst if quota_burst is not None else (quota_rate or 0), 1.0)
+        self.max_concurrent = max_concurrent
+        self.max_tenants = max_tenants
+        self._tenants = OrderedDict()
+        self._limits = OrderedDict()  # user_id -> (quota bucket or None, slots)
+        self._lock = threading.Lock()
+        self._limits_lock = threading.Lock()
+    
+    def _limits_for(self, user_id: str) -> Tuple[Optional[_Quota], "_Slots"]:
+        """
+        Return the quota bucket and concurrency slots of `user_id`, which
+        outlive its TenantClient.
+        """
+        with self._limits_lock:
+            limits = self._limits.get(user_id)
+            if limits is not None:
+                self._limits.move_to_end(user_id)
+                return limits
+            while len(self._limits) >= self.max_tenants:
+                idle = next(
+                    (key for key, (quota, slots) in self._limits.items()
+                     if not slots.busy() and (quota is None or quota.is_full())),
+                    None
+                )
+                if idle is None:
+                    self._limits.popitem(last=False)
+                else:
+                    del self._limits[idle]
+            quota = _Quota(self.quota_rate, self.quota_burst) if self.quota_rate else None
+            limits = self._limits[user_id] = (quota, _Slots(self.max_concurrent))
+            return limits
+    
+    def tenant(self, user_id: str, container_tags: Optional[List[str]] = None) -> TenantClient:
+        """
+        Return the TenantClient for `user_id`, creating it on first use.
+        
+        Args:
+            user_id: The tenant's user ID
+            container_tags: Default container tags for a new tenant
+        """
+        if not user_id:
+            raise ValueError("user_id is required")
+        with self._lock:
+            tenant = self._tenants.get(user_id)
+            if tenant is None:
+                tenant = TenantClient(self, user_id, container_tags)
+                self._tenants[user_id] = tenant
+                while len(self._tenants) > self.max_tenants:
+                    self._tenants.popitem(last=False)
+            else:
+                self._tenants.move_to_end(user_id)
+            return tenant
+    
+    def add_memory(self, user_id: str, content: str, **kwargs) -> Any:
+        """Add a memory for `user_id` (see TenantClient.add_memory())."""
+        return self.tenant(user_id).add_memory(content, **kwargs)
+    
+    def search_memories(self, user_id: str, query: str, limit: Optional[int] = None, **kwargs) -> Any:
+        """Search the memories of `user_id` (see TenantClient.search_memories())."""
+        return self.tenant(user_id).search_memories(query, limit, **kwargs)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tenant stats for all tenants currently tracked."""
+        with self._lock:
+            tenants = list(self._tenants.values())
+        return {tenant.user_id: tenant.stats() for tenant in tenants}
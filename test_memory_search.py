@@ -1,23 +1,22 @@
 """Test if memories were saved to Supermemory"""
-from supermemory import Supermemory
-import os
-from dotenv import load_dotenv
+from supermemory_client import SupermemoryClient
 
-load_dotenv()
-
-client = Supermemory(
-    api_key=os.getenv('SUPERMEMORY_API_KEY'),
-    base_url=os.getenv('SUPERMEMORY_BASE_URL')
-)
+# Set SUPERMEMORY_SEARCH_CACHE=.supermemory/search_cache.sqlite3 to reuse
+# results across runs
+client = SupermemoryClient()
 
 # Search for session end memories
 print("Searching for 'supermemory-integration session end'...")
-response = client.search.execute(q='supermemory-integration session end', limit=5)
+results = client.iter_search(
+    'supermemory-integration session end',
+    max_results=5,
+    fields=("document_id", "created_at", "chunks")
+).first(5)
 
-print(f"\nResults found: {len(response.results)}\n")
+print(f"\nResults found: {len(results)}\n")
 
-if response.results:
-    for i, result in enumerate(response.results, 1):
+if results:
+    for i, result in enumerate(results, 1):
         print(f"{i}. Document ID: {result.document_id}")
         print(f"   Created: {result.created_at}")
         if result.chunks:
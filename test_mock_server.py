@@ -0,0 +1,89 @@
+"""
+Smoke test: drive the client's write paths through the local mock server.
+Runs offline with the real SDK, so wrong request arguments fail here.
+"""
+
+import os
+import tempfile
+
+from ingest import IngestManifest, ingest_paths
+from mock_supermemory_server import MockSupermemoryServer
+from streaming_ingest import document_id_for_path, ingest_stream
+from supermemory_client import SupermemoryClient
+from write_behind import WriteBehindQueue
+
+
+def test_mock_server():
+    """Add, enqueue, ingest, re-ingest and search memories through the mock server"""
+    
+    print("=" * 60)
+    print("Smoke test against the mock Supermemory server")
+    print("=" * 60)
+    
+    with MockSupermemoryServer(latency=0.001, jitter=0.0, indexing_delay=0.0) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        client = SupermemoryClient(api_key="test", base_url=server.url)
+        
+        print("\n[Test 1] add_memory with tags and a custom ID...")
+        response = client.add_memory(
+            "Smoke test memory",
+            metadata={"type": "smoke_test"},
+            container_tags=["smoke"],
+            custom_id="smoke-1"
+        )
+        assert response.id
+        assert client.get_memory(response.id).custom_id == "smoke-1"
+        print(f"✓ Memory added: {response.id}")
+        
+        print("\n[Test 2] Write-behind enqueue and flush...")
+        queue = WriteBehindQueue(client, os.path.join(tmp, "spool.jsonl"), base_backoff=0.05)
+        queue.enqueue("Spooled smoke test memory", {"type": "smoke_test"}, container_tags=["smoke"])
+        assert queue.close(timeout=10)
+        stats = queue.stats()
+        assert stats["uploaded"] == 1 and stats["dead_lettered"] == 0, stats
+        print(f"✓ Spool drained: {stats}")
+        
+        print("\n[Test 3] Streaming ingest of a file...")
+        path = os.path.join(tmp, "document.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("A sentence for the smoke test. " * 400)
+        stats = ingest_stream(client, path, chunk_size=1000, overlap=100, container_tags=["smoke"])
+        assert stats["chunks"] > 1 and not stats["errors"], stats
+        print(f"✓ Ingested {stats['chunks']} chunks")
+        
+        print("\n[Test 4] Search scoped by container tag and user...")
+        client.add_memory("Smoke test memory for a user", user_id="alice")
+        results = client.search_memories("smoke test", limit=5, container_tags=["smoke"])
+        assert results.results
+        results = client.search_memories("smoke test", limit=5, user_id="alice")
+        assert len(results.results) == 1
+        print("✓ Search found the user's memory only")
+        
+        print("\n[Test 5] Re-ingesting a file that shrank deletes its stale chunks...")
+        path = os.path.join(tmp, "shrinking.txt")
+        manifest = IngestManifest(os.path.join(tmp, "manifest.jsonl"))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("A sentence that will mostly go away. " * 300)
+        first = ingest_paths(client, [path], chunk_size=1000, overlap=0, cpu_workers=0,
+                             manifest=manifest, container_tags=["shrink"])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("A sentence that will mostly go away. " * 50)
+        second = ingest_paths(client, [path], chunk_size=1000, overlap=0, cpu_workers=0,
+                              manifest=manifest, container_tags=["shrink"])
+        manifest.close()
+        assert first["chunks"] > second["chunks"] > 0, (first, second)
+        assert second["pruned"] == first["chunks"] - second["chunks"], second
+        stored = client.list_memories(limit=100, container_tags=["shrink"]).memories
+        document_id = document_id_for_path(path)
+        assert sorted(memory.custom_id for memory in stored) == sorted(
+            f"{document_id}-{index}" for index in range(second["chunks"])
+        )
+        print(f"✓ {second['pruned']} stale chunks deleted, {second['chunks']} kept")
+    
+    print("\n" + "=" * 60)
+    print("✅ Smoke test passed")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_mock_server()
@@ -4,10 +4,66 @@ Tests all 4 steps: Windsurf Memory, Supermemory.ai, Git Commit, GitHub Push
 """
 
 from dual_memory_helper import DualMemoryHelper
+import argparse
 import subprocess
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+
+class VerificationResult:
+    """Outcome of SaveWorkflowVerifier.verify_all()"""
+    
+    KEYS = ('windsurf_memory', 'supermemory_ai', 'git_commit', 'github_push')
+    
+    def __init__(self):
+        self.windsurf_memory = False
+        self.supermemory_ai = False
+        self.supermemory_id = None
+        self.indexed = None
+        self.git_commit = False
+        self.commit_hash = None
+        self.github_push = False
+        self.branch_name = None
+        self.durations = {}
+        self.elapsed = 0.0
+    
+    @property
+    def all_verified(self):
+        return (
+            self.windsurf_memory in [True, 'manual'] and
+            bool(self.supermemory_ai) and
+            self.git_commit and
+            self.github_push
+        )
+    
+    def __getitem__(self, key):
+        # Old callers indexed the results dict by step name
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self):
+        """Return all fields as a plain dict (e.g. for JSON output)."""
+        return {
+            'windsurf_memory': self.windsurf_memory,
+            'supermemory_ai': self.supermemory_ai,
+            'supermemory_id': self.supermemory_id,
+            'indexed': self.indexed,
+            'git_commit': self.git_commit,
+            'commit_hash': self.commit_hash,
+            'github_push': self.github_push,
+            'branch_name': self.branch_name,
+            'all_verified': self.all_verified,
+            'durations': dict(self.durations),
+            'elapsed': self.elapsed
+        }
+    
+    def __repr__(self):
+        return f"VerificationResult(all_verified={self.all_verified}, elapsed={self.elapsed:.2f}s)"
+
+
 class SaveWorkflowVerifier:
     """Verify all 4 steps of the save workflow"""
     
@@ -15,6 +71,10 @@ class SaveWorkflowVerifier:
         self.project_name = project_name
         self.project_path = project_path
         self.helper = DualMemoryHelper(project_name)
+        self._reset_results()
+    
+    def _reset_results(self):
+        """Mark every step as not verified (before each run)."""
         self.verification_results = {
             'windsurf_memory': False,
             'supermemory_ai': False,
@@ -22,26 +82,68 @@ class SaveWorkflowVerifier:
             'github_push': False
         }
     
-    def verify_all(self, summary, next_steps, status, github_url=None):
+    def _timed(self, durations, name, fn, *args, **kwargs):
+        """Run fn and record its duration under `name`."""
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            durations[name] = round(time.perf_counter() - started, 3)
+    
+    def verify_all(self, summary, next_steps, status, github_url=None, fast=False):
         """
         Run complete verification of all 4 steps.
         
+        The memory save and the two git checks are independent, so they run
+        concurrently and the whole verification takes about as long as the
+        slowest step. Git output is collected and printed once the save is
+        done, so the messages of different steps do not interleave.
+        
+        Args:
+            summary: What was accomplished
+            next_steps: What to do next
+            status: Current project status
+            github_url: Optional GitHub repository URL
+            fast: Skip remote verification (waiting for Supermemory.ai to
+                  finish indexing the saved memory)
+        
         Returns:
-            dict with verification results for each step
+            VerificationResult (also indexable by step name like the old
+            results dict)
         """
         print("=" * 70)
         print("SAVE MY WORK - VERIFICATION WORKFLOW")
         print("=" * 70)
         
-        # Step 1 & 2: Save to both memory systems
-        print("\n📝 STEP 1 & 2: Saving to Memory Systems...")
-        memory_results = self.helper.save_session_end(
-            summary=summary,
-            next_steps=next_steps,
-            status=status,
-            github_url=github_url,
-            verify=True
-        )
+        self._reset_results()
+        result = VerificationResult()
+        started = time.perf_counter()
+        git_log = []
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Steps 3 & 4 (git subprocesses) run while the memory save is in flight
+            commit_future = executor.submit(
+                self._timed, result.durations, 'git_commit', self.verify_git_commit, git_log
+            )
+            push_future = executor.submit(
+                self._timed, result.durations, 'github_push', self.verify_github_push, git_log
+            )
+            
+            # Step 1 & 2: Save to both memory systems
+            print("\n📝 STEP 1 & 2: Saving to Memory Systems...")
+            memory_results = self._timed(
+                result.durations,
+                'memory_save',
+                self.helper.save_session_end,
+                summary=summary,
+                next_steps=next_steps,
+                status=status,
+                github_url=github_url,
+                verify=not fast
+            )
+            
+            commit_hash = commit_future.result()
+            push_success, branch_name = push_future.result()
         
         # Check Windsurf Memory (manual verification needed)
         if memory_results['windsurf'] == 'manual_save_required':
@@ -58,11 +160,25 @@ class SaveWorkflowVerifier:
         
         # Step 3: Git Commit
         print("\n📦 STEP 3: Git Commit Verification...")
-        commit_hash = self.verify_git_commit()
+        for line in git_log:
+            if line[0] == 'git_commit':
+                print(line[1])
         
         # Step 4: GitHub Push
         print("\n🚀 STEP 4: GitHub Push Verification...")
-        push_success, branch_name = self.verify_github_push()
+        for line in git_log:
+            if line[0] == 'github_push':
+                print(line[1])
+        
+        result.windsurf_memory = self.verification_results['windsurf_memory']
+        result.supermemory_ai = self.verification_results['supermemory_ai']
+        result.supermemory_id = supermemory_id
+        result.indexed = None if fast else memory_results.get('verified')
+        result.git_commit = self.verification_results['git_commit']
+        result.commit_hash = commit_hash
+        result.github_push = self.verification_results['github_push']
+        result.branch_name = branch_name
+        result.elapsed = round(time.perf_counter() - started, 3)
         
         # Final Checklist
         print("\n" + "=" * 70)
@@ -71,6 +187,8 @@ class SaveWorkflowVerifier:
         
         windsurf_status = "⚠️  Manual save required" if self.verification_results['windsurf_memory'] == 'manual' else "❌ Not saved"
         supermemory_status = f"✅ Saved (ID: {supermemory_id})" if self.verification_results['supermemory_ai'] else "❌ Not saved"
+        if fast and self.verification_results['supermemory_ai']:
+            supermemory_status += " - indexing not checked (--fast)"
         git_status = f"✅ Committed (hash: {commit_hash})" if self.verification_results['git_commit'] else "❌ Not committed"
         github_status = f"✅ Pushed (branch: {branch_name})" if self.verification_results['github_push'] else "❌ Not pushed"
         
@@ -79,16 +197,8 @@ class SaveWorkflowVerifier:
         print(f"3. Git Commit:       {git_status}")
         print(f"4. GitHub Push:      {github_status}")
         
-        # Overall status
-        all_verified = (
-            self.verification_results['windsurf_memory'] in [True, 'manual'] and
-            self.verification_results['supermemory_ai'] and
-            self.verification_results['git_commit'] and
-            self.verification_results['github_push']
-        )
-        
         print("\n" + "=" * 70)
-        if all_verified:
+        if result.all_verified:
             print("✅ ALL 4 STEPS VERIFIED! You can continue from any computer!")
         else:
             print("⚠️  INCOMPLETE: Some steps need attention")
@@ -98,12 +208,25 @@ class SaveWorkflowVerifier:
                 print("   - Git commit needed")
             if not self.verification_results['github_push']:
                 print("   - GitHub push needed")
+        print(f"   Completed in {result.elapsed:.2f}s")
         print("=" * 70)
         
-        return self.verification_results
+        return result
     
-    def verify_git_commit(self):
-        """Verify git commit and return commit hash"""
+    def verify_git_commit(self, log=None):
+        """
+        Verify git commit and return commit hash.
+        
+        Args:
+            log: Optional list; messages are appended to it as
+                 ('git_commit', text) instead of being printed
+        """
+        def report(message):
+            if log is None:
+                print(message)
+            else:
+                log.append(('git_commit', message))
+        
         try:
             # Get the latest commit hash
             result = subprocess.run(
@@ -116,19 +239,31 @@ class SaveWorkflowVerifier:
             commit_hash = result.stdout.strip()
             
             if commit_hash:
-                print(f"   ✅ Latest commit: {commit_hash[:8]}")
+                report(f"   ✅ Latest commit: {commit_hash[:8]}")
                 self.verification_results['git_commit'] = True
                 return commit_hash[:8]
             else:
-                print(f"   ❌ No commits found")
+                report(f"   ❌ No commits found")
                 return None
-                
+        
         except subprocess.CalledProcessError as e:
-            print(f"   ❌ Git error: {e}")
+            report(f"   ❌ Git error: {e}")
             return None
     
-    def verify_github_push(self):
-        """Verify GitHub push status"""
+    def verify_github_push(self, log=None):
+        """
+        Verify GitHub push status.
+        
+        Args:
+            log: Optional list; messages are appended to it as
+                 ('github_push', text) instead of being printed
+        """
+        def report(message):
+            if log is None:
+                print(message)
+            else:
+                log.append(('github_push', message))
+        
         try:
             # Check if local branch is up to date with remote
             result = subprocess.run(
@@ -145,25 +280,30 @@ class SaveWorkflowVerifier:
             
             # Check if ahead or behind
             if 'ahead' in status:
-                print(f"   ⚠️  Local branch '{branch_name}' is ahead of remote")
-                print(f"   Run: git push")
+                report(f"   ⚠️  Local branch '{branch_name}' is ahead of remote")
+                report(f"   Run: git push")
                 return False, branch_name
             elif 'behind' in status:
-                print(f"   ⚠️  Local branch '{branch_name}' is behind remote")
-                print(f"   Run: git pull")
+                report(f"   ⚠️  Local branch '{branch_name}' is behind remote")
+                report(f"   Run: git pull")
                 return False, branch_name
             else:
-                print(f"   ✅ Branch '{branch_name}' is up to date with remote")
+                report(f"   ✅ Branch '{branch_name}' is up to date with remote")
                 self.verification_results['github_push'] = True
                 return True, branch_name
-                
+        
         except subprocess.CalledProcessError as e:
-            print(f"   ❌ Git error: {e}")
+            report(f"   ❌ Git error: {e}")
             return False, None
 
 
 # Example usage
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the 'Save My Work' workflow")
+    parser.add_argument("--fast", action="store_true",
+                        help="skip waiting for Supermemory.ai to index the saved memory")
+    args = parser.parse_args()
+    
     verifier = SaveWorkflowVerifier(
         project_name="supermemory-integration",
         project_path=os.getcwd()
@@ -173,5 +313,6 @@ if __name__ == "__main__":
         summary="Added verification workflow to dual-memory system",
         next_steps="Test verification in real workflow",
         status="Verification system complete",
-        github_url="https://github.com/369Temetnosce/supermemory-integration"
+        github_url="https://github.com/369Temetnosce/supermemory-integration",
+        fast=args.fast
     )
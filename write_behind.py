@@ -0,0 +1,355 @@
+"""
+Write-behind ingestion queue for Supermemory.ai
+Saves land in a local append-only spool file and are uploaded in the background.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: the spool is only locked within the process
+    fcntl = None
+
+from resilience import CircuitOpenError
+
+DEFAULT_SPOOL_PATH = os.path.join(".supermemory", "spool.jsonl")
+
+# 4xx statuses that are worth retrying; any other 4xx means the record
+# itself is bad and will never succeed
+RETRYABLE_CLIENT_STATUSES = (408, 409, 429)
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    Return True if retrying the request can never succeed.
+    
+    API errors with a non-retryable 4xx status are permanent, other API,
+    connection and timeout errors are not. Any other exception (e.g. a
+    TypeError from bad add_memory() arguments) comes from the record itself
+    and is permanent too.
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES
+    if isinstance(error, (TimeoutError, ConnectionError, CircuitOpenError)):
+        return False
+    try:
+        from supermemory import APIError
+    except ImportError:
+        return True
+    return not isinstance(error, APIError)
+
+
+class WriteBehindQueue:
+    """
+    Durable write-behind queue in front of SupermemoryClient.add_memory().
+    
+    enqueue() appends the memory to a JSON-lines spool file and fsyncs it, so
+    the caller only waits for local disk. A background thread drains the
+    spool in batches through add_memories_bulk(), retrying with jittered
+    exponential backoff while the API is unreachable. The upload position is
+    kept in a sidecar ".offset" file, so anything not yet uploaded survives
+    crashes and restarts.
+    
+    Delivery is at-least-once. Each record is sent with its spool id as
+    custom_id (unless one was given) so a replayed upload updates the same
+    memory instead of creating a duplicate.
+    
+    Records rejected with a non-retryable 4xx status, or failing with a
+    non-API error, are moved to a ".dead" file next to the spool rather
+    than blocking the queue.
+    
+    Appends and compaction hold an exclusive lock on a ".lock" file, so
+    other processes may enqueue into the same spool (with autostart=False).
+    Only one queue should flush a given spool file at a time.
+    """
+    
+    def __init__(
+        self,
+        client: Any,
+        spool_path: str = DEFAULT_SPOOL_PATH,
+        batch_size: int = 32,
+        max_workers: int = 4,
+        flush_interval: float = 1.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        autostart: bool = True
+    ):
+        """
+        Initialize the queue and recover any spooled records.
+        
+        Args:
+            client: SupermemoryClient used for uploads
+            spool_path: Append-only spool file
+            batch_size: Maximum records uploaded per batch
+            max_workers: Concurrent uploads within a batch
+            flush_interval: Seconds the flusher sleeps when idle
+            base_backoff: First retry delay in seconds after a failed batch
+            max_backoff: Upper bound for the retry delay
+            autostart: Start the background flusher immediately
+        """
+        self.client = client
+        self.spool_path = spool_path
+        self.offset_path = spool_path + ".offset"
+        self.lock_path = spool_path + ".lock"
+        self.dead_letter_path = spool_path + ".dead"
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.flush_interval = flush_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.uploaded = 0
+        self.failed_attempts = 0
+        self.dead_lettered = 0
+        self.last_error = None
+        
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        
+        os.makedirs(os.path.dirname(os.path.abspath(spool_path)), exist_ok=True)
+        self._offset = self._read_offset()
+        self._recover_torn_write()
+        
+        if autostart:
+            self.start()
+    
+    @contextmanager
+    def _spool_lock(self):
+        """Hold the spool lock across threads and, where fcntl exists, processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _read_offset(self) -> int:
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+    
+    def _write_offset(self, offset: int) -> None:
+        tmp_path = self.offset_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_path)
+        self._offset = offset
+    
+    def _recover_torn_write(self) -> None:
+        """Drop a trailing partial line left by a crash in the middle of enqueue()."""
+        if not os.path.exists(self.spool_path):
+            return
+        with self._spool_lock(), open(self.spool_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+        if self._offset > os.path.getsize(self.spool_path):
+            self._write_offset(0)
+    
+    def enqueue(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> str:
+        """
+        Durably spool a memory for upload.
+        
+        Args:
+            content: The content to store as a memory
+            metadata: Optional metadata dict
+            **kwargs: Other add_memory() arguments (user_id, container_tags, ...)
+        
+        Returns:
+            The spool id of the record (also used as its custom_id by default)
+        """
+        spool_id = uuid.uuid4().hex
+        params = dict(kwargs, content=content)
+        if metadata:
+            params["metadata"] = metadata
+        params.setdefault("custom_id", spool_id)
+        line = json.dumps({"id": spool_id, "params": params}, separators=(",", ":")) + "\n"
+        
+        with self._spool_lock():
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._idle.clear()
+        self._wakeup.set()
+        return spool_id
+    
+    def _read_batch(self) -> List[Dict[str, Any]]:
+        """Read up to batch_size records after the committed offset."""
+        records = []
+        with self._lock:
+            if not os.path.exists(self.spool_path):
+                return records
+            with open(self.spool_path, "rb") as f:
+                f.seek(self._offset)
+                position = self._offset
+                while len(records) < self.batch_size:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        break
+                    position += len(line)
+                    records.append({"end": position, **json.loads(line)})
+        return records
+    
+    def _dead_letter(self, record: Dict[str, Any], error: Exception) -> None:
+        entry = {"id": record["id"], "params": record["params"], "error": str(error)}
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_lettered += 1
+    
+    def _compact(self) -> None:
+        """Truncate the spool once everything in it has been uploaded."""
+        with self._spool_lock():
+            if os.path.exists(self.spool_path) and self._offset == os.path.getsize(self.spool_path):
+                open(self.spool_path, "w").close()
+                self._write_offset(0)
+    
+    def _flush_batch(self) -> bool:
+        """
+        Upload one batch.
+        
+        Returns:
+            True if the batch fully succeeded (or there was nothing to send)
+        """
+        records = self._read_batch()
+        if not records:
+            self._compact()
+            return True
+        
+        results = self.client.add_memories_bulk(
+            (record["params"] for record in records),
+            max_workers=self.max_workers
+        )
+        
+        # Only the contiguous prefix of handled records can be committed;
+        # anything after the first retryable failure is resent later.
+        committed = self._offset
+        for record, item in zip(records, results):
+            error = item["error"]
+            if error is None:
+                self.uploaded += 1
+            elif is_permanent_error(error):
+                self._dead_letter(record, error)
+            else:
+                self.failed_attempts += 1
+                self.last_error = error
+                break
+            committed = record["end"]
+        else:
+            self._write_offset(committed)
+            return True
+        
+        if committed != self._offset:
+            self._write_offset(committed)
+        return False
+    
+    def _run(self) -> None:
+        backoff = self.base_backoff
+        while not self._stop.is_set():
+            try:
+                ok = self._flush_batch()
+            except Exception as e:
+                self.last_error = e
+                ok = False
+            
+            if not ok:
+                delay = min(backoff, self.max_backoff)
+                self._stop.wait(random.uniform(delay / 2, delay))
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            
+            backoff = self.base_backoff
+            if self.pending() == 0:
+                self._idle.set()
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+    
+    def start(self) -> None:
+        """Start the background flusher thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="supermemory-write-behind", daemon=True
+            )
+            self._thread.start()
+    
+    def pending(self) -> int:
+        """Return the number of spooled records not yet uploaded."""
+        with self._lock:
+            if not os.path.exists(self.spool_path):
+                return 0
+            with open(self.spool_path, "rb") as f:
+                f.seek(self._offset)
+                return sum(1 for line in f if line.endswith(b"\n"))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every spooled record has been uploaded.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            True if the spool was drained, False on timeout
+        """
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            self._idle.clear()
+            self._wakeup.set()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._idle.wait(0.1 if remaining is None else min(remaining, 0.1))
+        return True
+    
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Try to drain the spool, then stop the flusher.
+        Anything left over stays on disk and is sent by the next queue.
+        
+        Returns:
+            True if the spool was fully drained
+        """
+        drained = self.flush(timeout)
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return drained
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return upload counters and the current backlog."""
+        return {
+            "pending": self.pending(),
+            "uploaded": self.uploaded,
+            "failed_attempts": self.failed_attempts,
+            "dead_lettered": self.dead_lettered,
+            "last_error": str(self.last_error) if self.last_error else None
+        }